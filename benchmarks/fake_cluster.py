@@ -0,0 +1,341 @@
+"""
+Fake Slurm cluster - command executor behind the local fake SSH server.
+
+Slurm commands (squeue, scontrol, sacct, sacctmgr, sinfo, sbatch, scancel) are
+answered in-process from a SyntheticCluster. Everything else (find, cat, echo,
+test, mkdir, rm, ...) runs in a local shell whose $HOME is a sandbox directory,
+so paths returned to the GUI are real local paths that SFTP can also reach.
+"""
+
+import os
+import random
+import re
+import shlex
+import subprocess
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.fixtures import PARTITIONS, SyntheticCluster
+
+SLURM_COMMANDS = ("squeue", "scontrol", "sacct", "sacctmgr", "sinfo", "sbatch", "scancel")
+
+# Shell commands are killed after this many seconds
+SHELL_TIMEOUT_S = 60
+
+CommandResult = Tuple[bytes, bytes, int]
+
+
+class FakeCluster:
+    """Thread-safe simulated Slurm controller with tunable size and latency."""
+
+    def __init__(
+        self,
+        home_dir: str,
+        username: str = "fakeuser",
+        num_nodes: int = 100,
+        num_jobs: int = 1000,
+        seed: int = 42,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        churn: float = 0.0,
+        start_delay: float = 2.0,
+        job_duration: float = 60.0,
+        log_interval: float = 1.0,
+    ):
+        self.home_dir = os.path.abspath(home_dir)
+        self.username = username
+        self.latency = latency
+        self.jitter = jitter
+        self.churn = churn
+        self.start_delay = start_delay
+        self.job_duration = job_duration
+        self.log_interval = log_interval
+
+        os.makedirs(self.home_dir, exist_ok=True)
+        self.state = SyntheticCluster.generate(num_nodes, num_jobs, seed=seed)
+        self._usable = self.state.usable_nodes()
+        self._rng = random.Random(seed)
+        self._lock = threading.RLock()
+        self._submitted: List[Dict] = []
+        self._last_tick = time.monotonic()
+        self._churn_debt = 0.0
+
+        self._handlers: Dict[str, Callable[[List[str], bytes], CommandResult]] = {
+            "squeue": self._squeue,
+            "scontrol": self._scontrol,
+            "sacct": self._sacct,
+            "sacctmgr": self._sacctmgr,
+            "sinfo": self._sinfo,
+            "sbatch": self._sbatch,
+            "scancel": self._scancel,
+        }
+
+    # --- Entry points --------------------------------------------------------
+
+    def needs_stdin(self, command: str) -> bool:
+        """True if the command reads its input from stdin (e.g. 'sbatch' without a script path)."""
+        argv = self._split(command)
+        return bool(argv) and argv[0] == "sbatch" and not [a for a in argv[1:] if not a.startswith("-")]
+
+    def is_streaming(self, command: str) -> bool:
+        """True for commands that run until the client closes the channel ('tail -f'/'tail -F')."""
+        argv = self._split(command)
+        return bool(argv) and argv[0] == "tail" and any(a in ("-f", "-F") or a.startswith("--follow") for a in argv)
+
+    def open_stream(self, command: str) -> subprocess.Popen:
+        """Start a streaming command in the sandbox home; the caller forwards and terminates it."""
+        self._simulate_latency()
+        env = dict(os.environ, HOME=self.home_dir, USER=self.username, LOGNAME=self.username)
+        return subprocess.Popen(
+            ["/bin/sh", "-c", f"exec {command}"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=self.home_dir,
+            env=env,
+        )
+
+    def execute(self, command: str, stdin: bytes = b"") -> CommandResult:
+        """Run a command and return (stdout, stderr, exit status)."""
+        self._simulate_latency()
+        self.tick()
+
+        argv = self._split(command)
+        if argv and argv[0] in self._handlers:
+            with self._lock:
+                return self._handlers[argv[0]](argv, stdin)
+        return self._run_shell(command, stdin)
+
+    def tick(self):
+        """Advance the lifecycle of submitted jobs and apply background churn."""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._last_tick
+            self._last_tick = now
+
+            for job in list(self._submitted):
+                age = now - job["_submitted_at"]
+                if job["state"] == "PD" and age >= self.start_delay and job["reason"] != "(JobHeldUser)":
+                    self._start_job(job)
+                if job["state"] == "R":
+                    job["time_used"] = int(age - self.start_delay)
+                    self._append_log(job, now)
+                    if age >= self.start_delay + self.job_duration:
+                        self._finish_job(job, "CD")
+
+            if self.churn and elapsed > 0:
+                self._apply_churn(elapsed)
+
+    # --- Slurm commands ------------------------------------------------------
+
+    def _squeue(self, argv: List[str], stdin: bytes) -> CommandResult:
+        return self.state.render_squeue().encode(), b"", 0
+
+    def _scontrol(self, argv: List[str], stdin: bytes) -> CommandResult:
+        args = [a for a in argv[1:] if not a.startswith("2>")]
+        if args[:2] in (["show", "nodes"], ["show", "node"]):
+            return self.state.render_nodes().encode(), b"", 0
+        if args[:2] == ["show", "reservation"]:
+            return self.state.render_reservations().encode(), b"", 0
+        if args and args[0] in ("hold", "release", "requeue") and len(args) > 1:
+            return self._scontrol_job_action(args[0], ",".join(args[1:]).split(","), None)
+        if args[:1] == ["update"]:
+            fields = dict(a.split("=", 1) for a in args[1:] if "=" in a)
+            ids = fields.pop("jobid", fields.pop("JobId", "")).split(",")
+            return self._scontrol_job_action("update", ids, fields)
+        return b"", f"scontrol: error: unsupported fake command: {' '.join(args)}\n".encode(), 1
+
+    def _scontrol_job_action(self, action: str, ids: List[str], fields: Optional[Dict[str, str]]) -> CommandResult:
+        """hold/release/requeue/update of a job list; failures are reported per job like scontrol does."""
+        by_id = {j["job_id"]: j for j in self.state.jobs}
+        errors = []
+        for job_id in filter(None, ids):
+            job = by_id.get(job_id.split("_")[0])
+            if job is None or job["state"] not in ("PD", "R"):
+                errors.append(f"Invalid job id specified for job {job_id}")
+            elif job["user"] != self.username:
+                errors.append(f"Access/permission denied for job {job_id}")
+            elif action in ("hold", "release") and job["state"] != "PD":
+                errors.append(f"Job is no longer pending execution for job {job_id}")
+            elif action == "hold":
+                job["reason"] = "(JobHeldUser)"
+            elif action == "release":
+                job["reason"] = "(Priority)"
+            elif action == "requeue":
+                job["state"], job["reason"], job["nodelist"] = "PD", "(BeginTime)", ""
+                job["_submitted_at"] = time.monotonic()
+            elif fields and "nice" in fields:
+                job["nice"] = int(fields["nice"])
+        return b"", ("\n".join(errors) + "\n").encode() if errors else b"", 1 if errors else 0
+
+    def _sacct(self, argv: List[str], stdin: bytes) -> CommandResult:
+        job_ids = None
+        for i, arg in enumerate(argv):
+            if arg == "-j" and i + 1 < len(argv):
+                job_ids = argv[i + 1].split(",")
+            elif arg.startswith("--jobs="):
+                job_ids = arg.split("=", 1)[1].split(",")
+        return self.state.render_sacct(job_ids).encode(), b"", 0
+
+    def _sacctmgr(self, argv: List[str], stdin: bytes) -> CommandResult:
+        joined = " ".join(argv)
+        if "associations" in joined:
+            return "\n".join(sorted({j["account"] for j in self.state.jobs})).encode(), b"", 0
+        if "qos" in joined:
+            return b"normal\nboost_qos_dbg\nboost_qos_lprod", b"", 0
+        return b"", b"", 0
+
+    def _sinfo(self, argv: List[str], stdin: bytes) -> CommandResult:
+        joined = " ".join(argv)
+        if "%P" in joined:
+            return "\n".join(p[0] for p in PARTITIONS).encode(), b"", 0
+        if "%f" in joined:
+            return b"ib,a100", b"", 0
+        if "%N" in joined:
+            return "\n".join(n["name"] for n in self.state.nodes).encode(), b"", 0
+        return b"", b"", 0
+
+    def _sbatch(self, argv: List[str], stdin: bytes) -> CommandResult:
+        paths = [a for a in argv[1:] if not a.startswith("-")]
+        if paths:
+            path = self._local_path(paths[0])
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    script = f.read()
+            except OSError as e:
+                return b"", f"sbatch: error: Unable to open file {paths[0]}: {e.strerror}\n".encode(), 1
+        else:
+            script = stdin.decode("utf-8", errors="replace")
+
+        if not script.startswith("#!"):
+            return b"", b"sbatch: error: This does not look like a batch script.\n", 1
+
+        options = dict(re.findall(r"^#SBATCH\s+--([\w-]+)=(\S+)", script, flags=re.MULTILINE))
+        dependency = options.get("dependency")
+        if dependency:
+            known = {j["job_id"] for j in self.state.jobs}
+            ids = [i.split("_")[0] for part in dependency.split(",") for i in part.split(":")[1:]]
+            if not all(i in known for i in ids):
+                return b"", b"sbatch: error: Batch job submission failed: Job dependency problem\n", 1
+        job = self.state.add_job(
+            self._rng,
+            usable=[],
+            name=options.get("job-name", "sbatch"),
+            user=self.username,
+            account=options.get("account", "prod_ai"),
+            partition=options.get("partition", PARTITIONS[0][0]),
+            reason="(Priority)",
+            submit_time=time.time(),
+        )
+        job["_submitted_at"] = time.monotonic()
+        job["_dependency"] = dependency
+        job["_log_at"] = 0.0
+        job["_log_lines"] = 0
+        job["_output"] = self._resolve_output(options.get("output"), options.get("chdir"), job["job_id"])
+        self._submitted.append(job)
+        return f"Submitted batch job {job['job_id']}\n".encode(), b"", 0
+
+    def _scancel(self, argv: List[str], stdin: bytes) -> CommandResult:
+        ids = [a for a in argv[1:] if not a.startswith("-")]
+        errors = []
+        by_id = {j["job_id"]: j for j in self.state.jobs}
+        for job_id in ids:
+            job = by_id.get(job_id.split("_")[0])
+            if job is None or job["state"] not in ("PD", "R"):
+                errors.append(f"scancel: error: Kill job error on job id {job_id}: Invalid job id specified")
+                continue
+            if job["user"] != self.username:
+                errors.append(f"scancel: error: Kill job error on job id {job_id}: Access/permission denied")
+                continue
+            self._finish_job(job, "CA")
+        return b"", ("\n".join(errors) + "\n").encode() if errors else b"", 1 if errors else 0
+
+    # --- Job lifecycle -------------------------------------------------------
+
+    def _start_job(self, job: Dict):
+        if self._usable:
+            node = self._rng.choice(self._usable)
+            job["nodelist"] = node["name"]
+            job["partition"] = node["partition"]
+        job["state"] = "R"
+        job["reason"] = "None"
+
+    def _finish_job(self, job: Dict, state: str):
+        job["state"] = state
+        job["reason"] = "None"
+        if job in self._submitted:
+            self._submitted.remove(job)
+
+    def _append_log(self, job: Dict, now: float):
+        path = job.get("_output")
+        if not path or now - job["_log_at"] < self.log_interval:
+            return
+        job["_log_at"] = now
+        job["_log_lines"] += 1
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(
+                    f"[{time.strftime('%H:%M:%S')}] step {job['_log_lines']}: "
+                    f"loss={1.0 / job['_log_lines']:.4f}\n"
+                )
+        except OSError:
+            pass
+
+    def _apply_churn(self, elapsed: float):
+        """Finish a fraction of the background jobs and submit replacements."""
+        background = [j for j in self.state.jobs if j["state"] in ("PD", "R") and "_submitted_at" not in j]
+        self._churn_debt += len(background) * self.churn * elapsed
+        count = int(self._churn_debt)
+        self._churn_debt -= count
+        for job in self._rng.sample(background, min(count, len(background))):
+            job["state"] = "CD"
+        for _ in range(count):
+            self.state.add_job(self._rng, usable=self._usable)
+        # Keep the job table bounded: forget finished background jobs
+        if count:
+            self.state.jobs = [
+                j for j in self.state.jobs if j["state"] in ("PD", "R") or "_submitted_at" in j
+            ]
+
+    def _resolve_output(self, output: Optional[str], chdir: Optional[str], job_id: str) -> str:
+        path = output or "slurm-%j.out"
+        path = path.replace("%A", job_id).replace("%j", job_id).replace("%x", "job")
+        if not os.path.isabs(path):
+            path = os.path.join(self._local_path(chdir) if chdir else self.home_dir, path)
+        return self._local_path(path)
+
+    # --- Helpers -------------------------------------------------------------
+
+    def _local_path(self, path: str) -> str:
+        if path.startswith("~"):
+            path = self.home_dir + path[1:]
+        return path if os.path.isabs(path) else os.path.join(self.home_dir, path)
+
+    def _run_shell(self, command: str, stdin: bytes) -> CommandResult:
+        env = dict(os.environ, HOME=self.home_dir, USER=self.username, LOGNAME=self.username)
+        try:
+            proc = subprocess.run(
+                ["/bin/sh", "-c", command],
+                input=stdin,
+                capture_output=True,
+                cwd=self.home_dir,
+                env=env,
+                timeout=SHELL_TIMEOUT_S,
+            )
+            return proc.stdout, proc.stderr, proc.returncode
+        except subprocess.TimeoutExpired:
+            return b"", f"fake cluster: command timed out: {command}\n".encode(), 124
+
+    def _simulate_latency(self):
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+    @staticmethod
+    def _split(command: str) -> List[str]:
+        try:
+            return shlex.split(command.split("|", 1)[0])
+        except ValueError:
+            return command.split()
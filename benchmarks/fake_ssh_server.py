@@ -0,0 +1,355 @@
+"""
+Fake Slurm SSH server - a local paramiko server backed by FakeCluster.
+
+Supports password authentication, exec channels (with stdin) and the SFTP
+subsystem, which is all SlurmAPI uses. Intended for local load testing only:
+non-Slurm commands run in a real shell, so bind it to localhost.
+
+    python -m benchmarks.fake_ssh_server --port 2222 --nodes 1000 --jobs 5000 --latency 0.05
+
+Then set the cluster address in the GUI to "127.0.0.1:2222" with the printed
+username and password.
+"""
+
+import argparse
+import os
+import socket
+import tempfile
+import threading
+import time
+from typing import Optional
+
+import paramiko
+
+from benchmarks.fake_cluster import FakeCluster
+
+DEFAULT_USERNAME = "fakeuser"
+DEFAULT_PASSWORD = "fakepassword"
+# Seconds to wait for the client to close an exec channel
+CLOSE_GRACE_S = 5.0
+
+
+class LocalSFTPHandle(paramiko.SFTPHandle):
+    """SFTP file handle over a local file object."""
+
+    def stat(self):
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.fstat(self.readfile.fileno()))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    def chattr(self, attr):
+        return paramiko.SFTP_OK
+
+
+class LocalSFTPServer(paramiko.SFTPServerInterface):
+    """SFTP server exposing the local filesystem (paths are used as-is)."""
+
+    def __init__(self, server, *args, **kwargs):
+        super().__init__(server, *args, **kwargs)
+        self.home_dir = server.cluster.home_dir
+
+    def _path(self, path: str) -> str:
+        if not os.path.isabs(path):
+            path = os.path.join(self.home_dir, path)
+        return os.path.normpath(path)
+
+    def canonicalize(self, path):
+        return self._path(path)
+
+    def list_folder(self, path):
+        path = self._path(path)
+        try:
+            entries = []
+            for name in os.listdir(path):
+                attr = paramiko.SFTPAttributes.from_stat(os.lstat(os.path.join(path, name)))
+                attr.filename = name
+                entries.append(attr)
+            return entries
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    def stat(self, path):
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.stat(self._path(path)))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    def lstat(self, path):
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.lstat(self._path(path)))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    def open(self, path, flags, attr):
+        path = self._path(path)
+        try:
+            mode = getattr(attr, "st_mode", None) or 0o644
+            fd = os.open(path, flags, mode)
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+        if flags & os.O_WRONLY:
+            fstr = "ab" if flags & os.O_APPEND else "wb"
+        elif flags & os.O_RDWR:
+            fstr = "a+b" if flags & os.O_APPEND else "r+b"
+        else:
+            fstr = "rb"
+        try:
+            f = os.fdopen(fd, fstr)
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+        handle = LocalSFTPHandle(flags)
+        handle.filename = path
+        handle.readfile = f
+        handle.writefile = f
+        return handle
+
+    def remove(self, path):
+        try:
+            os.remove(self._path(path))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        return paramiko.SFTP_OK
+
+    def rename(self, oldpath, newpath):
+        try:
+            os.rename(self._path(oldpath), self._path(newpath))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        return paramiko.SFTP_OK
+
+    def posix_rename(self, oldpath, newpath):
+        return self.rename(oldpath, newpath)
+
+    def mkdir(self, path, attr):
+        try:
+            os.mkdir(self._path(path))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        return paramiko.SFTP_OK
+
+    def rmdir(self, path):
+        try:
+            os.rmdir(self._path(path))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+        return paramiko.SFTP_OK
+
+    def chattr(self, path, attr):
+        return paramiko.SFTP_OK
+
+
+class FakeSSHServerInterface(paramiko.ServerInterface):
+    """Per-connection paramiko server: password auth, exec and sftp."""
+
+    def __init__(self, cluster: FakeCluster, username: str, password: str):
+        self.cluster = cluster
+        self.username = username
+        self.password = password
+
+    def get_allowed_auths(self, username):
+        return "password"
+
+    def check_auth_password(self, username, password):
+        if username == self.username and password == self.password:
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def check_channel_request(self, kind, chanid):
+        if kind == "session":
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_exec_request(self, channel, command):
+        command = command.decode("utf-8", errors="replace") if isinstance(command, bytes) else command
+        threading.Thread(target=self._run_exec, args=(channel, command), daemon=True).start()
+        return True
+
+    def _run_exec(self, channel: paramiko.Channel, command: str):
+        if self.cluster.is_streaming(command):
+            self._run_stream(channel, command)
+            return
+        try:
+            stdin = b""
+            if self.cluster.needs_stdin(command):
+                chunks = []
+                while True:
+                    data = channel.recv(65536)
+                    if not data:
+                        break
+                    chunks.append(data)
+                stdin = b"".join(chunks)
+
+            stdout, stderr, status = self.cluster.execute(command, stdin)
+            if stdout:
+                channel.sendall(stdout)
+            if stderr:
+                channel.sendall_stderr(stderr)
+            channel.send_exit_status(status)
+            channel.shutdown_write()
+            # Closing right away can overtake paramiko's reply to the exec request,
+            # so send EOF and let the client close the channel first.
+            channel.settimeout(CLOSE_GRACE_S)
+            channel.recv(1)
+        except socket.timeout:
+            pass
+        except Exception as e:
+            try:
+                channel.sendall_stderr(f"fake server error: {e}\n".encode())
+                channel.send_exit_status(255)
+            except Exception:
+                pass
+        finally:
+            channel.close()
+
+
+    def _run_stream(self, channel: paramiko.Channel, command: str):
+        """Forwards the output of a long-running command until it exits or the client closes."""
+        proc = self.cluster.open_stream(command)
+
+        def forward(pipe, send):
+            try:
+                for data in iter(lambda: os.read(pipe.fileno(), 65536), b""):
+                    send(data)
+            except (OSError, EOFError, socket.error):
+                pass
+
+        readers = [
+            threading.Thread(target=forward, args=(proc.stdout, channel.sendall), daemon=True),
+            threading.Thread(target=forward, args=(proc.stderr, channel.sendall_stderr), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+        try:
+            while proc.poll() is None and not channel.closed and not channel.eof_received:
+                time.sleep(0.1)
+            if proc.poll() is not None:
+                for reader in readers:
+                    reader.join(timeout=1.0)
+                channel.send_exit_status(proc.returncode)
+        except Exception:
+            pass
+        finally:
+            if proc.poll() is None:
+                proc.terminate()
+                proc.wait()
+            channel.close()
+
+
+class FakeSlurmServer:
+    """Threaded SSH server listening on localhost and serving a FakeCluster."""
+
+    def __init__(
+        self,
+        cluster: FakeCluster,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        username: str = DEFAULT_USERNAME,
+        password: str = DEFAULT_PASSWORD,
+        host_key: Optional[paramiko.PKey] = None,
+    ):
+        self.cluster = cluster
+        self.username = username
+        self.password = password
+        self.host_key = host_key or paramiko.RSAKey.generate(2048)
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((host, port))
+        self._socket.listen(16)
+        self.host, self.port = self._socket.getsockname()
+
+        self._transports = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start accepting connections in a background thread."""
+        self._thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server and close all client transports."""
+        self._stop.set()
+        try:
+            self._socket.close()
+        except OSError:
+            pass
+        for transport in self._transports:
+            transport.close()
+
+    def _accept_loop(self):
+        self._socket.settimeout(0.5)
+        while not self._stop.is_set():
+            try:
+                client, _ = self._socket.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            threading.Thread(target=self._serve, args=(client,), daemon=True).start()
+
+    def _serve(self, client: socket.socket):
+        transport = paramiko.Transport(client)
+        transport.add_server_key(self.host_key)
+        server = FakeSSHServerInterface(self.cluster, self.username, self.password)
+        transport.set_subsystem_handler("sftp", paramiko.SFTPServer, LocalSFTPServer)
+        self._transports.append(transport)
+        try:
+            transport.start_server(server=server)
+        except (paramiko.SSHException, EOFError):
+            return
+        # Exec and sftp are handled by the callbacks above. Accepted channels are
+        # only held so they are not closed by garbage collection while in use.
+        channels = []
+        while transport.is_active() and not self._stop.is_set():
+            channel = transport.accept(timeout=1)
+            channels = [c for c in channels if not c.closed]
+            if channel is not None:
+                channels.append(channel)
+        self._transports.remove(transport)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake Slurm SSH server for load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2222)
+    parser.add_argument("--username", default=DEFAULT_USERNAME)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--home", help="Sandbox home directory (default: a temporary directory)")
+    parser.add_argument("--nodes", type=int, default=100)
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency", type=float, default=0.0, help="Fixed delay per command in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra delay per command in seconds")
+    parser.add_argument("--churn", type=float, default=0.0, help="Fraction of background jobs replaced per second")
+    parser.add_argument("--job-duration", type=float, default=60.0, help="Run time of submitted jobs in seconds")
+    args = parser.parse_args()
+
+    home = args.home or tempfile.mkdtemp(prefix="fake_slurm_home_")
+    cluster = FakeCluster(
+        home,
+        username=args.username,
+        num_nodes=args.nodes,
+        num_jobs=args.jobs,
+        seed=args.seed,
+        latency=args.latency,
+        jitter=args.jitter,
+        churn=args.churn,
+        job_duration=args.job_duration,
+    )
+    server = FakeSlurmServer(cluster, args.host, args.port, args.username, args.password).start()
+    print(f"Fake Slurm server listening on {server.host}:{server.port}")
+    print(f"  username: {server.username}  password: {server.password}  home: {cluster.home_dir}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
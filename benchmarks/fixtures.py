@@ -0,0 +1,265 @@
+"""
+Synthetic Slurm fixtures - deterministic command outputs for offline benchmarks.
+Renders 'scontrol show nodes', 'squeue -O', 'sacct --parsable2' and
+'scontrol show reservation' in the formats parsed by SlurmAPI.
+"""
+
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+# Partition layout used for generated nodes: (name, share, cpus, mem_mb, gpus)
+PARTITIONS = [
+    ("all_usr_prod", 0.55, 64, 515000, 8),
+    ("all_serial", 0.25, 32, 256000, 0),
+    ("boost_usr_prod", 0.15, 128, 1030000, 4),
+    ("debug", 0.05, 16, 64000, 2),
+]
+USERS = [f"user{i:03d}" for i in range(120)]
+ACCOUNTS = ["prod_ai", "prod_cv", "prod_nlp", "tesi_vision", "cvcs_2025", "ai4bio_lab"]
+PENDING_REASONS = ["(Priority)", "(Resources)", "(QOSMaxGRESPerUser)", "(Dependency)"]
+# Compact states still listed by squeue (finished jobs are only visible to sacct)
+ACTIVE_STATES = ("PD", "R", "CG", "S")
+
+# File names used when loading recorded outputs from a directory
+RECORDED_FILES = {
+    "nodes": "scontrol_show_nodes.txt",
+    "squeue": "squeue.txt",
+    "sacct": "sacct.txt",
+    "reservations": "scontrol_show_reservation.txt",
+}
+
+SQUEUE_HEADER = (
+    "JOBID;REASON;NODELIST;USER;TRES_PER_JOB;TRES_PER_TASK;TRES_PER_NODE;NAME;PARTITION;ST;"
+    "TIME_LIMIT;TIME;NODES;TASKS;REASON;MIN_MEMORY;MIN_CPUS;ACCOUNT;PRIORITY;JOBID;TRES_ALLOC;NICE;SUBMIT_TIME"
+)
+
+
+def format_duration(seconds: int) -> str:
+    """Format seconds the way squeue/sacct print elapsed times."""
+    days, rest = divmod(int(seconds), 86400)
+    hours, rest = divmod(rest, 3600)
+    minutes, secs = divmod(rest, 60)
+    if days:
+        return f"{days}-{hours:02}:{minutes:02}:{secs:02}"
+    if hours:
+        return f"{hours}:{minutes:02}:{secs:02}"
+    return f"{minutes}:{secs:02}"
+
+
+@dataclass
+class SyntheticCluster:
+    """A generated cluster state that can be rendered as Slurm command output."""
+
+    nodes: List[Dict[str, Any]] = field(default_factory=list)
+    jobs: List[Dict[str, Any]] = field(default_factory=list)
+    next_job_id: int = 1000000
+
+    @classmethod
+    def generate(cls, num_nodes: int, num_jobs: int, seed: int = 42) -> "SyntheticCluster":
+        """Build a deterministic cluster with the requested number of nodes and jobs."""
+        rng = random.Random(seed)
+        cluster = cls()
+
+        index = 0
+        for partition, share, cpus, mem_mb, gpus in PARTITIONS:
+            count = max(1, int(round(num_nodes * share)))
+            for _ in range(count):
+                if index >= num_nodes:
+                    break
+                state = rng.choices(
+                    ["IDLE", "MIXED", "ALLOCATED", "DRAIN", "DOWN+NOT_RESPONDING", "RESERVED"],
+                    weights=[20, 45, 25, 5, 3, 2],
+                )[0]
+                cluster.nodes.append(
+                    {
+                        "name": f"node{index:05d}",
+                        "partition": partition,
+                        "cpus": cpus,
+                        "mem_mb": mem_mb,
+                        "gpus": gpus,
+                        "state": state,
+                        "alloc_cpus": 0,
+                        "alloc_mem_mb": 0,
+                        "alloc_gpus": 0,
+                    }
+                )
+                index += 1
+
+        usable = cluster.usable_nodes()
+        for _ in range(num_jobs):
+            cluster.add_job(rng, usable=usable)
+        return cluster
+
+    def usable_nodes(self) -> List[Dict[str, Any]]:
+        """Nodes that can run jobs."""
+        return [n for n in self.nodes if n["state"] in ("IDLE", "MIXED", "ALLOCATED")]
+
+    def add_job(self, rng: random.Random, usable: Optional[List[Dict[str, Any]]] = None, **overrides) -> Dict[str, Any]:
+        """Create a job, place it on a node if running, and return it."""
+        if usable is None:
+            usable = self.usable_nodes()
+        running = bool(usable) and rng.random() < 0.6
+        node = rng.choice(usable) if running else None
+
+        gpus = rng.choice([0, 1, 1, 2, 4]) if node is None or node["gpus"] else 0
+        cpus = rng.choice([1, 2, 4, 8, 16])
+        mem_gb = rng.choice([4, 8, 16, 32, 64])
+        time_used = rng.randint(0, 86400 * 2) if node else 0
+        job = {
+            "job_id": str(self.next_job_id),
+            "name": rng.choice(["train", "eval", "preprocess", "sweep", "notebook"]) + f"_{rng.randint(0, 999)}",
+            "user": rng.choice(USERS),
+            "account": rng.choice(ACCOUNTS),
+            "partition": node["partition"] if node else rng.choice(PARTITIONS)[0],
+            "state": "R" if node else "PD",
+            "reason": "None" if node else rng.choice(PENDING_REASONS),
+            "nodelist": node["name"] if node else "",
+            "time_limit": rng.choice([3600, 14400, 86400, 172800]),
+            "time_used": time_used,
+            "cpus": cpus,
+            "mem_gb": mem_gb,
+            "gpus": gpus,
+            "priority": rng.randint(1000, 100000),
+            "nice": 0,
+            "array_task": None,
+            "exit_code": "0:0",
+            "submit_time": time.time() - time_used - rng.randint(0, 86400),
+        }
+        job.update(overrides)
+        self.next_job_id += 1
+
+        if node:
+            node["alloc_cpus"] = min(node["cpus"], node["alloc_cpus"] + cpus)
+            node["alloc_mem_mb"] = min(node["mem_mb"], node["alloc_mem_mb"] + mem_gb * 1024)
+            node["alloc_gpus"] = min(node["gpus"], node["alloc_gpus"] + gpus)
+        self.jobs.append(job)
+        return job
+
+    # --- Renderers -----------------------------------------------------------
+
+    def render_nodes(self) -> str:
+        """Render 'scontrol show nodes' output."""
+        blocks = []
+        for n in self.nodes:
+            gres = f"gpu:a100:{n['gpus']}(S:0-1)" if n["gpus"] else "(null)"
+            cfg_tres = f"cpu={n['cpus']},mem={n['mem_mb']}M,billing={n['cpus']}"
+            alloc_tres = ""
+            if n["gpus"]:
+                cfg_tres += f",gres/gpu={n['gpus']}"
+            if n["alloc_cpus"]:
+                alloc_tres = f"cpu={n['alloc_cpus']},mem={n['alloc_mem_mb']}M"
+                if n["alloc_gpus"]:
+                    alloc_tres += f",gres/gpu={n['alloc_gpus']}"
+            blocks.append(
+                "\n".join(
+                    [
+                        f"NodeName={n['name']} Arch=x86_64 CoresPerSocket={n['cpus'] // 2} ",
+                        f"   CPUAlloc={n['alloc_cpus']} CPUEfctv={n['cpus']} CPUTot={n['cpus']} CPULoad=1.23",
+                        "   AvailableFeatures=ib,a100",
+                        "   ActiveFeatures=ib,a100",
+                        f"   Gres={gres}",
+                        f"   NodeAddr={n['name']} NodeHostName={n['name']} Version=23.02.7",
+                        "   OS=Linux 5.15.0-91-generic #101-Ubuntu SMP ",
+                        f"   RealMemory={n['mem_mb']} AllocMem={n['alloc_mem_mb']} FreeMem=1000 Sockets=2 Boards=1",
+                        f"   State={n['state']} ThreadsPerCore=1 TmpDisk=0 Weight=1 Owner=N/A MCS_label=N/A",
+                        f"   Partitions={n['partition']} ",
+                        "   BootTime=2025-01-01T00:00:00 SlurmdStartTime=2025-01-01T00:05:00",
+                        f"   CfgTRES={cfg_tres}",
+                        f"   AllocTRES={alloc_tres}",
+                        "   CapWatts=n/a",
+                        "   CurrentWatts=0 AveWatts=0",
+                    ]
+                )
+            )
+        return "\n\n".join(blocks) + "\n"
+
+    def render_squeue(self) -> str:
+        """Render the ';'-separated 'squeue -O' output requested by SlurmAPI.fetch_job_queue."""
+        lines = [SQUEUE_HEADER]
+        for j in self.jobs:
+            if j["state"] not in ACTIVE_STATES:
+                continue
+            job_id = j["job_id"] if j["array_task"] is None else f"{j['job_id']}_{j['array_task']}"
+            tres = f"cpu={j['cpus']},mem={j['mem_gb']}G,node=1,billing={j['cpus']}"
+            if j["gpus"]:
+                tres += f",gres/gpu={j['gpus']}"
+            nodelist = j["nodelist"] if j["state"] == "R" else ""
+            lines.append(
+                ";".join(
+                    [
+                        job_id,
+                        j["reason"],
+                        nodelist,
+                        j["user"],
+                        "N/A",
+                        "N/A",
+                        f"gres/gpu:{j['gpus']}" if j["gpus"] else "N/A",
+                        j["name"],
+                        j["partition"],
+                        j["state"],
+                        format_duration(j["time_limit"]),
+                        format_duration(j["time_used"]),
+                        "1",
+                        "1",
+                        j["reason"],
+                        f"{j['mem_gb']}G",
+                        str(j["cpus"]),
+                        j["account"],
+                        str(j["priority"]),
+                        j["job_id"],
+                        tres,
+                        str(j["nice"]),
+                        time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(j["submit_time"])),
+                    ]
+                )
+            )
+        return "\n".join(lines)
+
+    def render_sacct(self, job_ids: Optional[List[str]] = None) -> str:
+        """Render 'sacct --parsable2 --noheader' output, including the .batch steps."""
+        wanted = set(job_ids) if job_ids is not None else None
+        state_names = {"R": "RUNNING", "PD": "PENDING", "CD": "COMPLETED", "F": "FAILED", "CA": "CANCELLED"}
+        lines = []
+        for j in self.jobs:
+            if wanted is not None and j["job_id"] not in wanted:
+                continue
+            state = state_names.get(j["state"], "RUNNING")
+            start = "2025-01-01T10:00:00" if j["state"] != "PD" else "Unknown"
+            end = "Unknown" if j["state"] in ("R", "PD") else "2025-01-01T12:00:00"
+            row = [
+                j["job_id"], j["name"], state, j["exit_code"], start, end, format_duration(j["time_used"]),
+                str(j["cpus"]), f"{j['mem_gb']}G", "", j["nodelist"] or "None assigned", "None", "0:0",
+            ]
+            lines.append("|".join(row))
+            if j["state"] != "PD":
+                step = [f"{j['job_id']}.batch", "batch"] + row[2:9] + ["1024K"] + row[10:]
+                lines.append("|".join(step))
+        return "\n".join(lines)
+
+    def render_reservations(self) -> str:
+        """Render 'scontrol show reservation' output with one maintenance window."""
+        if not self.nodes:
+            return "No reservations in the system"
+        last = len(self.nodes) - 1
+        return (
+            "ReservationName=maint_fixture StartTime=2030-01-10T08:00:00 EndTime=2030-01-10T18:00:00 Duration=10:00:00\n"
+            f"   Nodes=node[00000-{last:05d}] NodeCnt={len(self.nodes)} CoreCnt=0 Features=(null) "
+            "PartitionName=(null) Flags=MAINT,IGNORE_JOBS,SPEC_NODES,ALL_NODES\n"
+            "   TRES=cpu=0\n"
+            "   Users=root Groups=(null) Accounts=(null) Licenses=(null) State=INACTIVE BurstBuffer=(null) Watts=n/a\n"
+            "   MaxStartDelay=(null)\n"
+        )
+
+
+def load_recorded_outputs(directory: str) -> Dict[str, str]:
+    """Load recorded command outputs (see RECORDED_FILES) from a directory."""
+    outputs = {}
+    for key, filename in RECORDED_FILES.items():
+        path = os.path.join(directory, filename)
+        if os.path.isfile(path):
+            with open(path, "r", encoding="utf-8") as f:
+                outputs[key] = f.read()
+    return outputs
@@ -0,0 +1,209 @@
+"""
+End-to-end load test - headless SlurmWorker refresh loops against the fake server.
+
+Starts a FakeSlurmServer in-process (or uses one given with --server), connects
+the real SlurmAPI over SSH, optionally submits jobs into a project, then runs
+refresh cycles (worker fetch plus the GUI-side cluster/queue/project updates)
+and reports refresh latency, the per-span breakdown and memory usage.
+
+    python -m benchmarks.load_test --nodes 1000 --jobs 10000 --latency 0.03 --iterations 20
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtWidgets import QApplication
+
+from benchmarks.fake_cluster import FakeCluster
+from benchmarks.fake_ssh_server import DEFAULT_PASSWORD, DEFAULT_USERNAME, FakeSlurmServer
+from core.profiler import Profiler, get_profiler
+from core.slurm_api import ConnectionState, SlurmAPI
+from core.slurm_worker import SlurmWorker
+from models.cluster_status_model import ClusterStatusModel
+from models.job_queue_model import JobQueueTableModel
+from models.project_model import Job, JobsModel, Project
+from views.cluster_entities import Cluster
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class HeadlessPipeline:
+    """Mirrors what the main window does with each worker result, without widgets."""
+
+    def __init__(self, jobs_model: JobsModel):
+        self.jobs_model = jobs_model
+        self.cluster = Cluster()
+        self.cluster_model = ClusterStatusModel()
+        self.queue_model = JobQueueTableModel()
+        self.errors: List[str] = []
+
+    def on_data_ready(self, data: Dict[str, Any]):
+        self.cluster.update_from_data(data["nodes"], data["jobs"])
+        self.cluster_model.update_data(self.cluster.as_dicts(), data["jobs"])
+        self.queue_model.update_jobs(data["jobs"])
+        if data["job_details"]:
+            self.jobs_model.update_jobs_from_sacct(data["job_details"])
+
+    def on_error(self, message: str):
+        self.errors.append(message)
+
+
+def submit_jobs(api: SlurmAPI, jobs_model: JobsModel, count: int) -> int:
+    """Submit ``count`` jobs through SlurmAPI into a 'load_test' project."""
+    project = Project(name="load_test")
+    jobs_model.projects.append(project)
+    submitted = 0
+    for i in range(count):
+        job = Job(name=f"load_{i}", partition="all_usr_prod", project_name=project.name)
+        job_id, error = api.submit_job(job)
+        if not job_id:
+            print(f"Submission {i} failed: {error}")
+            continue
+        job.id = job_id
+        job.status = "PENDING"
+        project.jobs.append(job)
+        submitted += 1
+    return submitted
+
+
+def rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None if unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Headless end-to-end refresh load test")
+    parser.add_argument("--nodes", type=int, default=1000)
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency", type=float, default=0.02, help="Fixed delay per command in seconds")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Random extra delay per command in seconds")
+    parser.add_argument("--churn", type=float, default=0.01, help="Fraction of background jobs replaced per second")
+    parser.add_argument("--submit", type=int, default=5, help="Jobs to submit into a project before the loop")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--interval", type=float, default=0.0, help="Pause between refreshes in seconds")
+    parser.add_argument(
+        "--server",
+        metavar="HOST:PORT",
+        help="Use an already running fake server (python -m benchmarks.fake_ssh_server) "
+        "instead of an in-process one, which shares the GIL with the client",
+    )
+    parser.add_argument("--username", default=DEFAULT_USERNAME)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    api = SlurmAPI()
+    server = None
+    if args.server:
+        api._config.host, api._config.port = SlurmAPI._split_address(args.server)
+        print(f"Using fake Slurm server on {args.server}")
+    else:
+        home = tempfile.mkdtemp(prefix="fake_slurm_home_")
+        cluster = FakeCluster(
+            home,
+            username=args.username,
+            num_nodes=args.nodes,
+            num_jobs=args.jobs,
+            seed=args.seed,
+            latency=args.latency,
+            jitter=args.jitter,
+            churn=args.churn,
+            start_delay=1.0,
+        )
+        server = FakeSlurmServer(cluster, username=args.username, password=args.password).start()
+        api._config.host, api._config.port = server.host, server.port
+        print(f"Fake Slurm server on {server.host}:{server.port} ({args.nodes} nodes, {args.jobs} jobs, home {home})")
+    api._config.username = args.username
+    api._config.password = args.password
+
+    connect_started = time.perf_counter()
+    if not api.connect():
+        print("Could not connect to the fake server")
+        if server:
+            server.stop()
+        return 1
+    connect_s = time.perf_counter() - connect_started
+
+    jobs_model = JobsModel()
+    submitted = submit_jobs(api, jobs_model, args.submit)
+
+    pipeline = HeadlessPipeline(jobs_model)
+    worker = SlurmWorker(api, jobs_model)
+    worker.data_ready.connect(pipeline.on_data_ready)
+    worker.error_occurred.connect(pipeline.on_error)
+
+    get_profiler().reset()
+    refresh = Profiler()
+    tracemalloc.start()
+    for _ in range(args.iterations):
+        # run() is called directly: signals are delivered synchronously in this thread
+        with refresh.span("refresh.end_to_end"):
+            worker.run()
+        if args.interval:
+            time.sleep(args.interval)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    api.disconnect()
+    api.connection_status = ConnectionState.DISCONNECTED
+    if server:
+        server.stop()
+
+    e2e = refresh.snapshot()["refresh.end_to_end"]
+    spans = get_profiler().snapshot()
+    report = {
+        "config": vars(args),
+        "connect_s": round(connect_s, 3),
+        "submitted": submitted,
+        "end_to_end_ms": {k: round(e2e[k], 2) for k in ("mean_ms", "p50_ms", "p95_ms", "max_ms")},
+        "spans_p50_ms": {name: round(s.get("p50_ms", 0), 2) for name, s in spans.items()},
+        "memory": {
+            "traced_current_mb": round(current / 2**20, 2),
+            "traced_peak_mb": round(peak / 2**20, 2),
+            "max_rss_mb": round(rss_mb(), 1) if resource else None,
+        },
+        "errors": pipeline.errors,
+    }
+
+    print(f"Connected in {connect_s:.2f} s, submitted {submitted} job(s)")
+    print(
+        "End-to-end refresh: mean {mean_ms:.1f} ms  p50 {p50_ms:.1f} ms  p95 {p95_ms:.1f} ms  max {max_ms:.1f} ms".format(
+            **report["end_to_end_ms"]
+        )
+    )
+    for name, value in report["spans_p50_ms"].items():
+        print(f"  {name:<35} p50 {value:>10.2f} ms")
+    memory = report["memory"]
+    print(
+        f"Memory: traced {memory['traced_current_mb']} MB (peak {memory['traced_peak_mb']} MB), "
+        f"max RSS {memory['max_rss_mb']} MB"
+    )
+    if pipeline.errors:
+        print(f"{len(pipeline.errors)} worker error(s): {pipeline.errors[0]}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+    return 1 if pipeline.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,359 @@
+"""
+Offline benchmark suite - times the refresh hot paths against Slurm fixtures.
+
+Feeds synthetic (or recorded) command outputs into SlurmAPI parsing and the
+cluster/queue models without an SSH connection, and compares the results with
+a tracked baseline.
+
+    python -m benchmarks.run_benchmarks                   # full matrix, compare with baseline
+    python -m benchmarks.run_benchmarks --quick           # small scales only
+    python -m benchmarks.run_benchmarks --update-baseline # record new baseline
+    python -m benchmarks.run_benchmarks --recorded DIR    # use recorded outputs instead
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtWidgets import QApplication, QTableView
+
+from benchmarks.fixtures import SyntheticCluster, load_recorded_outputs
+from controllers.job_queue_controller import JobQueueFilterProxyModel
+from core.defaults import JOB_QUEUE_FIELDS
+from core.job_columns import add_typed_values
+from core.profiler import Profiler
+from core.slurm_api import ConnectionState, SlurmAPI
+from core.slurm_worker import sort_queue_jobs
+from core.usage_stats import UsageAggregator
+from core.utilization_history import UtilizationHistory, utilization_samples
+from models.cluster_status_model import ClusterStatusModel
+from models.job_queue_model import JobQueueTableModel
+from utils import parse_slurm_reservations
+from views.cluster_entities import Cluster
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+DEFAULT_NODE_SCALES = [100, 1000, 10000]
+DEFAULT_JOB_SCALES = [1000, 50000]
+QUICK_NODE_SCALES = [100, 1000]
+QUICK_JOB_SCALES = [1000]
+
+# Allowed slowdown relative to the baseline before a benchmark is flagged
+DEFAULT_TOLERANCE = 0.30
+# Differences below this are treated as timer noise
+NOISE_FLOOR_MS = 0.5
+# Benchmarks faster than this swing with scheduler and cache jitter; they get a wider tolerance
+SHORT_BENCHMARK_MS = 5.0
+SHORT_BENCHMARK_TOLERANCE = 1.0
+# Fast benchmarks keep sampling for at least this long (bounded by MAX_SAMPLES,
+# which stays below the profiler's ring buffer so the minimum covers every sample)
+MIN_SAMPLE_TIME_S = 1.0
+MAX_SAMPLES = 250
+# The calibration workload is timed (best of) before and after every benchmark
+CALIBRATION_RUNS = 5
+# Number of job IDs passed to sacct (the GUI only tracks the user's own jobs)
+SACCT_JOB_IDS = 1000
+
+
+class FixtureExecutor:
+    """Stands in for SlurmAPI.run_command, answering from fixture outputs."""
+
+    def __init__(self, outputs: Dict[str, str]):
+        self.outputs = outputs
+
+    def __call__(self, command: str, span: Optional[str] = None) -> Tuple[str, str]:
+        if command.startswith("scontrol show nodes"):
+            return self.outputs.get("nodes", ""), ""
+        if command.startswith("scontrol show reservation"):
+            return self.outputs.get("reservations", ""), ""
+        if command.startswith("squeue"):
+            return self.outputs.get("squeue", ""), ""
+        if command.startswith("sacct"):
+            return self.outputs.get("sacct", ""), ""
+        return "", f"fixture: unsupported command '{command}'"
+
+
+def offline_api(outputs: Dict[str, str]) -> SlurmAPI:
+    """Return the SlurmAPI singleton wired to fixture outputs instead of SSH."""
+    api = SlurmAPI()
+    api.connection_status = ConnectionState.CONNECTED
+    api.run_command = FixtureExecutor(outputs)
+    return api
+
+
+def calibration_workload():
+    """Fixed pure-Python workload (parsing-like string and dict work) used as a speed reference."""
+    rows = {}
+    for i in range(4000):
+        key, value = f"Key{i % 50}=value{i}".split("=", 1)
+        rows[key] = value.upper()
+    return sorted(rows)
+
+
+class BenchmarkRunner:
+    """Runs benchmark callables and collects their timings in a private Profiler."""
+
+    def __init__(self, repeat: int, budget_s: float, name_filter: Optional[str] = None):
+        self.repeat = repeat
+        self.budget_s = budget_s
+        self.name_filter = name_filter
+        self.profiler = Profiler()
+        self.items: Dict[str, int] = {}
+        self.calibration_ms: Dict[str, float] = {}
+
+    def _calibrate(self) -> float:
+        """Best-of time of the calibration workload right now, in ms (tracks machine speed)."""
+        best = float("inf")
+        for _ in range(CALIBRATION_RUNS):
+            started = time.perf_counter()
+            calibration_workload()
+            best = min(best, time.perf_counter() - started)
+        return best * 1000
+
+    def run(self, name: str, func: Callable[[], Any], items: int):
+        """
+        Time ``func``: one warm-up call, then at least ``repeat`` samples (and at
+        least MIN_SAMPLE_TIME_S worth of them for fast benchmarks), within the budget.
+        """
+        if self.name_filter and self.name_filter not in name:
+            return
+        func()
+        calibration_ms = self._calibrate()
+        started = time.perf_counter()
+        samples = 0
+        while True:
+            with self.profiler.span(name):
+                func()
+            samples += 1
+            elapsed = time.perf_counter() - started
+            if elapsed > self.budget_s or samples >= MAX_SAMPLES:
+                break
+            if samples >= self.repeat and elapsed >= MIN_SAMPLE_TIME_S:
+                break
+        self.items[name] = items
+        self.calibration_ms[name] = min(calibration_ms, self._calibrate())
+        stats = self.profiler.snapshot()[name]
+        rate = items / (stats["p50_ms"] / 1000) if stats["p50_ms"] else 0
+        print(f"  {name:<45} min {stats['min_ms']:>10.2f} ms  p50 {stats['p50_ms']:>10.2f} ms  {rate:>12,.0f} items/s")
+
+    def results(self) -> Dict[str, Dict[str, Any]]:
+        results = {}
+        for name, stats in self.profiler.snapshot().items():
+            results[name] = {
+                "items": self.items.get(name, 0),
+                "samples": stats["window"],
+                "min_ms": round(stats["min_ms"], 3),
+                "p50_ms": round(stats["p50_ms"], 3),
+                "max_ms": round(stats["max_ms"], 3),
+                # Machine-speed independent score used for baseline comparisons
+                "relative": round(stats["min_ms"] / self.calibration_ms[name], 4),
+            }
+        return results
+
+
+def run_scenario(runner: BenchmarkRunner, label: str, outputs: Dict[str, str], job_ids: List[str], seen: set):
+    """Run all hot-path benchmarks for one set of command outputs."""
+    api = offline_api(outputs)
+    tag = f"[{label}]"
+    print(f"Scenario {label}")
+
+    nodes = api.fetch_nodes_info() or []
+    jobs = api.fetch_job_queue() or []
+    nodes_tag = f"[nodes={len(nodes)}]"
+    jobs_tag = f"[jobs={len(jobs)}]"
+
+    # --- Parse ---
+    if ("nodes", nodes_tag) not in seen:
+        runner.run(f"parse.nodes{nodes_tag}", api.fetch_nodes_info, len(nodes))
+        runner.run(
+            f"parse.reservations{nodes_tag}",
+            lambda: parse_slurm_reservations(outputs.get("reservations", "")),
+            len(nodes),
+        )
+    if ("jobs", jobs_tag) not in seen:
+        runner.run(f"parse.job_queue{jobs_tag}", api.fetch_job_queue, len(jobs))
+        sacct_ids = job_ids[:SACCT_JOB_IDS]
+        runner.run(f"parse.sacct{jobs_tag}", lambda: api.fetch_job_details_sacct(sacct_ids), len(sacct_ids))
+
+    # --- Enrichment ---
+    cluster = Cluster()
+    runner.run(f"enrich.cluster{tag}", lambda: cluster.update_from_data(nodes, jobs), len(nodes) + len(jobs))
+    node_dicts = cluster.as_dicts()
+    runner.run(f"enrich.as_dicts{tag}", cluster.as_dicts, len(nodes))
+
+    # --- Sort ---
+    status_model = ClusterStatusModel()
+    if ("nodes", nodes_tag) not in seen:
+        runner.run(f"sort.nodes{nodes_tag}", lambda: status_model._sort_nodes_data(node_dicts), len(nodes))
+    if ("jobs", jobs_tag) not in seen:
+        runner.run(f"sort.jobs{jobs_tag}", lambda: sort_queue_jobs(jobs), len(jobs))
+        runner.run(f"sort.typed_values{jobs_tag}", lambda: add_typed_values(jobs), len(jobs))
+        runner.run(f"enrich.usage{jobs_tag}", lambda: UsageAggregator().update(jobs), len(jobs))
+
+        # --- Filter / model update ---
+        table_model = JobQueueTableModel()
+        table_model.update_jobs(jobs)
+        proxy = JobQueueFilterProxyModel()
+        proxy.setSourceModel(table_model)
+
+        def text_filter():
+            proxy.set_text_filter("user01")
+            proxy.rowCount()
+            proxy.set_text_filter("")
+
+        runner.run(f"filter.text{jobs_tag}", text_filter, len(jobs))
+
+        def column_sort():
+            table_model._sort_ranks.clear()
+            table_model.sort(JOB_QUEUE_FIELDS.index("Time Used"))
+
+        runner.run(f"sort.job_queue{jobs_tag}", column_sort, len(jobs))
+
+        # A refresh as the GUI sees it: sorted, filtered and shown in a view
+        view = QTableView()
+        view.setModel(proxy)
+        table_model.sort(JOB_QUEUE_FIELDS.index("Time Used"))
+        proxy.set_text_filter("state:R")
+        runner.run(f"model.job_queue{jobs_tag}", lambda: table_model.update_jobs(jobs), len(jobs))
+        proxy.set_text_filter("")
+        table_model.sort(-1)
+
+    # --- History ---
+    usage = UsageAggregator().update(jobs)
+    history = UtilizationHistory()
+    clock = iter(range(0, 10 ** 9, 10))  # one refresh every 10 s
+    runner.run(
+        f"history.record{tag}",
+        lambda: history.record(next(clock), utilization_samples(nodes, usage)),
+        len(nodes),
+    )
+
+    runner.run(f"model.cluster_status{tag}", lambda: status_model.update_data(node_dicts, jobs), len(nodes))
+
+    seen.add(("nodes", nodes_tag))
+    seen.add(("jobs", jobs_tag))
+
+
+def compare_with_baseline(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Return the names of benchmarks that regressed beyond the tolerance."""
+    regressions = []
+    base_results = baseline.get("results", {})
+    print(
+        f"\nComparison with baseline (tolerance {tolerance:.0%}, {SHORT_BENCHMARK_TOLERANCE:.0%} under "
+        f"{SHORT_BENCHMARK_MS:g} ms, on raw and calibrated min time)"
+    )
+    for name, current in results.items():
+        base = base_results.get(name)
+        if not base:
+            print(f"  {name:<45} new")
+            continue
+        ratio = current["min_ms"] / base["min_ms"] if base["min_ms"] else 1.0
+        if base.get("relative") and current.get("relative"):
+            # A real regression shows up both in raw and in calibrated time;
+            # machine-speed swings usually only in one of them.
+            ratio = min(ratio, current["relative"] / base["relative"])
+        allowed = tolerance if base["min_ms"] >= SHORT_BENCHMARK_MS else max(tolerance, SHORT_BENCHMARK_TOLERANCE)
+        regressed = ratio > 1 + allowed and current["min_ms"] - base["min_ms"] > NOISE_FLOOR_MS
+        marker = "REGRESSION" if regressed else "ok"
+        print(f"  {name:<45} {base['min_ms']:>10.2f} -> {current['min_ms']:>10.2f} ms  x{ratio:.2f}  {marker}")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def parse_scales(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the Slurm GUI refresh pipeline")
+    parser.add_argument("--nodes", type=parse_scales, help="Comma separated node counts")
+    parser.add_argument("--jobs", type=parse_scales, help="Comma separated job counts")
+    parser.add_argument("--quick", action="store_true", help="Run only the small scales")
+    parser.add_argument("--recorded", metavar="DIR", help="Use recorded command outputs from DIR")
+    parser.add_argument("--repeat", type=int, default=7, help="Samples per benchmark")
+    parser.add_argument("--budget", type=float, default=10.0, help="Time budget per benchmark in seconds")
+    parser.add_argument("--filter", dest="name_filter", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    runner = BenchmarkRunner(args.repeat, args.budget, args.name_filter)
+    seen = set()
+
+    if args.recorded:
+        outputs = load_recorded_outputs(args.recorded)
+        if not outputs:
+            print(f"No recorded outputs found in {args.recorded}")
+            return 2
+        job_ids = [line.split(";")[19] for line in outputs.get("squeue", "").splitlines()[1:] if line.count(";") >= 20]
+        run_scenario(runner, "recorded", outputs, job_ids, seen)
+    else:
+        node_scales = args.nodes or (QUICK_NODE_SCALES if args.quick else DEFAULT_NODE_SCALES)
+        job_scales = args.jobs or (QUICK_JOB_SCALES if args.quick else DEFAULT_JOB_SCALES)
+        for num_nodes in node_scales:
+            for num_jobs in job_scales:
+                cluster = SyntheticCluster.generate(num_nodes, num_jobs, seed=args.seed)
+                job_ids = [job["job_id"] for job in cluster.jobs]
+                outputs = {
+                    "nodes": cluster.render_nodes(),
+                    "squeue": cluster.render_squeue(),
+                    "sacct": cluster.render_sacct(job_ids[:SACCT_JOB_IDS]),
+                    "reservations": cluster.render_reservations(),
+                }
+                run_scenario(runner, f"nodes={num_nodes},jobs={num_jobs}", outputs, job_ids, seen)
+
+    results = runner.results()
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+
+    if args.update_baseline:
+        baseline = {"meta": report["meta"], "results": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                baseline["results"] = json.load(f).get("results", {})
+        baseline["results"].update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=4, sort_keys=True)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to create one.")
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare_with_baseline(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -31,6 +31,10 @@ class ClusterStatusController(QObject):
     def update_status(self, nodes_data: List[Dict[str, Any]], jobs_data: List[Dict[str, Any]]):
         """Update the cluster status with new data"""
         self.model.update_data(nodes_data, jobs_data)
+
+    def update_usage(self, usage: Dict[str, Any]):
+        """Show the usage totals computed by the worker"""
+        self.view.update_usage(usage)
     
     def get_view(self):
         """Get the view widget for embedding in the main application"""
@@ -4,6 +4,11 @@ from models.project_model import JobsModel
 from views.jobs_panel_view import JobsPanelView
 from core.event_bus import get_event_bus, Events, Event
 from core.slurm_api import *
+from core.job_submission import JobSubmissionWorker, SubmissionResult
+from core.job_actions import JobActionWorker, summarize_results
+from models.workflow import WorkflowError, ancestors
+from core.log_watch import get_log_watch_service
+from widgets.log_dashboard_widget import LogDashboardDialog
 from widgets.log_viewer_widget import LogViewerDialog
 from widgets.toast_widget import show_error_toast, show_success_toast, show_warning_toast
 from widgets.new_job_widget import JobCreationDialog
@@ -13,6 +18,9 @@ class JobsPanelController:
         self.model = model
         self.view = view
         self.event_bus = get_event_bus()
+        self.log_dashboard = None
+        self._submission_workers: List[JobSubmissionWorker] = []
+        self._action_workers: List[JobActionWorker] = []
         self._event_bus_subscription()
 
     def _event_bus_subscription(self):
@@ -28,9 +36,12 @@ class JobsPanelController:
         self.event_bus.subscribe(Events.DEL_JOB, self._handle_delete_job)
         self.event_bus.subscribe(Events.DUPLICATE_JOB, self._handle_duplicate_job) 
         self.event_bus.subscribe(Events.JOB_SUBMITTED, self._handle_submit_job)
+        self.event_bus.subscribe(Events.SUBMIT_JOBS, self._handle_submit_jobs)
         self.event_bus.subscribe(Events.STOP_JOB, self._handle_stop_job)
+        self.event_bus.subscribe(Events.JOB_ACTION, self._handle_job_action)
         self.event_bus.subscribe(Events.OPEN_JOB_TERMINAL, self._handle_open_job_terminal)
         self.event_bus.subscribe(Events.VIEW_LOGS, self._handle_view_logs)
+        self.event_bus.subscribe(Events.OPEN_LOG_DASHBOARD, self._handle_open_log_dashboard)
         self.event_bus.subscribe(Events.CREATE_JOB_DIALOG_REQUESTED, self._handle_create_job_dialog_request)
 
     def _handle_create_job_dialog_request(self, event: Event):
@@ -43,7 +54,8 @@ class JobsPanelController:
         dialog = JobCreationDialog(
             parent=self.view, 
             project_name=project_name, 
-            cached_job=cached_job
+            cached_job=cached_job,
+            project_jobs=project.jobs if project else None,
         )
         
         if dialog.exec():
@@ -70,6 +82,8 @@ class JobsPanelController:
     def _on_project_list_changed(self, event: Event):
         """Update the view when the project list in the model changes."""
         projects = event.data.get("projects", [])
+        # Keep the log watch service on the current set of running jobs
+        get_log_watch_service().set_jobs(job for project in projects for job in project.jobs)
         # Update the job tables in the right-hand panel first
         self.view.jobs_table_view.update_projects(projects)
         # Then, update the list of projects, which triggers selection
@@ -96,7 +110,11 @@ class JobsPanelController:
         job_to_modify = self.model.get_job_by_id(project_name, job_id)
         
         if job_to_modify and job_to_modify.status == "NOT_SUBMITTED":
-            dialog = JobCreationDialog(parent=self.view, project_name=project_name, job_to_modify=job_to_modify)
+            project = next((p for p in self.model.projects if p.name == project_name), None)
+            dialog = JobCreationDialog(
+                parent=self.view, project_name=project_name, job_to_modify=job_to_modify,
+                project_jobs=project.jobs if project else None,
+            )
             if dialog.exec():
                 modified_job = dialog.get_job()
                 if modified_job:
@@ -124,36 +142,136 @@ class JobsPanelController:
     
     def _handle_submit_job(self, event: Event):
         """Handle job submission."""
-        project_name = event.data["project_name"]
-        job_id = event.data["job_id"]
-        job_to_submit = self.model.get_job_by_id(project_name, job_id)
+        self._submit_jobs(event.data["project_name"], [event.data["job_id"]])
 
-        if job_to_submit:
-            slurm_api = SlurmAPI()
-            new_job_id, error = slurm_api.submit_job(job_to_submit)
-            
-            if new_job_id:
-                self.model.update_job_after_submission(project_name, job_id, new_job_id)
-                show_success_toast(self.view, "Job Submitted", f"Job submitted successfully with ID: {new_job_id}")
+    def _handle_submit_jobs(self, event: Event):
+        """Submit several jobs of a project at once (all unsubmitted ones if no IDs are given)."""
+        self._submit_jobs(event.data["project_name"], event.data.get("job_ids"))
+
+    def _submit_jobs(self, project_name: str, job_ids: Optional[List[str]]):
+        """
+        Submits jobs in a background batch; results update the model as they
+        arrive. Unsubmitted jobs that the selected ones depend on are submitted
+        with them, so a whole workflow launches from any of its jobs.
+        """
+        if SlurmAPI().connection_status != ConnectionState.CONNECTED:
+            show_error_toast(self.view, "Connection Error", "Not connected to the cluster.")
+            return
+        project = next((p for p in self.model.projects if p.name == project_name), None)
+        if project is None:
+            return
+        in_flight = {job_id for worker in self._submission_workers for job_id in worker.local_ids}
+        available = {job.id: job for job in project.jobs if job.status == NOT_SUBMITTED and job.id not in in_flight}
+        selected = [job_id for job_id in available if job_ids is None or job_id in job_ids]
+        closure = set(ancestors(available, selected))
+        jobs = [job for job in project.jobs if job.id in closure]
+        if not jobs:
+            if job_ids is None:
+                show_warning_toast(self.view, "Nothing to Submit", f"No unsubmitted jobs in '{project_name}'.")
+            return
+        if any(dep in in_flight for job in jobs for dep in job.depends_on or []):
+            show_warning_toast(
+                self.view, "Submission in Progress", "Some of these jobs depend on jobs that are still being submitted."
+            )
+            return
+
+        try:
+            worker = JobSubmissionWorker([(project_name, job) for job in jobs])
+        except WorkflowError as e:
+            show_error_toast(self.view, "Invalid Workflow", str(e))
+            return
+        worker.results_ready.connect(lambda results, w=worker: self._on_submission_results(w, results))
+        worker.submission_finished.connect(
+            lambda submitted, failed, w=worker: self._on_submission_finished(w, submitted, failed)
+        )
+        self._submission_workers.append(worker)
+        worker.start()
+
+    def _on_submission_results(self, worker: JobSubmissionWorker, results: List[SubmissionResult]):
+        self.model.update_jobs_after_submission(
+            [(r.project_name, r.local_id, r.job_id, r.workflow) for r in results if r.job_id]
+        )
+        if len(worker.jobs) > 1:
+            return  # Batches are summarized once they finish
+        for result in results:
+            if result.job_id and result.warning:
+                show_warning_toast(
+                    self.view, "Job Submitted", f"Job submitted with ID: {result.job_id}\nsbatch: {result.warning}"
+                )
+            elif result.job_id:
+                show_success_toast(self.view, "Job Submitted", f"Job submitted successfully with ID: {result.job_id}")
             else:
-                show_error_toast(self.view, "Submission Failed", f"Error: {error}")
-    
+                show_error_toast(self.view, "Submission Failed", f"Error: {result.error}")
+
+    def _on_submission_finished(self, worker: JobSubmissionWorker, submitted: int, failed: int):
+        if worker in self._submission_workers:
+            self._submission_workers.remove(worker)
+        worker.deleteLater()
+        if len(worker.jobs) > 1:
+            message = f"{submitted} of {len(worker.jobs)} jobs submitted."
+            if worker.workflow:
+                message = f"Workflow {worker.workflow}: {message[:-1]} in {len(worker.levels)} stages."
+            if failed:
+                first_error = f" First error: {worker.errors[0]}" if worker.errors else ""
+                show_warning_toast(self.view, "Batch Submitted", f"{message} {failed} failed.{first_error}")
+            elif worker.warnings:
+                show_warning_toast(
+                    self.view, "Batch Submitted",
+                    f"{message} sbatch printed warnings for {len(worker.warnings)}. First warning: {worker.warnings[0]}",
+                )
+            else:
+                show_success_toast(self.view, "Batch Submitted", message)
+
     def _handle_stop_job(self, event: Event):
         """Handle job cancellation (scancel) request."""
-        job_id = event.data["job_id"]
-        slurm_api = SlurmAPI()
-        
-        if slurm_api.connection_status != ConnectionState.CONNECTED:
+        self._run_job_action(JOB_ACTION_CANCEL, [event.data["job_id"]])
+
+    def _handle_job_action(self, event: Event):
+        """Bulk cancel/hold/release/requeue/nice from the jobs panel or the cluster queue."""
+        self._run_job_action(event.data["action"], event.data["job_ids"], event.data.get("value"))
+
+    def _run_job_action(self, action: str, job_ids: List[str], value: Optional[int] = None):
+        """Runs one scancel/scontrol for all ``job_ids`` in the background."""
+        if SlurmAPI().connection_status != ConnectionState.CONNECTED:
             show_error_toast(self.view, "Connection Error", "Not connected to the cluster.")
             return
+        if not job_ids:
+            return
+        if action == JOB_ACTION_CANCEL and len(job_ids) > 1:
+            reply = QMessageBox.question(
+                self.view,
+                "Cancel Jobs",
+                f"Are you sure you want to cancel {len(job_ids)} jobs?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No,
+            )
+            if reply != QMessageBox.StandardButton.Yes:
+                return
 
-        stdout, stderr = slurm_api.cancel_job(job_id)
+        worker = JobActionWorker(action, job_ids, value)
+        worker.action_finished.connect(
+            lambda action, results, w=worker: self._on_job_action_finished(w, action, results)
+        )
+        self._action_workers.append(worker)
+        worker.start()
 
-        if stderr:
-            show_error_toast(self.view, "Stop Job Failed", f"Could not stop job {job_id}: {stderr}")
+    def _on_job_action_finished(self, worker: JobActionWorker, action: str, results: dict):
+        if worker in self._action_workers:
+            self._action_workers.remove(worker)
+        worker.deleteLater()
+        if action == JOB_ACTION_CANCEL and len(results) == 1:
+            job_id, error = next(iter(results.items()))
+            if error:
+                show_error_toast(self.view, "Stop Job Failed", f"Could not stop job {job_id}: {error}")
+            else:
+                show_success_toast(self.view, "Job Stop Requested", f"Cancel signal sent to job {job_id}.")
+            return
+        message = summarize_results(action, results)
+        if any(results.values()):
+            show_warning_toast(self.view, "Job Action", message)
         else:
-            show_success_toast(self.view, "Job Stop Requested", f"Cancel signal sent to job {job_id}.")
-    
+            show_success_toast(self.view, "Job Action", message)
+
     def _handle_open_job_terminal(self, event: Event):
         """Handle request to open a terminal for a running job."""
         job_id = event.data["job_id"]
@@ -173,6 +291,7 @@ class JobsPanelController:
                 host=slurm_api._config.host,
                 username=slurm_api._config.username,
                 password=slurm_api._config.password,
+                port=slurm_api._config.port,
                 command_to_run=srun_command
             )
             
@@ -194,6 +313,15 @@ class JobsPanelController:
         # Create and show the log viewer dialog
         dialog = LogViewerDialog(job, parent=self.view)
         dialog.exec()
+
+    def _handle_open_log_dashboard(self, event: Event):
+        """Shows the dashboard of all running jobs' logs (a single instance)."""
+        get_log_watch_service().set_jobs(job for project in self.model.projects for job in project.jobs)
+        if self.log_dashboard is None:
+            self.log_dashboard = LogDashboardDialog(parent=self.view)
+        self.log_dashboard.show()
+        self.log_dashboard.raise_()
+        self.log_dashboard.activateWindow()
         
     def _shutdown(self, event):
         """Handle connection status changes."""
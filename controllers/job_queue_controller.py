@@ -1,5 +1,6 @@
 from core.slurm_api import ConnectionState
-from models.job_queue_model import JobQueueModel, JobQueueTableModel
+from core.job_query import JobQueryError
+from models.job_queue_model import SORT_ROLE, JobQueueModel, JobQueueTableModel
 from core.defaults import *
 from views.job_queue_view import JobQueueView
 from PyQt6.QtCore import QSortFilterProxyModel
@@ -7,61 +8,28 @@ from typing import List, Dict, Any
 
 class JobQueueFilterProxyModel(QSortFilterProxyModel):
     """
-    A custom filter proxy model to handle combined filtering:
-    1. A text filter that searches across all columns.
+    Proxy over JobQueueTableModel handling combined filtering:
+    1. A query filter (core.job_query), plain words searching all columns.
     2. A column-specific keyword filter that can be inverted (negative).
+
+    The filters are applied by the source model against its precomputed
+    search keys; calling filterAcceptsRow for every row costs ~20 ms per
+    keystroke at 20k jobs, so this proxy only forwards the filter state.
+    Sorting is forwarded too: the source model sorts on pre-parsed native
+    keys, where lessThan would call data() O(n log n) times.
     """
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self._text_filter_string = ""
-        self._column_filter_keywords = []
-        self._column_filter_column = -1
-        self._is_negative = False
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder):
+        """Sorts the source model; the proxy keeps its order."""
+        self.sourceModel().sort(column, order)
 
     def set_text_filter(self, text: str):
         """Sets the string for the general text filter."""
-        self._text_filter_string = text.lower()
-        self.invalidateFilter() # Force the view to re-filter
+        self.sourceModel().set_text_filter(text)
 
     def set_column_filter(self, keywords: list, column: int, negative: bool = False):
         """Sets the keywords for the column-specific filter."""
-        self._column_filter_keywords = [kw.lower() for kw in keywords if kw]
-        self._column_filter_column = column
-        self._is_negative = negative
-        self.invalidateFilter() # Force the view to re-filter
-
-    def filterAcceptsRow(self, source_row: int, source_parent) -> bool:
-        """
-        Overrides the base class method to implement custom filtering logic.
-        A row is accepted if it matches both the text filter and the column filter.
-        """
-        # 1. Column-specific keyword filter (for 'ME', 'PROD', 'STUD')
-        column_match = True
-        if self._column_filter_keywords and self._column_filter_column >= 0:
-            index = self.sourceModel().index(source_row, self._column_filter_column, source_parent)
-            cell_data = str(self.sourceModel().data(index)).lower()
-            
-            # Check if any of the keywords are present in the cell data
-            match_found = any(kw in cell_data for kw in self._column_filter_keywords)
-
-            # Apply negative logic if required
-            if self._is_negative:
-                column_match = not match_found
-            else:
-                column_match = match_found
-        
-        # 2. General text filter (searches all columns)
-        text_match = True
-        if self._text_filter_string:
-            text_match = False # Assume no match until one is found
-            for i in range(self.sourceModel().columnCount()):
-                index = self.sourceModel().index(source_row, i, source_parent)
-                cell_data = str(self.sourceModel().data(index)).lower()
-                if self._text_filter_string in cell_data:
-                    text_match = True
-                    break # Found a match, no need to check other columns
-            
-        return text_match and column_match
+        self.sourceModel().set_column_filter(keywords, column, negative)
 
 
 class JobQueueController:
@@ -76,6 +44,7 @@ class JobQueueController:
         self.proxy_model = JobQueueFilterProxyModel()
         
         self.proxy_model.setSourceModel(self.table_model)
+        self.proxy_model.setSortRole(SORT_ROLE)
         
         self.view = JobQueueView()
         self.view.setModel(self.proxy_model)
@@ -107,9 +76,13 @@ class JobQueueController:
             # This should not happen if "User" is in JOB_QUEUE_FIELDS
             print("Error: 'User' column not found in JOB_QUEUE_FIELDS definition.")
 
-    def filter_table(self, text: str):
-        """Applies a text filter across all columns."""
-        self.proxy_model.set_text_filter(text)
+    def filter_table(self, text: str) -> str:
+        """Applies a filter query (see core.job_query); returns the error if it is invalid."""
+        try:
+            self.proxy_model.set_text_filter(text)
+        except JobQueryError as e:
+            return str(e)
+        return ""
 
     def _shutdown(self, event_data):
         new_state = event_data.data["new_state"]
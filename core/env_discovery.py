@@ -0,0 +1,168 @@
+"""
+Environment Discovery - finds Python virtualenvs and conda environments on the cluster.
+
+One remote 'find' over the scan roots reports every '<env>/bin/activate' and
+'<env>/conda-meta'. The results are cached per host on disk with the time of
+the scan, so the job dialog can offer them as a dropdown without any SSH
+round-trip; a stale cache is still shown and refreshed in the background.
+"""
+
+import json
+import os
+import shlex
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from core.slurm_api import ConnectionState, SlurmAPI
+from utils import configs_dir
+
+ENV_CACHE_PATH = os.path.join(configs_dir, "env_cache.json")
+# A cached scan older than this is refreshed in the background when used
+ENV_CACHE_TTL_S = 24 * 3600
+# Scan roots: environment variables of the remote shell (unset ones are skipped)
+ENV_SCAN_ROOT_VARIABLES = ["HOME", "SCRATCH", "WORK", "STORE", "PROJECT"]
+# '<root>/miniconda3/envs/<name>/bin/activate' is five levels below the root
+ENV_SCAN_MAX_DEPTH = 5
+ENV_SCAN_MAX_RESULTS = 2000
+# Never descended into: package caches and installed packages are large and hold no environments
+ENV_SCAN_PRUNED_NAMES = [".git", ".cache", "node_modules", "pkgs", "site-packages", "__pycache__"]
+
+KIND_VENV = "venv"
+KIND_CONDA = "conda"
+
+
+@dataclass
+class PythonEnvironment:
+    path: str
+    kind: str  # KIND_VENV or KIND_CONDA
+    mtime: float = 0.0
+
+    @property
+    def label(self) -> str:
+        return f"{self.path}  ({self.kind})"
+
+
+def build_scan_command(max_depth: int = ENV_SCAN_MAX_DEPTH, max_results: int = ENV_SCAN_MAX_RESULTS) -> str:
+    """'find' printing '<dir>|<mtime>' for every bin/activate (dir = .../bin) and conda-meta (dir = env)."""
+    roots = " ".join(f'${{{name}:+"${name}"}}' for name in ENV_SCAN_ROOT_VARIABLES)
+    pruned = " -o ".join(f"-name {shlex.quote(name)}" for name in ENV_SCAN_PRUNED_NAMES)
+    return (
+        f"find {roots} -maxdepth {max_depth} \\( {pruned} \\) -prune -o "
+        f"\\( -path '*/bin/activate' -type f -o -name conda-meta -type d \\) -printf '%h|%T@\\n' "
+        f"2>/dev/null | head -n {max_results}"
+    )
+
+
+def parse_scan_output(stdout: str) -> List[PythonEnvironment]:
+    """Environments found by build_scan_command; an env with conda-meta is a conda env."""
+    found: Dict[str, PythonEnvironment] = {}
+    for line in stdout.splitlines():
+        directory, _, mtime = line.rpartition("|")
+        if not directory.startswith("/"):
+            continue
+        try:
+            modified = float(mtime)
+        except ValueError:
+            modified = 0.0
+        if directory.endswith("/bin"):
+            path, kind = directory[: -len("/bin")], KIND_VENV
+        else:
+            path, kind = directory, KIND_CONDA
+        env = found.setdefault(path, PythonEnvironment(path, kind, modified))
+        if kind == KIND_CONDA:
+            env.kind = KIND_CONDA
+        env.mtime = max(env.mtime, modified)
+    return sorted(found.values(), key=lambda e: e.path)
+
+
+class EnvironmentDiscovery(QThread):
+    """Scans the cluster for Python environments in the background and caches them per host."""
+
+    environments_changed = pyqtSignal(list)  # List[PythonEnvironment] of the connected host
+
+    def __init__(self, cache_path: str = ENV_CACHE_PATH, parent=None):
+        super().__init__(parent)
+        self.slurm_api = SlurmAPI()
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        self._cache: Optional[Dict[str, dict]] = None  # host -> {"scanned_at", "environments"}
+
+    def host_key(self) -> str:
+        config = self.slurm_api._config
+        return f"{config.username}@{config.host}"
+
+    def environments(self) -> List[PythonEnvironment]:
+        """Cached environments of the connected host (no round-trip)."""
+        entry = self._load().get(self.host_key())
+        if not entry:
+            return []
+        return [PythonEnvironment(**env) for env in entry.get("environments", [])]
+
+    def scanned_at(self) -> Optional[float]:
+        entry = self._load().get(self.host_key())
+        return entry.get("scanned_at") if entry else None
+
+    def refresh(self, force: bool = False, max_age: float = ENV_CACHE_TTL_S):
+        """Starts a background scan if forced or if the cache of this host is missing or stale."""
+        if self.isRunning() or self.slurm_api.connection_status != ConnectionState.CONNECTED:
+            return
+        scanned_at = self.scanned_at()
+        if force or scanned_at is None or time.time() - scanned_at > max_age:
+            self.start()
+
+    def stop(self):
+        self.wait()
+
+    def run(self):
+        host = self.host_key()
+        try:
+            result = self.slurm_api.run_command(build_scan_command(), span="ssh.env_scan")
+        except Exception as e:
+            print(f"Environment discovery failed: {e}")
+            return
+        if result is None:
+            return
+        environments = parse_scan_output(result[0])
+        cache = self._load()
+        with self._lock:
+            cache[host] = {"scanned_at": time.time(), "environments": [asdict(env) for env in environments]}
+            self._save(cache)
+        self.environments_changed.emit(environments)
+
+    # --- Persistence ---------------------------------------------------------
+
+    def _load(self) -> Dict[str, dict]:
+        with self._lock:
+            if self._cache is None:
+                try:
+                    with open(self.cache_path, "r", encoding="utf-8") as f:
+                        self._cache = json.load(f)
+                except (OSError, ValueError):
+                    self._cache = {}
+            return self._cache
+
+    def _save(self, cache: Dict[str, dict]):
+        """Writes the cache atomically (call with _lock held)."""
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(cache, f, indent=1)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Could not save environment cache: {e}")
+
+
+_env_discovery_instance: Optional[EnvironmentDiscovery] = None
+
+
+def get_environment_discovery() -> EnvironmentDiscovery:
+    """Get the global EnvironmentDiscovery instance."""
+    global _env_discovery_instance
+    if _env_discovery_instance is None:
+        _env_discovery_instance = EnvironmentDiscovery()
+    return _env_discovery_instance
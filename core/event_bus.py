@@ -282,6 +282,7 @@ class Events:
     
     # Job events  
     JOB_SUBMITTED = "job.submitted"
+    SUBMIT_JOBS = "job.submit_batch"
     JOB_STATUS_CHANGED = "job.status_changed"
     JOB_COMPLETED = "job.completed"
     JOB_FAILED = "job.failed"
@@ -290,8 +291,10 @@ class Events:
     DEL_JOB = "job.del_job"
     DUPLICATE_JOB = "job.duplicate"
     STOP_JOB = "job.stop"
+    JOB_ACTION = "job.bulk_action"
     OPEN_JOB_TERMINAL = "job.open_terminal"
     VIEW_LOGS = "job.view_logs"
+    OPEN_LOG_DASHBOARD = "job.open_log_dashboard"
     CREATE_JOB_DIALOG_REQUESTED = "job.create_dialog_requested"
 
     # Data events
@@ -0,0 +1,89 @@
+"""
+Job Actions - cancel, hold, release, requeue or renice many jobs off the GUI thread.
+
+All selected jobs (and array tasks such as '123_4') go out in one scancel or
+scontrol command (SlurmAPI.job_action), so acting on hundreds of jobs costs a
+single SSH round-trip; failures are reported per job ID from the error output.
+"""
+
+from typing import Dict, List, Optional
+
+from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtWidgets import QInputDialog, QMenu, QWidget
+
+from core.event_bus import Events, get_event_bus
+from core.slurm_api import (JOB_ACTION_CANCEL, JOB_ACTION_HOLD, JOB_ACTION_NICE, JOB_ACTION_RELEASE,
+                            JOB_ACTION_REQUEUE, SlurmAPI)
+
+# Menu entries, in order
+JOB_ACTION_MENU = [
+    (JOB_ACTION_CANCEL, "Cancel"),
+    (JOB_ACTION_HOLD, "Hold"),
+    (JOB_ACTION_RELEASE, "Release"),
+    (JOB_ACTION_REQUEUE, "Requeue"),
+    (JOB_ACTION_NICE, "Set Nice..."),
+]
+# Past-tense labels for result messages
+JOB_ACTION_LABELS = {
+    JOB_ACTION_CANCEL: "Cancelled",
+    JOB_ACTION_HOLD: "Held",
+    JOB_ACTION_RELEASE: "Released",
+    JOB_ACTION_REQUEUE: "Requeued",
+    JOB_ACTION_NICE: "Reniced",
+}
+
+
+class JobActionWorker(QThread):
+    """Runs one bulk action and reports the result of every job."""
+
+    action_finished = pyqtSignal(str, dict)  # action, {job_id: error or None}
+
+    def __init__(self, action: str, job_ids: List[str], value: Optional[int] = None, parent=None):
+        super().__init__(parent)
+        self.slurm_api = SlurmAPI()
+        self.action = action
+        self.job_ids = list(job_ids)
+        self.value = value
+
+    def run(self):
+        try:
+            results = self.slurm_api.job_action(self.action, self.job_ids, self.value)
+        except Exception as e:
+            results = {job_id: str(e) for job_id in self.job_ids}
+        if results is None:
+            results = {job_id: "Not connected." for job_id in self.job_ids}
+        self.action_finished.emit(self.action, results)
+
+
+def summarize_results(action: str, results: Dict[str, Optional[str]]) -> str:
+    """'Cancelled 298 of 300 jobs. 2 failed: 123: <error>'."""
+    failed = {job_id: error for job_id, error in results.items() if error}
+    label = JOB_ACTION_LABELS.get(action, action.capitalize())
+    message = f"{label} {len(results) - len(failed)} of {len(results)} jobs."
+    if failed:
+        job_id, error = next(iter(failed.items()))
+        message += f" {len(failed)} failed: {job_id}: {error}"
+    return message
+
+
+def add_job_action_menu(menu: QMenu, parent: QWidget, job_ids: List[str], source: str):
+    """Adds the bulk actions for ``job_ids`` to ``menu``; choosing one emits Events.JOB_ACTION."""
+    count = f" ({len(job_ids)})" if len(job_ids) > 1 else ""
+    for action, text in JOB_ACTION_MENU:
+        item = menu.addAction(f"{text}{count}")
+        item.setEnabled(bool(job_ids))
+        item.triggered.connect(lambda _, a=action: emit_job_action(parent, a, job_ids, source))
+
+
+def emit_job_action(parent: QWidget, action: str, job_ids: List[str], source: str):
+    """Emits Events.JOB_ACTION, asking for the nice value first if needed."""
+    value = None
+    if action == JOB_ACTION_NICE:
+        value, ok = QInputDialog.getInt(
+            parent, "Set Nice", f"Nice value for {len(job_ids)} job(s) (higher runs later):", 0, -10000, 10000
+        )
+        if not ok:
+            return
+    get_event_bus().emit(
+        Events.JOB_ACTION, data={"action": action, "job_ids": list(job_ids), "value": value}, source=source
+    )
@@ -0,0 +1,92 @@
+"""
+Job Columns - typed values of the job queue columns.
+
+squeue reports IDs, times and memory as text. The worker converts them once
+per snapshot (add_typed_values) into native numbers stored in every job under
+TYPED_VALUES: the table model sorts on them and filter queries compare
+against them, instead of parsing or comparing strings row by row.
+"""
+
+import functools
+import math
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils import parse_duration
+
+# Key of the typed values in a job dict
+TYPED_VALUES = "TypedValues"
+
+# Distinct memory sizes and time limits are few; their parses are memoized
+PARSE_CACHE_SIZE = 1024
+MEMORY_RE = re.compile(r"^(\d+(?:\.\d+)?)\s*([kmgt]?)b?$")
+# Slurm's default memory unit is MB
+MEMORY_UNITS = {"k": 1024, "": 1024 ** 2, "m": 1024 ** 2, "g": 1024 ** 3, "t": 1024 ** 4}
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_memory(text: Any) -> Optional[float]:
+    """'16G' -> 17179869184.0 (bytes)."""
+    match = MEMORY_RE.match(str(text).strip().lower())
+    if not match:
+        return None
+    return float(match.group(1)) * MEMORY_UNITS[match.group(2)]
+
+
+def parse_job_id(text: Any) -> Optional[Tuple[int, int]]:
+    """'123' -> (123, -1), '123_4' -> (123, 4); a task range sorts before its tasks."""
+    job_id, _, task = str(text).partition("_")
+    if not job_id.isdigit():
+        return None
+    return int(job_id), int(task) if task.isdigit() else -1
+
+
+def _count(value: Any) -> Optional[float]:
+    return value if isinstance(value, (int, float)) else None
+
+
+def _time_used(value: Any) -> Optional[float]:
+    return value[1].total_seconds() if isinstance(value, list) and len(value) == 2 else None
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _time_limit(value: Any) -> Optional[float]:
+    if value == "UNLIMITED":
+        return math.inf
+    try:
+        return parse_duration(value).total_seconds()
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+def _submit_time(value: Any) -> Optional[str]:
+    # ISO timestamps compare correctly as strings, so they are not parsed
+    return value if isinstance(value, str) and value[:1].isdigit() else None
+
+
+# Job column -> typed value of a cell (None if unknown): counts, seconds, bytes
+COLUMN_TYPES: Dict[str, Callable[[Any], Any]] = {
+    "Job ID": parse_job_id,
+    "Priority": _count,
+    "CPUs": _count,
+    "GPUs": _count,
+    "RAM": parse_memory,
+    "Time Used": _time_used,
+    "Time Limit": _time_limit,
+    "Submit Time": _submit_time,
+}
+
+
+def typed_value(job: Dict[str, Any], column: str) -> Any:
+    """Typed value of ``column``, pre-parsed by add_typed_values when available."""
+    typed = job.get(TYPED_VALUES)
+    if typed is not None:
+        return typed[column]
+    return COLUMN_TYPES[column](job.get(column))
+
+
+def add_typed_values(jobs: List[Dict[str, Any]]):
+    """Stores the typed value of every typed column in each job."""
+    columns = list(COLUMN_TYPES.items())
+    for job in jobs:
+        job[TYPED_VALUES] = {column: convert(job.get(column)) for column, convert in columns}
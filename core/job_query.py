@@ -0,0 +1,217 @@
+"""
+Job Query - a small query language for the job queue filter.
+
+'user:alice state:PD gpus>=4 partition:gpu* age>2h' is compiled once into a
+JobQuery. Terms on text columns (user, state, partition, ...) are resolved
+through per-column indexes (value -> rows) instead of visiting every row,
+numeric comparisons run over typed columns, and bare words are matched as
+substrings of the row search keys. All terms must hold; a leading '-'
+negates a term, 'field:a,b' matches either value and '*'/'?' are globs.
+
+'age' compares the Submit Time column, which squeue prints in the cluster's
+local time, against a cutoff taken from this computer's clock each time the
+query is evaluated; if the two are in different time zones ages are off by
+the difference.
+"""
+
+import operator
+import re
+import shlex
+import time
+from fnmatch import translate
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from core.defaults import JOB_CODES
+from core.job_columns import parse_memory
+from utils import parse_duration
+
+# Query field -> job column matched by value (through the column's index)
+INDEXED_FIELDS = {
+    "user": "User",
+    "account": "Account",
+    "partition": "Partition",
+    "state": "Status",
+    "status": "Status",
+    "reason": "Reason",
+    "name": "Job Name",
+    "id": "Job ID",
+    "node": "Nodelist",
+}
+# Query field -> typed column (core.job_columns) compared with <, <=, >, >=, =, !=
+NUMERIC_FIELDS = {
+    "gpus": "GPUs",
+    "cpus": "CPUs",
+    "priority": "Priority",
+    "mem": "RAM",
+    "ram": "RAM",
+    "time": "Time Used",
+    "limit": "Time Limit",
+}
+# Column compared by 'age' terms (with a cutoff computed per evaluation)
+AGE_COLUMN = "Submit Time"
+COMPARISONS = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+# age>X means the submit time is before now - X, so the comparison flips
+FLIPPED_COMPARISONS = {"=": "=", "!=": "!=", ">": "<", ">=": "<=", "<": ">", "<=": ">="}
+# Tooltip of the filter box
+QUERY_HELP = (
+    "Words match any column. Fields: user:, account:, partition:, state:, reason:, name:, id:, node:\n"
+    "(globs and a,b alternatives), gpus, cpus, priority, mem, time, limit, age with < <= > >= = !=\n"
+    "e.g. user:alice state:PD gpus>=4 partition:gpu* age>2h -reason:*Dependency*\n"
+    "age compares the cluster's Submit Time with this computer's clock"
+)
+
+TERM_RE = re.compile(r"^(-?)([a-z]+)(>=|<=|!=|:|=|>|<)(.+)$")
+DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)([dhms])")
+DURATION_UNITS = {"d": 86400, "h": 3600, "m": 60, "s": 1}
+SUBMIT_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+class JobQueryError(ValueError):
+    """The filter text is not a valid query."""
+
+
+# --- Query values ------------------------------------------------------------
+
+def parse_query_duration(text: str) -> float:
+    """'2h', '1h30m', '90s' or a Slurm duration ('1-02:00:00') in seconds."""
+    text = text.strip().lower()
+    if ":" in text:
+        try:
+            return parse_duration(text).total_seconds()
+        except ValueError:
+            raise JobQueryError(f"Invalid duration: {text}")
+    parts = DURATION_RE.findall(text)
+    if parts and "".join(number + unit for number, unit in parts) == text:
+        return sum(float(number) * DURATION_UNITS[unit] for number, unit in parts)
+    try:
+        return float(text) * 60  # Slurm reads a bare number as minutes
+    except ValueError:
+        raise JobQueryError(f"Invalid duration: {text}")
+
+
+def age_cutoff(seconds: float, now: Optional[float] = None) -> str:
+    """Submit time (in Submit Time column format) of a job that is ``seconds`` old at ``now``."""
+    cutoff = (time.time() if now is None else now) - seconds
+    return time.strftime(SUBMIT_TIME_FORMAT, time.localtime(cutoff))
+
+
+def _parse_number(field: str, text: str) -> Any:
+    """Query value of a numeric field, in the unit of its typed column."""
+    if field in ("time", "limit"):
+        return parse_query_duration(text)
+    if field in ("mem", "ram"):
+        value = parse_memory(text)
+        if value is None:
+            raise JobQueryError(f"Invalid memory size: {text}")
+        return value
+    try:
+        return float(text)
+    except ValueError:
+        raise JobQueryError(f"'{field}' needs a number, got '{text}'")
+
+
+# --- Compiled query ----------------------------------------------------------
+
+class JobQuery:
+    """
+    A compiled query. ``select`` evaluates it against a table providing
+    ``column_index(column)`` (lowercase value -> rows), ``typed_column(column)``
+    (one typed value per row) and ``search_keys()`` (one lowercase key per row).
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.index_terms: List[Tuple[str, List[str], bool]] = []  # column, patterns, negate
+        self.numeric_terms: List[Tuple[str, Callable, Any, bool]] = []  # column, comparison, value, negate
+        self.age_terms: List[Tuple[Callable, float, bool]] = []  # comparison on submit time, seconds, negate
+        self.words: List[Tuple[str, bool]] = []  # lowercase word, negate
+
+    def __bool__(self) -> bool:
+        return bool(self.index_terms or self.numeric_terms or self.age_terms or self.words)
+
+    def select(self, table, rows: Sequence[int]) -> List[int]:
+        """The rows of ``rows`` matching every term, in order."""
+        candidates = rows
+        # Positive index terms narrow the candidates first
+        for column, patterns, negate in sorted(self.index_terms, key=lambda term: term[2]):
+            matched = _index_rows(table.column_index(column), patterns)
+            candidates = [row for row in candidates if (row in matched) != negate]
+
+        # Ages are relative to now, so their cutoffs move with every evaluation
+        now = time.time()
+        numeric_terms = self.numeric_terms + [
+            (AGE_COLUMN, compare, age_cutoff(seconds, now), negate) for compare, seconds, negate in self.age_terms
+        ]
+        for column, compare, value, negate in numeric_terms:
+            values = table.typed_column(column)
+            candidates = [
+                row for row in candidates
+                if (values[row] is not None and compare(values[row], value)) != negate
+            ]
+        if self.words:
+            keys = table.search_keys()
+            for word, negate in self.words:
+                candidates = [row for row in candidates if (word in keys[row]) != negate]
+        return list(candidates)
+
+
+def _index_rows(index: Dict[str, List[int]], patterns: List[str]) -> set:
+    """Rows whose value matches one of ``patterns`` (exact or glob)."""
+    rows = set()
+    for pattern in patterns:
+        if any(char in pattern for char in "*?["):
+            match = re.compile(translate(pattern)).match
+            for value, value_rows in index.items():
+                if match(value):
+                    rows.update(value_rows)
+        else:
+            rows.update(index.get(pattern, ()))
+    return rows
+
+
+def _state_patterns(values: List[str]) -> List[str]:
+    """'PD' and 'pending' both match the PENDING status."""
+    return [JOB_CODES.get(value.upper(), value).lower() for value in values]
+
+
+def compile_query(text: str) -> JobQuery:
+    """Parses the filter text; raises JobQueryError for invalid field values."""
+    query = JobQuery(text)
+    try:
+        tokens = shlex.split(text)
+    except ValueError:  # unbalanced quote while typing
+        tokens = text.split()
+
+    for token in tokens:
+        match = TERM_RE.match(token.lower())
+        field = match.group(2) if match else None
+        if field in INDEXED_FIELDS:
+            negate, _, op, value = match.groups()
+            if op not in (":", "=", "!="):
+                raise JobQueryError(f"'{field}' can only be compared with ':', '=' or '!='")
+            patterns = [part for part in value.split(",") if part]
+            if field in ("state", "status"):
+                patterns = _state_patterns(patterns)
+            query.index_terms.append((INDEXED_FIELDS[field], patterns, bool(negate) != (op == "!=")))
+        elif field == "age":
+            negate, _, op, value = match.groups()
+            op = FLIPPED_COMPARISONS["=" if op == ":" else op]
+            query.age_terms.append((COMPARISONS[op], parse_query_duration(value), bool(negate)))
+        elif field in NUMERIC_FIELDS:
+            negate, _, op, value = match.groups()
+            op = "=" if op == ":" else op
+            query.numeric_terms.append(
+                (NUMERIC_FIELDS[field], COMPARISONS[op], _parse_number(field, value), bool(negate))
+            )
+        elif token.startswith("-") and len(token) > 1:
+            query.words.append((token[1:].lower(), True))
+        else:
+            query.words.append((token.lower(), False))
+    return query
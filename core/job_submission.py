@@ -0,0 +1,116 @@
+"""
+Job Submission - submits batches of jobs off the GUI thread.
+
+Scripts are generated in memory and piped to 'sbatch' over concurrent channels
+of the existing SSH connection (SlurmAPI.submit_jobs). Per-job results are
+reported in batches, so the model is updated and saved once per batch rather
+than once per job. Jobs linked by workflow edges (Job.depends_on) are
+submitted one topological level at a time, each level in parallel, with their
+'--dependency=afterok:' filled in from the IDs returned for earlier levels.
+"""
+
+import copy
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from core.slurm_api import SlurmAPI
+from models.project_model import Job
+from models.settings_model import get_notification_settings
+from models.workflow import dependency_spec, new_workflow_id, topological_levels
+
+# Results are emitted at most this often while a batch is being submitted
+RESULT_BATCH_INTERVAL_S = 0.5
+
+
+@dataclass
+class SubmissionResult:
+    project_name: str
+    local_id: str  # ID of the job in the project before submission
+    job_id: Optional[str]  # SLURM job ID, None on failure
+    error: Optional[str] = None
+    workflow: Optional[str] = None  # ID of the workflow the job was submitted with
+    warning: Optional[str] = None  # What sbatch printed on stderr for a submitted job
+
+
+class JobSubmissionWorker(QThread):
+    """Submits ``(project_name, job)`` pairs in pipelined batches, one per workflow level."""
+
+    results_ready = pyqtSignal(list)  # List[SubmissionResult]
+    submission_finished = pyqtSignal(int, int)  # submitted, failed
+
+    def __init__(self, jobs: List[Tuple[str, Job]], parent=None):
+        super().__init__(parent)
+        self.slurm_api = SlurmAPI()
+        # Copies: the model may change while the batch is in flight
+        self.jobs = [(project_name, copy.deepcopy(job)) for project_name, job in jobs]
+        # Taken on the GUI thread, so the submission threads never read the settings file
+        self.notification_settings = get_notification_settings()
+        # Raises WorkflowError for a dependency cycle, before anything is submitted
+        self.levels = topological_levels([job for _, job in self.jobs])
+        has_edges = len(self.levels) > 1
+        self.workflow = new_workflow_id() if has_edges else None
+        self.errors: List[str] = []
+        self.warnings: List[str] = []
+        self._lock = threading.Lock()
+        self._pending: List[SubmissionResult] = []
+        self._last_emit = 0.0
+
+    @property
+    def local_ids(self) -> List[str]:
+        return [job.id for _, job in self.jobs]
+
+    def run(self):
+        self._last_emit = time.monotonic()
+        batch_ids = set(self.local_ids)
+        slurm_ids: Dict[str, str] = {}  # project job ID -> Slurm job ID
+        for level in self.levels:
+            batch, indexes = [], []
+            for index in level:
+                job = self.jobs[index][1]
+                if any(dep in batch_ids and dep not in slurm_ids for dep in job.depends_on or []):
+                    self._on_result(index, None, "A job it depends on was not submitted.")
+                    continue
+                job.dependency = dependency_spec(job, slurm_ids)
+                batch.append(job)
+                indexes.append(index)
+            if not batch:
+                continue
+            results = self.slurm_api.submit_jobs(
+                batch,
+                on_result=lambda i, job_id, error, indexes=indexes: self._on_result(indexes[i], job_id, error),
+                notification_settings=self.notification_settings,
+            )
+            if results is None:
+                for index in indexes:
+                    self._on_result(index, None, "Not connected.")
+                continue
+            for index, (job_id, _) in zip(indexes, results):
+                if job_id:
+                    slurm_ids[self.jobs[index][1].id] = job_id
+        self._flush()
+        self.submission_finished.emit(len(slurm_ids), len(self.jobs) - len(slurm_ids))
+
+    def _on_result(self, index: int, job_id: Optional[str], error: Optional[str]):
+        """Called from the submission threads as each job completes; ``error`` is sbatch's warning if submitted."""
+        project_name, job = self.jobs[index]
+        with self._lock:
+            if job_id:
+                self._pending.append(SubmissionResult(project_name, job.id, job_id, None, self.workflow, error))
+                if error:
+                    self.warnings.append(error)
+            else:
+                self._pending.append(SubmissionResult(project_name, job.id, None, error, self.workflow))
+                self.errors.append(error or "Unknown error")
+        if time.monotonic() - self._last_emit >= RESULT_BATCH_INTERVAL_S:
+            self._flush()
+
+    def _flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, []
+            self._last_emit = time.monotonic()
+        if batch:
+            self.results_ready.emit(batch)
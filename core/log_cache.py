@@ -0,0 +1,214 @@
+"""
+Log Cache - local spool files for remote logs.
+
+Processed log lines are appended to a cache file on disk and read back through
+a memory map, with a sparse line index (one offset every INDEX_STRIDE lines),
+so a view can fetch any line without keeping the log in memory. The remote
+offset reached is saved alongside, so reopening a log resumes where the last
+download stopped. A cache file has a single writer: acquire_log_spool hands
+each key to one view at a time.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional
+
+LOG_CACHE_DIR = os.path.join(tempfile.gettempdir(), "slurm_gui_log_cache")
+# A checkpoint is kept every INDEX_STRIDE lines; lines in between are found by scanning
+INDEX_STRIDE = 64
+# Cache files unused for longer than this are removed
+MAX_CACHE_AGE_S = 7 * 24 * 3600
+
+_open_spools: Dict[str, "LogSpool"] = {}
+_open_spools_lock = threading.Lock()
+
+
+def acquire_log_spool(key: str, cache_dir: str = LOG_CACHE_DIR) -> Optional["LogSpool"]:
+    """
+    The spool of ``key``, or None while another view holds it open: two
+    writers appending to the same files would duplicate lines and corrupt the
+    index. The spool is released by its close().
+    """
+    with _open_spools_lock:
+        if key in _open_spools:
+            return None
+        spool = _open_spools[key] = LogSpool(key, cache_dir)
+        return spool
+
+
+def prune_log_cache(cache_dir: str = LOG_CACHE_DIR, max_age_s: float = MAX_CACHE_AGE_S):
+    """Removes cache files that were not used for ``max_age_s`` seconds."""
+    if not os.path.isdir(cache_dir):
+        return
+    limit = time.time() - max_age_s
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        try:
+            if os.path.getmtime(path) < limit:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+class LogSpool:
+    """
+    Append-only line store for one remote log.
+
+    Files: ``<key>.log`` (UTF-8 lines separated by '\\n'), ``<key>.idx``
+    (checkpoint offsets as unsigned 64-bit integers) and ``<key>.json``
+    (remote offset, inode and processor carry of the last save).
+    """
+
+    def __init__(self, key: str, cache_dir: str = LOG_CACHE_DIR):
+        os.makedirs(cache_dir, exist_ok=True)
+        base = os.path.join(cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest())
+        self.key = key
+        self._data_path = base + ".log"
+        self._index_path = base + ".idx"
+        self._meta_path = base + ".json"
+
+        self.line_count = 0
+        self.remote_offset = 0
+        self.carry = ""
+        self.inode: Optional[int] = None
+        self._size = 0
+        self._checkpoints = array("Q", [0])
+        self._mmap: Optional[mmap.mmap] = None
+        self._mapped_size = 0
+
+        if not self._load():
+            self._create()
+
+    # --- Persistence ---------------------------------------------------------
+
+    def _load(self) -> bool:
+        """Reopens an existing cache; False if there is none or it is inconsistent."""
+        try:
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("key") != self.key:
+                return False
+            checkpoints = array("Q")
+            with open(self._index_path, "rb") as f:
+                checkpoints.frombytes(f.read())
+            size = os.path.getsize(self._data_path)
+        except (OSError, ValueError):
+            return False
+        if size < meta["size"] or len(checkpoints) != meta["line_count"] // INDEX_STRIDE + 1:
+            return False
+
+        self._checkpoints = checkpoints
+        self._size = meta["size"]
+        self.line_count = meta["line_count"]
+        self.remote_offset = meta["remote_offset"]
+        self.carry = meta["carry"]
+        self.inode = meta.get("inode")
+        # Drop anything written after the last consistent save
+        if size > self._size:
+            with open(self._data_path, "r+b") as f:
+                f.truncate(self._size)
+        self._data = open(self._data_path, "ab")
+        self._index = open(self._index_path, "ab")
+        return True
+
+    def _create(self):
+        self._data = open(self._data_path, "wb")
+        self._index = open(self._index_path, "wb")
+        self._index.write(self._checkpoints.tobytes())
+        self._index.flush()
+        self.save(0, "")
+
+    def save(self, remote_offset: int, carry: str, inode: Optional[int] = None):
+        """Records how far the remote file was consumed (call after append_lines)."""
+        self.remote_offset = remote_offset
+        self.carry = carry
+        self.inode = inode if inode is not None else self.inode
+        meta = {
+            "key": self.key,
+            "size": self._size,
+            "line_count": self.line_count,
+            "remote_offset": remote_offset,
+            "carry": carry,
+            "inode": self.inode,
+        }
+        tmp_path = self._meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._meta_path)
+
+    def clear(self):
+        """Discards all cached lines (e.g. the remote file was truncated)."""
+        self._unmap()
+        self._data.close()
+        self._index.close()
+        self.line_count = 0
+        self._size = 0
+        self.inode = None
+        self._checkpoints = array("Q", [0])
+        self._create()
+
+    def close(self):
+        self._unmap()
+        self._data.close()
+        self._index.close()
+        with _open_spools_lock:
+            if _open_spools.get(self.key) is self:
+                del _open_spools[self.key]
+
+    # --- Lines ---------------------------------------------------------------
+
+    def append_lines(self, lines: List[str]):
+        if not lines:
+            return
+        new_checkpoints = array("Q")
+        offset = self._size
+        count = self.line_count
+        encoded = []
+        for line in lines:
+            data = line.encode("utf-8") + b"\n"
+            encoded.append(data)
+            offset += len(data)
+            count += 1
+            if count % INDEX_STRIDE == 0:
+                new_checkpoints.append(offset)
+
+        self._data.write(b"".join(encoded))
+        self._data.flush()
+        if new_checkpoints:
+            self._index.write(new_checkpoints.tobytes())
+            self._index.flush()
+            self._checkpoints.extend(new_checkpoints)
+        self._size = offset
+        self.line_count = count
+
+    def line(self, row: int) -> str:
+        """Text of line ``row`` (0-based)."""
+        if not 0 <= row < self.line_count:
+            return ""
+        mm = self._map()
+        start = self._checkpoints[row // INDEX_STRIDE]
+        for _ in range(row % INDEX_STRIDE):
+            start = mm.find(b"\n", start) + 1
+        end = mm.find(b"\n", start)
+        return mm[start:end].decode("utf-8", errors="replace")
+
+    def _map(self) -> mmap.mmap:
+        """Memory map covering everything appended so far (remapped when the file grew)."""
+        if self._mmap is None or self._mapped_size < self._size:
+            self._unmap()
+            with open(self._data_path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), self._size, access=mmap.ACCESS_READ)
+            self._mapped_size = self._size
+        return self._mmap
+
+    def _unmap(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+            self._mapped_size = 0
@@ -0,0 +1,139 @@
+"""
+Log Follower - pushes remote log output to the GUI over a persistent 'tail -F' channel.
+
+Output is batched (at most one chunk per BATCH_INTERVAL_S unless BATCH_BYTES
+accumulate) and flow controlled: a new chunk is only emitted once the previous
+one was acknowledged, and reading from the channel pauses when MAX_BUFFER_BYTES
+are pending, so SSH window flow control throttles the remote tail instead of
+the GUI event loop being flooded.
+"""
+
+import shlex
+import socket
+import threading
+import time
+from typing import Optional
+
+import paramiko
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from core.slurm_api import SlurmAPI
+
+# Minimum delay between two emitted chunks
+BATCH_INTERVAL_S = 0.1
+# Emit earlier once this much data is pending
+BATCH_BYTES = 256 * 1024
+# Largest chunk handed to the GUI at once
+MAX_CHUNK_BYTES = 1024 * 1024
+# Stop reading from the channel while this much data waits for the GUI
+MAX_BUFFER_BYTES = 8 * 1024 * 1024
+# Channel read timeout, also the granularity of stop/ack checks
+POLL_INTERVAL_S = 0.05
+
+# 'tail -F' stderr notices meaning the file starts over from the beginning
+RESET_NOTICES = ("file truncated", "has been replaced", "has appeared")
+
+
+class LogFollower(QThread):
+    """Streams the content of a remote file from ``offset`` onwards."""
+
+    chunk_ready = pyqtSignal(bytes)
+    file_reset = pyqtSignal()
+    follow_failed = pyqtSignal(str)
+
+    def __init__(self, path: str, offset: int = 0, parent=None):
+        super().__init__(parent)
+        self.slurm_api = SlurmAPI()
+        self.path = path
+        self.offset = offset
+        self._buffer = bytearray()
+        self._acked = threading.Event()
+        self._acked.set()
+        self._stop_requested = False
+        self._channel: Optional[paramiko.Channel] = None
+
+    def ack(self):
+        """Called by the receiver once a chunk was processed; allows the next one."""
+        self._acked.set()
+
+    def stop(self):
+        """Stop following and close the channel."""
+        self._stop_requested = True
+        self._acked.set()
+        self.wait()
+
+    def run(self):
+        command = f"tail -c +{self.offset + 1} -F -- {shlex.quote(self.path)}"
+        try:
+            self._channel = self.slurm_api.open_exec_channel(command)
+        except (paramiko.SSHException, OSError) as e:
+            self.follow_failed.emit(f"Could not start follow channel: {e}")
+            return
+        if self._channel is None:
+            self.follow_failed.emit("Not connected.")
+            return
+
+        self._channel.settimeout(POLL_INTERVAL_S)
+        last_emit = 0.0
+        try:
+            while not self._stop_requested:
+                # Bytes buffered before this recv; a reset notice seen after it discards only these
+                old_bytes = len(self._buffer)
+                if len(self._buffer) < MAX_BUFFER_BYTES:
+                    try:
+                        data = self._channel.recv(65536)
+                        if not data:
+                            if not self._stop_requested:
+                                self._flush()
+                                self.follow_failed.emit(self._exit_message())
+                            return
+                        self._buffer += data
+                    except socket.timeout:
+                        pass
+                else:
+                    # Back-pressure: leave the data in the SSH window until the GUI catches up
+                    self._acked.wait(POLL_INTERVAL_S)
+
+                self._read_notices(old_bytes)
+
+                now = time.monotonic()
+                ready = now - last_emit >= BATCH_INTERVAL_S or len(self._buffer) >= BATCH_BYTES
+                if self._buffer and ready and self._acked.is_set():
+                    self._emit_chunk()
+                    last_emit = now
+        except (paramiko.SSHException, OSError) as e:
+            if not self._stop_requested:
+                self.follow_failed.emit(f"Follow channel lost: {e}")
+        finally:
+            self._channel.close()
+
+    def _emit_chunk(self):
+        chunk = bytes(self._buffer[:MAX_CHUNK_BYTES])
+        del self._buffer[:MAX_CHUNK_BYTES]
+        self._acked.clear()
+        self.chunk_ready.emit(chunk)
+
+    def _flush(self):
+        """Hands the remaining buffered data over before the thread ends."""
+        while self._buffer and not self._stop_requested:
+            self._acked.wait()
+            if not self._stop_requested:
+                self._emit_chunk()
+
+    def _read_notices(self, old_bytes: int):
+        """
+        Handles the stderr notices of tail. On a reset the first ``old_bytes``
+        buffered belong to the old file: tail writes the notice before the new
+        file's content, so a notice not seen before the last recv arrived ahead
+        of everything that recv returned.
+        """
+        while self._channel.recv_stderr_ready():
+            notice = self._channel.recv_stderr(4096).decode("utf-8", errors="replace")
+            if any(n in notice for n in RESET_NOTICES):
+                del self._buffer[:old_bytes]
+                old_bytes = 0
+                self.file_reset.emit()
+
+    def _exit_message(self) -> str:
+        status = self._channel.recv_exit_status() if self._channel.exit_status_ready() else None
+        return f"tail exited (status {status})" if status is not None else "Follow channel closed."
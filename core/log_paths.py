@@ -0,0 +1,212 @@
+"""
+Log Paths - resolves sbatch --output/--error filename patterns to remote files.
+
+Every sbatch replacement symbol is expanded. Values that are not known locally
+(array task IDs, per-task job IDs, node names) become shell globs, which are
+listed with a single remote 'stat'; the task ID of each match is recovered
+from its name. Resolved files are cached with their size, mtime and inode, so
+refreshes can skip files that did not change and detect replaced ones.
+"""
+
+import re
+import shlex
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from core.slurm_api import SlurmAPI
+from models.project_model import Job
+
+# Seconds a glob listing (e.g. the task logs of an array) is reused
+GLOB_CACHE_TTL_S = 30.0
+
+# %[width]<symbol>, "%%" for a literal percent sign
+PATTERN_RE = re.compile(r"%(\d*)([%AabJjNnstux])")
+# Symbols whose value is a number and honours a zero-padding width
+NUMERIC_SYMBOLS = set("AabJjnst")
+GLOB = "*"
+
+
+@dataclass
+class LogFileInfo:
+    path: str
+    size: int
+    mtime: int
+    inode: Optional[int] = None
+    task_id: Optional[int] = None
+
+
+def pattern_values(job: Job, task_id: Optional[int] = None) -> Dict[str, str]:
+    """Replacement values for ``job``; unknown ones are globs."""
+    is_array = bool(job.array)
+    array_task = str(task_id) if task_id is not None else GLOB
+    return {
+        "A": str(job.id),
+        # Each array task has its own job ID, which is not tracked locally
+        "j": GLOB if is_array else str(job.id),
+        "J": GLOB if is_array else str(job.id),
+        "a": array_task if is_array else "4294967294",
+        "b": (str(task_id % 10) if task_id is not None else GLOB) if is_array else "0",
+        "x": job.name or "",
+        "u": SlurmAPI()._config.username or GLOB,
+        "N": GLOB,
+        "n": "0",
+        "s": "batch",
+        "t": "0",
+    }
+
+
+def expand_filename_pattern(template: str, values: Dict[str, str]) -> str:
+    """Expands sbatch filename symbols ('%j', '%4a', '%%', ...) in ``template``."""
+    if "\\" in template:
+        # A backslash disables all replacements
+        return template.replace("\\", "")
+
+    def replace(match: re.Match) -> str:
+        width, symbol = match.groups()
+        if symbol == "%":
+            return "%"
+        value = values.get(symbol, GLOB)
+        if width and symbol in NUMERIC_SYMBOLS and value.isdigit():
+            value = value.zfill(int(width))
+        return value
+
+    return PATTERN_RE.sub(replace, template)
+
+
+def task_id_regex(template: str, values: Dict[str, str]) -> re.Pattern:
+    """Regex matching the expansions of ``template`` and capturing the array task ID."""
+    parts = []
+    position = 0
+    seen_task = False
+    for match in PATTERN_RE.finditer(template):
+        parts.append(re.escape(template[position:match.start()]))
+        position = match.end()
+        width, symbol = match.groups()
+        if symbol == "a" and not seen_task:
+            parts.append(r"(?P<task>\d+)")
+            seen_task = True
+        elif symbol == "a":
+            parts.append(r"\d+")
+        else:
+            parts.append(re.escape(expand_filename_pattern(match.group(0), values)).replace(r"\*", ".*"))
+    parts.append(re.escape(template[position:]))
+    return re.compile("".join(parts) + "$")
+
+
+def absolute_template(template: str, job: Job) -> str:
+    """Makes a relative output path absolute the way sbatch does (relative to --chdir)."""
+    remote_home = SlurmAPI().remote_home
+    if template.startswith("~") and remote_home:
+        return remote_home + template[1:]
+    if template.startswith("/") or template.startswith("~"):
+        return template
+    base = job.working_directory or remote_home or "~"
+    if base.startswith("~") and remote_home:
+        base = remote_home + base[1:]
+    return f"{base.rstrip('/')}/{template}"
+
+
+def stat_command(paths: List[str]) -> str:
+    """Shell command printing 'path|size|mtime|inode' for each of ``paths`` (globs allowed)."""
+    # -L: a symlinked log reports the file it points to
+    return "stat -L -c '%n|%s|%Y|%i' -- " + " ".join(shell_glob(p) for p in paths) + " 2>/dev/null"
+
+
+def parse_stat_line(line: str) -> Optional[LogFileInfo]:
+    """LogFileInfo of one line printed by stat_command, None if it is not one."""
+    parts = line.rsplit("|", 3)
+    if len(parts) != 4 or not (parts[1] + parts[2] + parts[3]).isdigit():
+        return None
+    return LogFileInfo(parts[0], int(parts[1]), int(parts[2]), int(parts[3]))
+
+
+def shell_glob(path: str) -> str:
+    """Quotes ``path`` for the shell, leaving '*' (and a leading '~') unquoted."""
+    prefix = ""
+    if path.startswith("~"):
+        prefix, path = "~", path[1:]
+    return prefix + GLOB.join(shlex.quote(part) if part else "" for part in path.split(GLOB))
+
+
+class LogPathResolver:
+    """Resolves and stats job log files, caching the results."""
+
+    def __init__(self):
+        self.slurm_api = SlurmAPI()
+        self._lock = threading.Lock()
+        self._files: Dict[str, LogFileInfo] = {}
+        self._globs: Dict[str, Tuple[float, List[LogFileInfo]]] = {}
+
+    def resolve(self, job: Job, template: Optional[str], max_age: float = GLOB_CACHE_TTL_S) -> List[LogFileInfo]:
+        """
+        Log files of ``job`` for an --output/--error template, one per array
+        task (sorted by task ID) or a single entry for regular jobs. A path
+        without globs is returned even if the file does not exist yet (size -1).
+        """
+        if not template or not job.id:
+            return []
+        template = absolute_template(template, job)
+        values = pattern_values(job)
+        path = expand_filename_pattern(template, values)
+        if GLOB not in path:
+            return [self.cached(path) or LogFileInfo(path, -1, 0)]
+
+        with self._lock:
+            cached = self._globs.get(path)
+        if cached and time.monotonic() - cached[0] < max_age:
+            return cached[1]
+
+        files = list(self.stat_files([path]).values())
+        if job.array:
+            regex = task_id_regex(template, values)
+            for info in files:
+                match = regex.match(info.path)
+                info.task_id = int(match.group("task")) if match and "task" in match.groupdict() else None
+            files.sort(key=lambda f: (f.task_id is None, f.task_id or 0, f.path))
+        else:
+            # e.g. '%N': keep the most recently written match
+            files = sorted(files, key=lambda f: f.mtime, reverse=True)[:1]
+        with self._lock:
+            self._globs[path] = (time.monotonic(), files)
+        return files
+
+    def watch_pattern(self, job: Job, template: Optional[str]) -> str:
+        """Path (a glob for array jobs) covering all log files of ``job`` for a template."""
+        if not template or not job.id:
+            return ""
+        return expand_filename_pattern(absolute_template(template, job), pattern_values(job))
+
+    def stat_files(self, paths: List[str]) -> Dict[str, LogFileInfo]:
+        """Size, mtime and inode of several files (globs allowed) with a single remote command."""
+        if not paths:
+            return {}
+        result = self.slurm_api.run_command(stat_command(paths), span="ssh.stat_logs")
+        return self.record_stats(result[0] if result else "")
+
+    def record_stats(self, stdout: str) -> Dict[str, LogFileInfo]:
+        """Parses (and caches) the output of stat_command, e.g. when it ran as part of a larger command."""
+        files = {}
+        for line in stdout.splitlines():
+            info = parse_stat_line(line)
+            if info is not None:
+                files[info.path] = info
+        with self._lock:
+            self._files.update(files)
+        return files
+
+    def cached(self, path: str) -> Optional[LogFileInfo]:
+        with self._lock:
+            return self._files.get(path)
+
+
+_resolver_instance: Optional[LogPathResolver] = None
+
+
+def get_log_path_resolver() -> LogPathResolver:
+    """Get the global LogPathResolver instance."""
+    global _resolver_instance
+    if _resolver_instance is None:
+        _resolver_instance = LogPathResolver()
+    return _resolver_instance
@@ -0,0 +1,144 @@
+"""
+Log Reader - reads a range of a remote log file off the GUI thread.
+
+A LogRangeReader fetches [offset, size) in chunks of READ_CHUNK_BYTES and hands
+them to the GUI one at a time: the next chunk is read while the previous one is
+being appended, but only emitted once it was acknowledged, so a multi-GB spool
+fill never queues more than two chunks in memory. Size and inode come from the
+caller's stat when known (e.g. a batched LogWatchService result); otherwise the
+file is stat'ed once in the thread with the same 'stat' command. A file that
+shrank below ``offset`` or was replaced (another inode than the one the
+content was read from) starts over from its beginning (or tail).
+"""
+
+import threading
+from typing import Optional
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from core.log_paths import LogFileInfo, get_log_path_resolver
+from core.slurm_api import SlurmAPI
+
+# Bytes fetched per SFTP read (also bounds how long stop() may wait)
+READ_CHUNK_BYTES = 1024 * 1024
+# Bytes read after the tail start to find the first full line
+LINE_SEARCH_BYTES = 64 * 1024
+
+
+class LogRangeReader(QThread):
+    """
+    Reads ``path`` from ``offset`` to its end. ``offset`` -1 opens the file:
+    reading starts at the first full line of the last ``tail_bytes`` (0: the
+    whole file). ``info`` is a current stat of the file if the caller has one,
+    ``inode`` the inode the content up to ``offset`` was read from.
+    """
+
+    # Offsets are 64-bit: a plain int signal argument wraps at 2 GB
+    range_started = pyqtSignal("qint64", object, bool)  # start offset, LogFileInfo of the file, started over
+    chunk_ready = pyqtSignal(bytes)
+    read_failed = pyqtSignal(str)
+
+    def __init__(
+        self,
+        path: str,
+        offset: int,
+        info: Optional[LogFileInfo] = None,
+        inode: Optional[int] = None,
+        tail_bytes: int = 0,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.slurm_api = SlurmAPI()
+        self.path = path
+        self.offset = offset
+        self.info = info
+        self.inode = inode
+        self.tail_bytes = tail_bytes
+        self._acked = threading.Event()
+        self._acked.set()
+        self._stop_requested = False
+
+    def ack(self):
+        """Called by the receiver once a chunk was processed; allows the next one."""
+        self._acked.set()
+
+    def stop(self):
+        self._stop_requested = True
+        self._acked.set()
+        self.wait()
+
+    def run(self):
+        info = self.info if self.info is not None and self.info.size >= 0 else self._stat()
+        if info is None:
+            if not self._stop_requested:
+                self.read_failed.emit("The file does not exist or cannot be read.")
+            return
+        size = info.size
+
+        offset, restarted = self.offset, False
+        replaced = self.inode is not None and info.inode is not None and info.inode != self.inode
+        if offset < 0 or size < offset or replaced:
+            restarted = offset >= 0
+            offset = self._tail_start(size)
+        self.range_started.emit(offset, info, restarted)
+
+        while offset < size and not self._stop_requested:
+            data, err = self.slurm_api.read_remote_file_range(
+                self.path, offset, min(size - offset, READ_CHUNK_BYTES)
+            ) or (None, "Not connected.")
+            if err or not data:
+                if err and not self._stop_requested:
+                    self.read_failed.emit(err)
+                return
+            self._acked.wait()
+            if self._stop_requested:
+                return
+            self._acked.clear()
+            self.chunk_ready.emit(data)
+            offset += len(data)
+
+    def _stat(self) -> Optional[LogFileInfo]:
+        """Size, mtime and inode of the file (None if it is missing or not connected)."""
+        files = get_log_path_resolver().stat_files([self.path])
+        # stat reports the name as given, unless the shell expanded a leading '~'
+        return files.get(self.path) or (next(iter(files.values())) if len(files) == 1 else None)
+
+    def _tail_start(self, size: int) -> int:
+        """Offset of the first full line within the last ``tail_bytes`` of the file."""
+        if not self.tail_bytes or size <= self.tail_bytes:
+            return 0
+        start = size - self.tail_bytes
+        # Read from one byte earlier to know whether ``start`` already begins a line
+        data, err = self.slurm_api.read_remote_file_range(self.path, start - 1, LINE_SEARCH_BYTES) or (None, None)
+        if err or not data:
+            return start
+        newline = data.find(b"\n")
+        return start + newline if newline != -1 else start
+
+
+class LogBlockReader(QThread):
+    """Reads ``length`` bytes of ``path`` from ``offset`` in one request."""
+
+    block_ready = pyqtSignal(bytes, "qint64")  # data, offset
+    read_failed = pyqtSignal(str)
+
+    def __init__(self, path: str, offset: int, length: int, parent=None):
+        super().__init__(parent)
+        self.slurm_api = SlurmAPI()
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self._stop_requested = False
+
+    def stop(self):
+        self._stop_requested = True
+        self.wait()
+
+    def run(self):
+        data, err = self.slurm_api.read_remote_file_range(self.path, self.offset, self.length) or (None, "Not connected.")
+        if self._stop_requested:
+            return
+        if err or data is None:
+            self.read_failed.emit(err or "No data")
+            return
+        self.block_ready.emit(data, self.offset)
@@ -0,0 +1,152 @@
+"""
+Log Search - runs grep on the cluster and streams back matching lines.
+
+Only the matches (with a few lines of context) cross the network: each result
+carries its line number and byte offset (``grep -n -b``), so the viewer can
+jump to it by reading just the surrounding range of the file.
+"""
+
+import re
+import shlex
+import socket
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+import paramiko
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from core.slurm_api import SlurmAPI
+
+# Matches listed per search; the total is counted with 'grep -c' when exceeded
+GREP_MAX_MATCHES = 500
+GREP_CONTEXT_LINES = 2
+# Long lines (e.g. progress bars) are cut on the cluster before transfer
+GREP_MAX_LINE_BYTES = 2000
+# Results are emitted in batches at most this often
+RESULT_BATCH_INTERVAL_S = 0.1
+
+# "<line>:<offset>:<text>" for matches, "<line>-<offset>-<text>" for context
+GREP_LINE_RE = re.compile(r"^(\d+)([:-])(\d+)\2(.*)$", re.DOTALL)
+
+
+@dataclass
+class GrepLine:
+    line_no: int
+    offset: int
+    text: str
+    is_match: bool
+
+
+def build_grep_command(
+    path: str,
+    pattern: str,
+    regex: bool = False,
+    ignore_case: bool = False,
+    context: int = GREP_CONTEXT_LINES,
+    max_matches: int = GREP_MAX_MATCHES,
+    count_only: bool = False,
+) -> str:
+    """grep command line for a remote file; C locale so offsets are in bytes."""
+    options = ["-E" if regex else "-F"]
+    if ignore_case:
+        options.append("-i")
+    if count_only:
+        options.append("-c")
+    else:
+        options += ["-n", "-b", "-m", str(max_matches)]
+        if context:
+            options += ["-C", str(context)]
+    command = f"LC_ALL=C grep {' '.join(options)} -e {shlex.quote(pattern)} -- {shlex.quote(path)}"
+    if not count_only:
+        command += f" | cut -b 1-{GREP_MAX_LINE_BYTES}"
+    return command
+
+
+def parse_grep_line(line: str) -> Optional[GrepLine]:
+    """Parses one line of 'grep -n -b' output; None for '--' group separators."""
+    match = GREP_LINE_RE.match(line)
+    if not match:
+        return None
+    line_no, separator, offset, text = match.groups()
+    return GrepLine(int(line_no), int(offset), text, separator == ":")
+
+
+class LogSearchWorker(QThread):
+    """Runs a remote grep and streams the parsed result lines in batches."""
+
+    results_ready = pyqtSignal(list)
+    search_finished = pyqtSignal(int, bool)  # total matches, list truncated
+    search_failed = pyqtSignal(str)
+
+    def __init__(self, path: str, pattern: str, regex: bool = False, ignore_case: bool = False, parent=None):
+        super().__init__(parent)
+        self.slurm_api = SlurmAPI()
+        self.path = path
+        self.pattern = pattern
+        self.regex = regex
+        self.ignore_case = ignore_case
+        self._stop_requested = False
+
+    def stop(self):
+        self._stop_requested = True
+        self.wait()
+
+    def run(self):
+        command = build_grep_command(self.path, self.pattern, self.regex, self.ignore_case)
+        try:
+            channel = self.slurm_api.open_exec_channel(command)
+        except (paramiko.SSHException, OSError) as e:
+            self.search_failed.emit(f"Could not start search: {e}")
+            return
+        if channel is None:
+            self.search_failed.emit("Not connected.")
+            return
+
+        matches = 0
+        try:
+            channel.settimeout(RESULT_BATCH_INTERVAL_S)
+            batch: List[GrepLine] = []
+            pending = b""
+            last_emit = time.monotonic()
+            while not self._stop_requested:
+                try:
+                    data = channel.recv(65536)
+                except socket.timeout:
+                    data = None
+                if data:
+                    lines = (pending + data).split(b"\n")
+                    pending = lines.pop()
+                    for raw in lines:
+                        result = parse_grep_line(raw.decode("utf-8", errors="replace"))
+                        if result:
+                            batch.append(result)
+                            matches += result.is_match
+                if batch and (data == b"" or time.monotonic() - last_emit >= RESULT_BATCH_INTERVAL_S):
+                    self.results_ready.emit(batch)
+                    batch = []
+                    last_emit = time.monotonic()
+                if data == b"":
+                    break
+            if self._stop_requested:
+                return
+            channel.settimeout(None)
+            error = channel.makefile_stderr("rb").read().decode("utf-8", errors="replace").strip()
+        except (paramiko.SSHException, OSError) as e:
+            if not self._stop_requested:
+                self.search_failed.emit(f"Search failed: {e}")
+            return
+        finally:
+            channel.close()
+
+        if error:
+            self.search_failed.emit(error)
+            return
+
+        truncated = matches >= GREP_MAX_MATCHES
+        if truncated:
+            count_command = build_grep_command(self.path, self.pattern, self.regex, self.ignore_case, count_only=True)
+            stdout, _ = self.slurm_api.run_command(count_command, span="ssh.grep_count") or ("", "")
+            if stdout.isdigit():
+                matches = int(stdout)
+        self.search_finished.emit(matches, truncated)
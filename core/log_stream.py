@@ -0,0 +1,75 @@
+"""
+Log Stream - incremental processing of log file chunks.
+Decodes, strips ANSI escapes and resolves carriage returns one chunk at a time,
+so growing logs can be appended to a view without re-processing the whole file.
+"""
+
+import codecs
+import re
+from typing import List, Tuple
+
+# Complete ANSI escape sequences (CSI and two-character escapes)
+ANSI_ESCAPE_RE = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
+# An escape sequence cut off at the end of a chunk
+ANSI_PARTIAL_RE = re.compile(r"\x1B(?:\[[0-?]*[ -/]*)?$")
+
+
+class LogChunkProcessor:
+    """
+    Stateful processor turning raw log bytes into display lines.
+
+    Each call to feed() returns the lines completed by the chunk and the current
+    unterminated line (the "provisional" line, e.g. a progress bar being redrawn
+    with carriage returns), which the next chunk may still overwrite.
+    """
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._carry = ""
+
+    def reset(self):
+        self._decoder.reset()
+        self._carry = ""
+
+    def checkpoint(self) -> Tuple[int, str]:
+        """(bytes fed but not decoded yet, open line text); enough to resume with restore()."""
+        pending, _ = self._decoder.getstate()
+        return len(pending), self._carry
+
+    def restore(self, carry: str):
+        """Resumes after a checkpoint; feed again from the first undecoded byte."""
+        self.reset()
+        self._carry = carry
+
+    def feed(self, data: bytes, final: bool = False) -> Tuple[List[str], str]:
+        """Process a chunk; returns (completed lines, provisional last line)."""
+        text = self._carry + self._decoder.decode(data, final)
+
+        held = ""
+        if not final:
+            partial = ANSI_PARTIAL_RE.search(text)
+            if partial:
+                held = text[partial.start():]
+                text = text[:partial.start()]
+
+        if "\x1b" in text:
+            text = ANSI_ESCAPE_RE.sub("", text)
+        text = text.replace("\r\n", "\n")
+
+        lines = text.split("\n")
+        carry = lines.pop()
+        # Only the last carriage-return segment of the open line is still visible;
+        # a trailing "\r" is kept in case the next chunk starts with "\n".
+        cut = carry.rfind("\r", 0, len(carry) - 1)
+        if cut != -1:
+            carry = carry[cut + 1:]
+        self._carry = carry + held
+
+        completed = [line.rsplit("\r", 1)[-1] if "\r" in line else line for line in lines]
+        return completed, self.provisional_line()
+
+    def provisional_line(self) -> str:
+        """Visible state of the open line (last non-empty carriage-return segment)."""
+        segments = [s for s in ANSI_PARTIAL_RE.sub("", self._carry).split("\r") if s]
+        return segments[-1] if segments else ""
+
@@ -0,0 +1,237 @@
+"""
+Log Watch Service - one background polling loop for every watched log file.
+
+Open log viewers register the files they show, the log dashboard registers the
+running jobs of the projects. Each tick runs a single SSH command: it stats the
+watched files and, for the output and error log of every tracked job (a glob
+for array tasks, expanded by the remote shell), picks the most recently written
+file and prints its stat and - only if that changed since the last tick - its
+last TAIL_BYTES. The changes are fanned out through Qt signals, so the number
+of round-trips per interval does not grow with the number of views or jobs.
+"""
+
+import copy
+import shlex
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from core.defaults import STATUS_COMPLETING, STATUS_RUNNING
+from core.log_paths import LogFileInfo, get_log_path_resolver, parse_stat_line, shell_glob, stat_command
+from core.log_stream import LogChunkProcessor
+from core.profiler import profile_span
+from core.slurm_api import ConnectionState, SlurmAPI
+from models.project_model import Job
+
+WATCH_INTERVAL_S = 5.0
+# Bytes read from the end of a changed job log to show its last line
+TAIL_BYTES = 4096
+
+
+@dataclass
+class JobLogStatus:
+    """Latest state of the logs of one running job, as shown by the dashboard."""
+
+    job_id: str
+    name: str
+    project_name: str
+    status: str
+    output: Optional[LogFileInfo] = None
+    error: Optional[LogFileInfo] = None
+    output_tail: str = ""
+    error_tail: str = ""
+
+
+def job_log_script(index: int, pattern: str, known: str, marker: str) -> str:
+    """
+    Shell snippet reporting the newest file matching ``pattern`` as
+    '\\n<marker> <index> <fresh> <stat line>\\n', followed by its tail when its
+    stat line differs from ``known`` (fresh 1) - nothing if no file matches.
+    """
+    return (
+        f"f=$(ls -dtL -- {shell_glob(pattern)} 2>/dev/null | head -n 1); "
+        f"if [ -n \"$f\" ] && s=$(stat -L -c '%n|%s|%Y|%i' -- \"$f\" 2>/dev/null); then "
+        f"if [ \"$s\" = {shlex.quote(known)} ]; then printf '\\n%s {index} 0 %s\\n' {marker} \"$s\"; "
+        f"else printf '\\n%s {index} 1 %s\\n' {marker} \"$s\"; tail -c {TAIL_BYTES} -- \"$f\" 2>/dev/null; fi; fi"
+    )
+
+
+def last_line(data: bytes) -> str:
+    """Last non-empty display line of a chunk of log output."""
+    lines, rest = LogChunkProcessor().feed(data, final=True)
+    for line in reversed(lines + [rest]):
+        if line.strip():
+            return line
+    return ""
+
+
+class LogWatchService(QThread):
+    """Polls watched log files in the background and reports the ones that changed."""
+
+    files_changed = pyqtSignal(dict)  # path -> LogFileInfo, only files that changed
+    jobs_updated = pyqtSignal(list)   # List[JobLogStatus] of the tracked jobs
+
+    def __init__(self, interval: float = WATCH_INTERVAL_S, parent=None):
+        super().__init__(parent)
+        self.slurm_api = SlurmAPI()
+        self.resolver = get_log_path_resolver()
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._watchers: Dict[str, int] = {}  # path or glob -> number of views watching it
+        self._jobs: List[Job] = []
+        self._track_jobs = 0
+        self._last: Dict[str, Tuple[int, int, Optional[int]]] = {}
+        # (job ID, 'output'/'error') -> (stat line of the file tailed, its last line)
+        self._tails: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        self._wake = threading.Event()
+        self._stop_requested = False
+
+    # --- Registration (GUI thread) -------------------------------------------
+
+    def watch(self, paths: Iterable[str]):
+        """Adds files (globs allowed) to the loop; each watch() needs a matching unwatch()."""
+        with self._lock:
+            for path in paths:
+                if path:
+                    self._watchers[path] = self._watchers.get(path, 0) + 1
+        self._ensure_running()
+
+    def unwatch(self, paths: Iterable[str]):
+        with self._lock:
+            for path in paths:
+                if path in self._watchers:
+                    self._watchers[path] -= 1
+                    if self._watchers[path] <= 0:
+                        del self._watchers[path]
+
+    def set_jobs(self, jobs: Iterable[Job]):
+        """Updates the jobs whose logs are tracked (only running ones are kept)."""
+        running = [copy.copy(j) for j in jobs if j.id and j.status in (STATUS_RUNNING, STATUS_COMPLETING)]
+        with self._lock:
+            self._jobs = running
+
+    def track_jobs(self, enabled: bool):
+        """Reference-counted switch for job tracking (enabled while a dashboard is open)."""
+        with self._lock:
+            self._track_jobs = max(0, self._track_jobs + (1 if enabled else -1))
+        if enabled:
+            self._ensure_running()
+            self.wake()
+
+    def wake(self):
+        """Runs the next tick now instead of waiting for the interval."""
+        self._wake.set()
+
+    def stop(self):
+        self._stop_requested = True
+        self._wake.set()
+        self.wait()
+
+    def _ensure_running(self):
+        if not self.isRunning():
+            self._stop_requested = False
+            self.start()
+
+    # --- Loop (background thread) --------------------------------------------
+
+    def run(self):
+        while not self._stop_requested:
+            try:
+                self._tick()
+            except Exception as e:
+                print(f"Log watch tick failed: {e}")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def _tick(self):
+        if self.slurm_api.connection_status != ConnectionState.CONNECTED:
+            return
+        with self._lock:
+            watched = list(self._watchers)
+            jobs = list(self._jobs) if self._track_jobs else []
+        if not watched and not jobs:
+            return
+
+        streams: List[Tuple[Tuple[str, str], str]] = []  # ((job ID, kind), path or glob)
+        for job in jobs:
+            for kind, template in (("output", job.output_file), ("error", job.error_file)):
+                pattern = self.resolver.watch_pattern(job, template)
+                if pattern:
+                    streams.append(((job.id, kind), pattern))
+
+        # The single round-trip of this tick; sections are separated by a marker line
+        marker = uuid.uuid4().hex
+        parts = [stat_command(sorted(watched))] if watched else []
+        parts += [
+            job_log_script(index, pattern, self._tails.get(key, ("", ""))[0], marker)
+            for index, (key, pattern) in enumerate(streams)
+        ]
+        stdout = self._run("; ".join(parts))
+        if stdout is None:
+            return
+        sections = stdout.split(b"\n" + marker.encode() + b" ")
+
+        infos = self.resolver.record_stats(sections[0].decode("utf-8", errors="replace"))
+        changed = {
+            path: info for path, info in infos.items() if self._last.get(path) != (info.size, info.mtime, info.inode)
+        }
+        self._last = {path: (info.size, info.mtime, info.inode) for path, info in infos.items()}
+        if changed:
+            self.files_changed.emit(changed)
+
+        latest: Dict[Tuple[str, str], LogFileInfo] = {}
+        tails: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        for section in sections[1:]:
+            header, _, data = section.partition(b"\n")
+            try:
+                index, fresh, stat_line = header.decode("utf-8", errors="replace").split(" ", 2)
+                key = streams[int(index)][0]
+            except (ValueError, IndexError):
+                continue
+            info = parse_stat_line(stat_line)
+            if info is None:
+                continue
+            latest[key] = info
+            tails[key] = (stat_line, last_line(data) if fresh == "1" else self._tails.get(key, ("", ""))[1])
+        self._tails = tails
+
+        if jobs:
+            statuses = [
+                JobLogStatus(
+                    job.id,
+                    job.name,
+                    job.project_name or "",
+                    job.status,
+                    latest.get((job.id, "output")),
+                    latest.get((job.id, "error")),
+                    tails.get((job.id, "output"), ("", ""))[1],
+                    tails.get((job.id, "error"), ("", ""))[1],
+                )
+                for job in jobs
+            ]
+            self.jobs_updated.emit(statuses)
+
+    def _run(self, command: str) -> Optional[bytes]:
+        """Runs ``command`` and returns its raw output (log tails need not be valid UTF-8)."""
+        with profile_span("ssh.watch_logs"):
+            channel = self.slurm_api.open_exec_channel(command)
+            if channel is None:
+                return None
+            try:
+                return channel.makefile("rb").read()
+            finally:
+                channel.close()
+
+
+_watch_service_instance: Optional[LogWatchService] = None
+
+
+def get_log_watch_service() -> LogWatchService:
+    """Get the global LogWatchService instance."""
+    global _watch_service_instance
+    if _watch_service_instance is None:
+        _watch_service_instance = LogWatchService()
+    return _watch_service_instance
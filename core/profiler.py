@@ -0,0 +1,176 @@
+"""
+Profiler - Lightweight timing instrumentation
+Named spans with ring-buffered duration samples. Cheap enough to stay always on,
+so real numbers can be attached to performance reports.
+"""
+
+import functools
+import json
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+# Number of samples kept per span (older samples are dropped)
+DEFAULT_CAPACITY = 256
+
+# Upper bucket edges in milliseconds for the duration histograms
+HISTOGRAM_EDGES_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, math.inf]
+
+
+class SpanStats:
+    """Ring buffer of durations (in seconds) recorded for a single named span."""
+
+    def __init__(self, name: str, capacity: int = DEFAULT_CAPACITY):
+        self.name = name
+        self.samples: Deque[float] = deque(maxlen=capacity)
+        self.count = 0
+        self.total = 0.0
+        self.last = 0.0
+
+    def record(self, duration: float):
+        self.samples.append(duration)
+        self.count += 1
+        self.total += duration
+        self.last = duration
+
+    def histogram(self) -> List[int]:
+        """Counts of the buffered samples per HISTOGRAM_EDGES_MS bucket."""
+        counts = [0] * len(HISTOGRAM_EDGES_MS)
+        for sample in self.samples:
+            sample_ms = sample * 1000
+            for i, edge in enumerate(HISTOGRAM_EDGES_MS):
+                if sample_ms <= edge:
+                    counts[i] += 1
+                    break
+        return counts
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregated statistics in milliseconds over the buffered window."""
+        window = sorted(self.samples)
+        if not window:
+            return {"count": self.count, "total_s": self.total}
+
+        def percentile(p: float) -> float:
+            index = min(len(window) - 1, int(round(p * (len(window) - 1))))
+            return window[index] * 1000
+
+        return {
+            "count": self.count,
+            "total_s": self.total,
+            "last_ms": self.last * 1000,
+            "mean_ms": sum(window) / len(window) * 1000,
+            "min_ms": window[0] * 1000,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "max_ms": window[-1] * 1000,
+            "window": len(window),
+            "histogram": self.histogram(),
+        }
+
+
+class Profiler:
+    """Thread-safe registry of named timing spans."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self._capacity = capacity
+        self._spans: Dict[str, SpanStats] = {}
+        self._lock = threading.Lock()
+        self._enabled = True
+
+    def record(self, name: str, duration: float):
+        """Record a duration (in seconds) for the given span name."""
+        if not self._enabled:
+            return
+        with self._lock:
+            stats = self._spans.get(name)
+            if stats is None:
+                stats = SpanStats(name, self._capacity)
+                self._spans[name] = stats
+            stats.record(duration)
+
+    @contextmanager
+    def span(self, name: str):
+        """Context manager timing the enclosed block under ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timed(self, name: Optional[str] = None) -> Callable:
+        """Decorator timing every call of the wrapped function."""
+
+        def decorator(func: Callable) -> Callable:
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(span_name, time.perf_counter() - start)
+
+            return wrapper
+
+        return decorator
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Summaries of all spans, keyed by span name."""
+        with self._lock:
+            return {name: stats.summary() for name, stats in sorted(self._spans.items())}
+
+    def reset(self):
+        """Drop all recorded samples."""
+        with self._lock:
+            self._spans.clear()
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "timestamp": time.time(),
+                "histogram_edges_ms": [str(e) if math.isinf(e) else e for e in HISTOGRAM_EDGES_MS],
+                "spans": self.snapshot(),
+            },
+            indent=4,
+        )
+
+    def dump_json(self, path: str):
+        """Write the current snapshot to a JSON file."""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+
+    def enable(self):
+        self._enabled = True
+
+    def disable(self):
+        self._enabled = False
+
+    def enabled(self) -> bool:
+        return self._enabled
+
+
+# Singleton instance
+_profiler_instance = None
+
+
+def get_profiler() -> Profiler:
+    """Get the global Profiler instance."""
+    global _profiler_instance
+    if _profiler_instance is None:
+        _profiler_instance = Profiler()
+    return _profiler_instance
+
+
+# Convenience functions
+def profile_span(name: str):
+    """Time a block using the global profiler."""
+    return get_profiler().span(name)
+
+
+def timed(name: Optional[str] = None) -> Callable:
+    """Decorator timing a function using the global profiler."""
+    return get_profiler().timed(name)
@@ -0,0 +1,322 @@
+"""
+Remote FS - cached listings of remote directories and a path completion index.
+
+A listing reports whether the directory exists, its entries and their types
+with a single 'find -printf' per directory, and several directories can be
+listed in one SSH round-trip. Listings are kept in a bounded LRU cache with a
+TTL that is shared by all directory browsers, so revisiting a directory or
+opening one that was prefetched needs no round-trip at all.
+
+RemotePathIndex holds a depth-limited tree of the directories under the
+user's home and scratch areas, built in the background with one 'find', and
+answers prefix and fuzzy completions for path fields from memory.
+"""
+
+import posixpath
+import shlex
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from core.slurm_api import ConnectionState, SlurmAPI
+
+# Listings kept in the cache and how long they are trusted
+DIR_CACHE_MAX_ENTRIES = 512
+DIR_CACHE_TTL_S = 120.0
+# Child directories listed speculatively after a directory was loaded
+PREFETCH_MAX_DIRS = 24
+
+# Completion index: depth below each root, maximum size and rebuild interval
+INDEX_MAX_DEPTH = 4
+INDEX_MAX_PATHS = 50000
+INDEX_TTL_S = 600.0
+# Environment variables naming scratch/work areas indexed besides $HOME
+INDEX_ROOT_VARIABLES = ["HOME", "SCRATCH", "WORK", "STORE", "PROJECT"]
+# Directories never descended into while indexing
+INDEX_PRUNED_NAMES = [".git", ".cache", "__pycache__", "node_modules", ".conda", ".npm"]
+COMPLETION_LIMIT = 50
+
+# Header line that starts each directory of a batched listing
+LISTING_HEADER = "@@"
+STATUS_OK = "ok"
+STATUS_MISSING = "missing"
+STATUS_DENIED = "denied"
+
+
+@dataclass
+class DirectoryListing:
+    path: str
+    status: str = STATUS_OK
+    entries: List[Tuple[str, bool]] = field(default_factory=list)  # (name, is_directory)
+    fetched_at: float = 0.0
+
+    @property
+    def exists(self) -> bool:
+        return self.status != STATUS_MISSING
+
+    @property
+    def directories(self) -> List[str]:
+        return sorted(name for name, is_dir in self.entries if is_dir)
+
+
+def normalize_dir(path: str) -> str:
+    """Canonical cache key of a directory: absolute-looking, one trailing slash."""
+    path = path.rstrip("/")
+    return (path or "") + "/"
+
+
+def build_listing_command(paths: Iterable[str]) -> str:
+    """One shell command listing all ``paths``; see parse_listing for the output."""
+    # %Y follows symlinks, so a link to a directory is browsable like one
+    quoted = " ".join(shlex.quote(p) for p in paths)
+    return (
+        f"for d in {quoted}; do "
+        f'if [ ! -d "$d" ]; then echo "{LISTING_HEADER} {STATUS_MISSING} $d"; '
+        f'elif [ ! -r "$d" ] || [ ! -x "$d" ]; then echo "{LISTING_HEADER} {STATUS_DENIED} $d"; '
+        f'else echo "{LISTING_HEADER} {STATUS_OK} $d"; '
+        f"find \"$d\"/ -mindepth 1 -maxdepth 1 -printf '%Y\\t%f\\n' 2>/dev/null; fi; done"
+    )
+
+
+def parse_listing(stdout: str, now: Optional[float] = None) -> Dict[str, DirectoryListing]:
+    """Parses the output of build_listing_command into listings keyed by normalized path."""
+    now = time.monotonic() if now is None else now
+    listings: Dict[str, DirectoryListing] = {}
+    current: Optional[DirectoryListing] = None
+    for line in stdout.split("\n"):
+        if line.startswith(LISTING_HEADER + " "):
+            _, status, path = line.split(" ", 2)
+            current = DirectoryListing(normalize_dir(path), status, [], now)
+            listings[current.path] = current
+        elif current is not None and len(line) > 2 and line[1] == "\t":
+            current.entries.append((line[2:], line[0] == "d"))
+    return listings
+
+
+class RemoteDirectoryCache:
+    """Thread-safe LRU cache of directory listings with a time-to-live."""
+
+    def __init__(self, max_entries: int = DIR_CACHE_MAX_ENTRIES, ttl: float = DIR_CACHE_TTL_S):
+        self.slurm_api = SlurmAPI()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._listings: "OrderedDict[str, DirectoryListing]" = OrderedDict()
+
+    def get(self, path: str) -> Optional[DirectoryListing]:
+        """Fresh cached listing of ``path``, or None (expired entries are dropped)."""
+        key = normalize_dir(path)
+        with self._lock:
+            listing = self._listings.get(key)
+            if listing is None:
+                return None
+            if time.monotonic() - listing.fetched_at > self.ttl:
+                del self._listings[key]
+                return None
+            self._listings.move_to_end(key)
+            return listing
+
+    def put(self, listing: DirectoryListing):
+        with self._lock:
+            self._listings[listing.path] = listing
+            self._listings.move_to_end(listing.path)
+            while len(self._listings) > self.max_entries:
+                self._listings.popitem(last=False)
+
+    def invalidate(self, path: Optional[str] = None):
+        """Forgets one listing, or all of them."""
+        with self._lock:
+            if path is None:
+                self._listings.clear()
+            else:
+                self._listings.pop(normalize_dir(path), None)
+
+    def list(self, path: str, force_refresh: bool = False) -> Optional[DirectoryListing]:
+        """Listing of ``path`` from the cache or, if needed, from the cluster."""
+        if not force_refresh:
+            cached = self.get(path)
+            if cached is not None:
+                return cached
+        return self.fetch([path]).get(normalize_dir(path))
+
+    def fetch(self, paths: List[str]) -> Dict[str, DirectoryListing]:
+        """Lists ``paths`` on the cluster with one command and caches the results."""
+        if not paths:
+            return {}
+        result = self.slurm_api.run_command(
+            build_listing_command(p.rstrip("/") or "/" for p in paths), span="ssh.list_dirs"
+        )
+        if result is None:
+            return {}
+        listings = parse_listing(result[0])
+        for listing in listings.values():
+            self.put(listing)
+        return listings
+
+    def prefetch_children(self, listing: DirectoryListing, limit: int = PREFETCH_MAX_DIRS) -> int:
+        """Lists up to ``limit`` uncached subdirectories of ``listing`` in one round-trip."""
+        missing = []
+        for name in listing.directories:
+            child = listing.path + name
+            if self.get(child) is None:
+                missing.append(child)
+                if len(missing) >= limit:
+                    break
+        self.fetch(missing)
+        return len(missing)
+
+
+def fuzzy_score(query: str, name: str) -> Optional[int]:
+    """
+    Score of ``query`` as a case-insensitive subsequence of ``name`` (lower is
+    better), or None if it does not match. Gaps between matched characters
+    and a late first match cost points.
+    """
+    query, name = query.lower(), name.lower()
+    position = name.find(query[0]) if query else 0
+    if position < 0:
+        return None
+    score = position
+    for char in query[1:]:
+        found = name.find(char, position + 1)
+        if found < 0:
+            return None
+        score += found - position - 1
+        position = found
+    return score
+
+
+def build_index_command(max_depth: int = INDEX_MAX_DEPTH, max_paths: int = INDEX_MAX_PATHS) -> str:
+    """One 'find' over the existing home/scratch roots, printing every directory (bounded)."""
+    roots = " ".join(f'${{{name}:+"${name}"}}' for name in INDEX_ROOT_VARIABLES)
+    pruned = " -o ".join(f"-name {shlex.quote(name)}" for name in INDEX_PRUNED_NAMES)
+    return (
+        f"find {roots} -maxdepth {max_depth} \\( {pruned} \\) -prune -o -type d -printf '%p\\n' "
+        f"2>/dev/null | head -n {max_paths}"
+    )
+
+
+class RemotePathIndex(QThread):
+    """In-memory tree of remote directories serving completions without SSH calls."""
+
+    index_ready = pyqtSignal(int)  # number of indexed directories
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.slurm_api = SlurmAPI()
+        self.directory_cache = get_remote_directory_cache()
+        self._lock = threading.Lock()
+        self._children: Dict[str, List[str]] = {}  # directory ("/a/b/") -> sorted child names
+        self._paths: List[str] = []  # every indexed directory, for fuzzy search
+        self._built_at: Optional[float] = None
+
+    def ensure_built(self, max_age: float = INDEX_TTL_S):
+        """Starts a background (re)build if there is no index or it is older than ``max_age``."""
+        if self.isRunning() or self.slurm_api.connection_status != ConnectionState.CONNECTED:
+            return
+        if self._built_at is None or time.monotonic() - self._built_at > max_age:
+            self.start()
+
+    def stop(self):
+        self.wait()
+
+    def run(self):
+        try:
+            result = self.slurm_api.run_command(build_index_command(), span="ssh.path_index")
+        except Exception as e:
+            print(f"Remote path index failed: {e}")
+            return
+        if result is None:
+            return
+        paths = sorted({p.rstrip("/") for p in result[0].split("\n") if p.startswith("/")})
+        children: Dict[str, List[str]] = {}
+        for path in paths:
+            parent, name = posixpath.split(path)
+            if name:
+                children.setdefault(normalize_dir(parent), []).append(name)
+        with self._lock:
+            self._children = children
+            self._paths = paths
+            self._built_at = time.monotonic()
+        self.index_ready.emit(len(paths))
+
+    def _children_of(self, directory: str) -> Optional[List[str]]:
+        """Child directories from the index, else from a cached listing (never from SSH)."""
+        with self._lock:
+            names = self._children.get(directory)
+        if names is None:
+            listing = self.directory_cache.get(directory)
+            if listing is not None and listing.exists:
+                names = listing.directories
+        return names
+
+    def complete(self, text: str, limit: int = COMPLETION_LIMIT, anywhere: bool = True) -> List[str]:
+        """
+        Directory completions for a partially typed path: children of the typed
+        directory starting with the last component first, then fuzzy
+        (subsequence) matches among them, then - with ``anywhere``, as it scans
+        the whole index - fuzzy matches anywhere in the index.
+        """
+        home = self.slurm_api.remote_home
+        if text.startswith("~") and home:
+            text = home + text[1:]
+        if not text.startswith("/"):
+            return self._fuzzy_anywhere(text, limit, set()) if anywhere else []
+
+        directory, stem = text.rsplit("/", 1)
+        directory = normalize_dir(directory)
+        names = self._children_of(directory) or []
+        prefix = [n for n in names if n.startswith(stem)] or [
+            n for n in names if n.lower().startswith(stem.lower())
+        ]
+        results = [directory + n for n in prefix[:limit]]
+        if stem and len(results) < limit:
+            seen = set(prefix)
+            scored = sorted(
+                (score, n) for n in names if n not in seen for score in [fuzzy_score(stem, n)] if score is not None
+            )
+            results += [directory + n for _, n in scored[: limit - len(results)]]
+        if anywhere and stem and len(results) < limit:
+            results += self._fuzzy_anywhere(stem, limit - len(results), set(results))
+        return results
+
+    def _fuzzy_anywhere(self, query: str, limit: int, exclude: set) -> List[str]:
+        """Best fuzzy matches of ``query`` against the last component of every indexed path."""
+        if len(query) < 2:
+            return []
+        with self._lock:
+            paths = self._paths
+        scored = []
+        for path in paths:
+            name = path.rsplit("/", 1)[1]
+            score = fuzzy_score(query, name)
+            if score is not None and path not in exclude:
+                scored.append((score, path.count("/"), path))
+        scored.sort()
+        return [path for _, _, path in scored[:limit]]
+
+
+_directory_cache_instance: Optional[RemoteDirectoryCache] = None
+
+
+def get_remote_directory_cache() -> RemoteDirectoryCache:
+    """Get the global RemoteDirectoryCache instance."""
+    global _directory_cache_instance
+    if _directory_cache_instance is None:
+        _directory_cache_instance = RemoteDirectoryCache()
+    return _directory_cache_instance
+
+
+_path_index_instance: Optional[RemotePathIndex] = None
+
+
+def get_remote_path_index() -> RemotePathIndex:
+    """Get the global RemotePathIndex instance."""
+    global _path_index_instance
+    if _path_index_instance is None:
+        _path_index_instance = RemotePathIndex()
+    return _path_index_instance
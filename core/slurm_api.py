@@ -1,21 +1,93 @@
 import configparser
+import io
 import re
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import timedelta
 from enum import Enum, auto
 import functools
-from typing import Any, Callable, Dict, List, Optional, Tuple
-import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 import paramiko
 from core.defaults import *
 from core.event_bus import Events, get_event_bus
+from core.profiler import profile_span
 from models.project_model import Job
 from utils import settings_path, parse_duration
-import tempfile
 import os
 
-from widgets.toast_widget import show_info_toast
+
+
+# Reads larger than this are pipelined with SFTP prefetch
+SFTP_PREFETCH_THRESHOLD = 256 * 1024
+# Bulk submissions in flight at once, each on its own channel of the shared transport
+SUBMIT_PIPELINE_DEPTH = 16
+
+SBATCH_JOB_ID_RE = re.compile(r"Submitted batch job (\d+)")
+
+# Profiler span of commands whose program cannot be told (empty, or only assignments)
+DEFAULT_COMMAND_SPAN = "ssh.command"
+ENV_ASSIGNMENT_RE = re.compile(r"^[A-Za-z_]\w*=")
+
+# A job, an array task ('123_4') or a range of array tasks ('123_[1-5%2]')
+JOB_ID_RE = re.compile(r"^\d+(_(\d+|\[[\d,\-%]+\]))?$")
+# Job IDs mentioned in scancel/scontrol error lines
+ERROR_JOB_ID_RE = re.compile(r"(?<![\w.])(\d+(?:_\d+|_\[[\d,\-%]+\])?)(?![\w.])")
+# Job IDs sent with one scancel/scontrol command
+JOB_ACTION_MAX_IDS = 1000
+
+JOB_ACTION_CANCEL = "cancel"
+JOB_ACTION_HOLD = "hold"
+JOB_ACTION_RELEASE = "release"
+JOB_ACTION_REQUEUE = "requeue"
+JOB_ACTION_NICE = "nice"
+JOB_ACTIONS = [JOB_ACTION_CANCEL, JOB_ACTION_HOLD, JOB_ACTION_RELEASE, JOB_ACTION_REQUEUE, JOB_ACTION_NICE]
+
+
+def command_span_name(command: str) -> str:
+    """'squeue -h ...' -> 'ssh.squeue'; leading 'VAR=value' assignments are skipped."""
+    for token in command.split():
+        if not ENV_ASSIGNMENT_RE.match(token):
+            return f"ssh.{token.rsplit('/', 1)[-1] or token}"
+    return DEFAULT_COMMAND_SPAN
+
+
+def parse_sbatch_output(stdout: str, stderr: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    (job ID, warning) if sbatch accepted the job, else (None, error). The
+    warning is whatever sbatch printed on stderr alongside the ID (None if
+    nothing), e.g. a partition or time limit it adjusted.
+    """
+    match = SBATCH_JOB_ID_RE.search(stdout)
+    if match:
+        return match.group(1), stderr or None
+    if stderr:
+        return None, stderr
+    return None, stdout or "sbatch command did not return a job ID."
+
+
+def build_job_action_command(action: str, job_ids: List[str], value: Optional[int] = None) -> str:
+    """One scancel/scontrol command applying ``action`` to every job in ``job_ids``."""
+    if action == JOB_ACTION_CANCEL:
+        return "scancel " + " ".join(job_ids)
+    if action in (JOB_ACTION_HOLD, JOB_ACTION_RELEASE, JOB_ACTION_REQUEUE):
+        return f"scontrol {action} {','.join(job_ids)}"
+    if action == JOB_ACTION_NICE:
+        return f"scontrol update jobid={','.join(job_ids)} nice={int(value or 0)}"
+    raise ValueError(f"Unknown job action: {action}")
+
+
+def parse_job_action_errors(job_ids: List[str], stderr: str) -> Dict[str, Optional[str]]:
+    """
+    Per-job result of a bulk action: the error line naming a job, or None for
+    success. An error that names no job of the list applies to all of them.
+    """
+    results: Dict[str, Optional[str]] = {job_id: None for job_id in job_ids}
+    for line in filter(None, (l.strip() for l in stderr.splitlines())):
+        named = [job_id for job_id in ERROR_JOB_ID_RE.findall(line) if job_id in results]
+        for job_id in named or job_ids:
+            results[job_id] = results[job_id] or line
+    return results
 
 
 class ConnectionState(Enum):
@@ -31,6 +103,7 @@ class ConnectionConfig:
     """Immutable connection configuration"""
 
     host: str = None
+    port: int = 22
     username: str = None
     password: str = None
     timeout: int = 30
@@ -85,13 +158,17 @@ class SlurmAPI:
         self.constraint = None
         self.nodelist = None
         self.remote_home: Optional[str] = None
+        self._sftp: Optional[paramiko.SFTPClient] = None
+        self._sftp_lock = threading.Lock()
 
     def _load_connection_config(self):
         try:
             config = configparser.ConfigParser()
             config.read(settings_path)
 
-            self._config.host = config["GeneralSettings"]["clusterAddress"]
+            self._config.host, self._config.port = self._split_address(
+                config["GeneralSettings"]["clusterAddress"]
+            )
             self._config.password = config["GeneralSettings"]["psw"]
             self._config.username = config["GeneralSettings"]["username"]
             return True
@@ -99,6 +176,24 @@ class SlurmAPI:
             print(f"Invalid configuration file: {e}")
             return False
 
+    @staticmethod
+    def _split_address(address: str) -> Tuple[str, int]:
+        """
+        Split an optional ':port' suffix from the cluster address (default port
+        22). IPv6 literals take a port only in brackets ('[::1]:2222'); without
+        brackets an address with several colons is a host only.
+        """
+        if address.startswith("["):
+            host, _, rest = address[1:].partition("]")
+            port = rest[1:] if rest.startswith(":") else ""
+            return host, int(port) if port.isdigit() else 22
+        if address.count(":") > 1:
+            return address, 22
+        host, sep, port = address.rpartition(":")
+        if sep and port.isdigit():
+            return host, int(port)
+        return address, 22
+
     def _set_connection_status(self, new_state: ConnectionState):
         old_state = self.connection_status
         self.connection_status = new_state
@@ -110,11 +205,19 @@ class SlurmAPI:
         print(f"Connection State changed: {old_state} -> {new_state}")
 
     @requires_connection
-    def run_command(self, command: str) -> Tuple[str, str]:
-        """Execute command on remote server"""
+    def run_command(self, command: str, span: Optional[str] = None) -> Tuple[str, str]:
+        """Execute command on remote server, timed as ``span`` (default: named after the program)"""
+
+        with profile_span(span or command_span_name(command)):
+            stdin, stdout, stderr = self._client.exec_command(command)
+            return stdout.read().decode().strip(), stderr.read().decode().strip()
 
-        stdin, stdout, stderr = self._client.exec_command(command)
-        return stdout.read().decode().strip(), stderr.read().decode().strip()
+    @requires_connection
+    def open_exec_channel(self, command: str) -> paramiko.Channel:
+        """Starts a long-running command and returns its channel for streaming reads."""
+        channel = self._client.get_transport().open_session()
+        channel.exec_command(command)
+        return channel
 
     def connect(self, *args):
         """Establish SSH connection"""
@@ -124,6 +227,7 @@ class SlurmAPI:
             self._client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
             self._client.connect(
                 self._config.host,
+                port=self._config.port,
                 username=self._config.username,
                 password=self._config.password,
                 timeout=self._config.timeout,
@@ -151,6 +255,7 @@ class SlurmAPI:
 
     def disconnect(self):
         """Close connection"""
+        self._close_sftp()
         if self._client:
             self._client.close()
             self._client = None
@@ -160,6 +265,11 @@ class SlurmAPI:
         """Fetch detailed node information"""
 
         msg_out, _ = self.run_command("scontrol show nodes")
+        with profile_span("parse.nodes"):
+            return self._parse_nodes(msg_out)
+
+    def _parse_nodes(self, msg_out: str) -> List[Dict[str, Any]]:
+        """Parse 'scontrol show nodes' output"""
         nodes = msg_out.split("\n\n")
         nodes_arr = []
 
@@ -198,10 +308,15 @@ class SlurmAPI:
             "squeue -O jobarrayid:\\;,Reason:\\;,NodeList:\\;,Username:\\;,tres-per-job:\\;,"
             + "tres-per-task:\\;,tres-per-node:\\;,Name:\\;,Partition:\\;,StateCompact:\\;,"
             + "Timelimit:\\;,TimeUsed:\\;,NumNodes:\\;,NumTasks:\\;,Reason:\\;,MinMemory:\\;,"
-            + "MinCpus:\\;,Account:\\;,PriorityLong:\\;,jobid:\\;,tres:\\;,nice:"
+            + "MinCpus:\\;,Account:\\;,PriorityLong:\\;,jobid:\\;,tres:\\;,nice:\\;,SubmitTime:"
         )
 
         out, _ = self.run_command(cmd)
+        with profile_span("parse.job_queue"):
+            return self._parse_job_queue(out)
+
+    def _parse_job_queue(self, out: str) -> List[Dict[str, Any]]:
+        """Parse 'squeue -O' output"""
         job_queue = []
 
         for i, line in enumerate(out.splitlines()):
@@ -342,9 +457,7 @@ class SlurmAPI:
     def list_remote_directories(self, path: str) -> List[str]:
         """List directories in a given remote path."""
         # The command finds all directories in the given path, at a max depth of 1, and prints their names.
-        command = (
-            f"find '{path}' -maxdepth 1 -mindepth 1 -type d -exec basename {{}} \\;"
-        )
+        command = f"find '{path}' -maxdepth 1 -mindepth 1 -type d -printf '%f\\n'"
         stdout, stderr = self.run_command(command)
         if stderr:
             print(f"Error listing directories in '{path}': {stderr}")
@@ -365,8 +478,8 @@ class SlurmAPI:
 
     @requires_connection
     def cancel_job(self, job_id: str) -> Tuple[Optional[str], Optional[str]]:
-        """Cancels a job using scancel."""
-        if not job_id or not str(job_id).isdigit():
+        """Cancels a job (or array task) using scancel."""
+        if not job_id or not JOB_ID_RE.match(str(job_id)):
             return None, f"Invalid Job ID: {job_id}"
 
         command = f"scancel {job_id}"
@@ -378,60 +491,83 @@ class SlurmAPI:
         return stdout, None
 
     @requires_connection
-    def submit_job(self, job: Job) -> Tuple[Optional[str], Optional[str]]:
-        """Creates a temporary script, sbaches it, and returns the job ID or an error."""
-        script_content = job.create_sbatch_script()
-
-        sftp = None
-        local_path = None
-        remote_path = f"/tmp/slurm_gui_job_{uuid.uuid4().hex[:8]}.sh"
+    def job_action(self, action: str, job_ids: List[str], value: Optional[int] = None) -> Dict[str, Optional[str]]:
+        """
+        Applies a bulk action (JOB_ACTIONS; ``value`` is the nice value) to many
+        jobs or array tasks with one scancel/scontrol command per
+        JOB_ACTION_MAX_IDS jobs. Returns the error of each job, None on success.
+        """
+        results: Dict[str, Optional[str]] = {}
+        valid = []
+        for job_id in dict.fromkeys(str(j).strip() for j in job_ids):
+            if JOB_ID_RE.match(job_id):
+                valid.append(job_id)
+            else:
+                results[job_id] = f"Invalid Job ID: {job_id}"
+        for start in range(0, len(valid), JOB_ACTION_MAX_IDS):
+            chunk = valid[start:start + JOB_ACTION_MAX_IDS]
+            try:
+                _, stderr = self.run_command(build_job_action_command(action, chunk, value))
+            except Exception as e:
+                stderr = str(e)
+            results.update(parse_job_action_errors(chunk, stderr))
+        return results
 
+    @requires_connection
+    def submit_jobs(
+        self,
+        jobs: List[Job],
+        on_result: Optional[Callable[[int, Optional[str], Optional[str]], None]] = None,
+        depth: int = SUBMIT_PIPELINE_DEPTH,
+        notification_settings=None,
+    ) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        Submits many jobs, streaming each script to 'sbatch' on stdin (no temp
+        files, no cleanup round-trip). Up to ``depth`` submissions run at once
+        on separate channels of the existing connection. Returns (job ID,
+        error) per job in input order, where the error of a submitted job is
+        sbatch's warning (or None); ``on_result(index, job_id, error)`` is
+        called from worker threads as each one completes. ``notification_settings``
+        is passed to Job.create_sbatch_script.
+        """
+        scripts = [job.create_sbatch_script(notification_settings) for job in jobs]
+        results: List[Tuple[Optional[str], Optional[str]]] = [(None, "Not submitted.")] * len(jobs)
+        with profile_span("ssh.sbatch_batch"), ThreadPoolExecutor(max_workers=max(1, depth)) as pool:
+            futures = {pool.submit(self._sbatch_stdin, script): index for index, script in enumerate(scripts)}
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    results[index] = (None, str(e))
+                if on_result:
+                    on_result(index, *results[index])
+        return results
+
+    def _sbatch_stdin(self, script: str) -> Tuple[Optional[str], Optional[str]]:
+        """Runs 'sbatch' with the script on stdin and parses its answer."""
+        channel = self._client.get_transport().open_session()
         try:
-            # 1. Create a local temporary file
-            with tempfile.NamedTemporaryFile(
-                mode="w", delete=False, suffix=".sh", encoding="utf-8", newline=""
-            ) as tmp:
-                tmp.write(script_content)
-                local_path = tmp.name
-
-            # 2. Define remote path and upload
-            sftp = self._client.open_sftp()
-            sftp.put(local_path, remote_path)
-            sftp.close()
-            sftp = None
-
-            # 3. Sbatch the remote file
-            sbatch_output, sbatch_error = self.run_command(f"sbatch {remote_path}")
-
-            # 4. Parse output
-
-            match = re.search(r"Submitted batch job (\d+)", sbatch_output)
-            if match:
-                new_job_id = match.group(1)
-                if sbatch_error:
-                    show_info_toast(self, "Info", sbatch_error)
-                return new_job_id, None
-            elif sbatch_error:
-                return None, sbatch_error
-            else:
-                return None, sbatch_output or "sbatch command did not return a job ID."
+            channel.exec_command("sbatch")
+            channel.sendall(script.encode("utf-8"))
+            channel.shutdown_write()
+            stdout = channel.makefile("rb").read().decode("utf-8", errors="replace").strip()
+            stderr = channel.makefile_stderr("rb").read().decode("utf-8", errors="replace").strip()
+        finally:
+            channel.close()
+        return parse_sbatch_output(stdout, stderr)
 
+    @requires_connection
+    def submit_job(self, job: Job) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Pipes the job script to 'sbatch' on stdin. Returns (job ID, warning or
+        None) on success, (None, error) on failure.
+        """
+        try:
+            with profile_span("ssh.sbatch"):
+                return self._sbatch_stdin(job.create_sbatch_script())
         except Exception as e:
             return None, str(e)
-        finally:
-            # 5. Cleanup
-            if local_path and os.path.exists(local_path):
-                os.unlink(local_path)
-            if self.connection_status == ConnectionState.CONNECTED:
-                try:
-                    self.run_command(f"rm {remote_path}")
-                except Exception:
-                    pass  # Ignore cleanup errors if connection is lost
-            if sftp:
-                try:
-                    sftp.close()
-                except Exception:
-                    pass
 
     @requires_connection
     def fetch_job_details_sacct(self, job_ids: List[str]) -> List[Dict[str, Any]]:
@@ -497,12 +633,54 @@ class SlurmAPI:
 
         return stdout, None
 
+    def _get_sftp(self) -> paramiko.SFTPClient:
+        """Return the cached SFTP session, opening it if needed (call with _sftp_lock held)."""
+        if self._sftp is None or self._sftp.get_channel().closed:
+            self._sftp = self._client.open_sftp()
+        return self._sftp
+
+    def _close_sftp(self):
+        with self._sftp_lock:
+            if self._sftp is not None:
+                try:
+                    self._sftp.close()
+                except Exception:
+                    pass
+                self._sftp = None
+
+    @requires_connection
+    def get_remote_file_size(self, remote_path: str) -> Tuple[Optional[int], Optional[str]]:
+        """Returns the size in bytes of a remote file."""
+        try:
+            with self._sftp_lock:
+                return self._get_sftp().stat(remote_path).st_size, None
+        except (IOError, paramiko.SSHException) as e:
+            return None, str(e)
+
+    @requires_connection
+    def read_remote_file_range(
+        self, remote_path: str, offset: int = 0, length: Optional[int] = None
+    ) -> Tuple[Optional[bytes], Optional[str]]:
+        """Reads up to ``length`` bytes (or everything) of a remote file starting at ``offset``."""
+        if not remote_path:
+            return None, "Remote path is not specified."
+
+        try:
+            with profile_span("sftp.read_range"), self._sftp_lock:
+                with self._get_sftp().open(remote_path, "rb") as f:
+                    f.seek(offset)
+                    if length is None:
+                        length = max(f.stat().st_size - offset, 0)
+                    if length > SFTP_PREFETCH_THRESHOLD:
+                        f.prefetch(offset + length)
+                    return f.read(length), None
+        except (IOError, paramiko.SSHException) as e:
+            return None, str(e)
+
     @requires_connection
     def create_remote_directory(self, remote_path: str):
         """Creates a directory on the remote server, including parent directories."""
-        if self.remote_path_exists(remote_path):
-            return
-
+        # 'mkdir -p' succeeds if the directory exists, so no separate existence check
         command = f'mkdir -p "{remote_path}"'
         stdout, stderr = self.run_command(command)
         if stderr:
@@ -511,24 +689,11 @@ class SlurmAPI:
             )
 
     @requires_connection
-    def write_remote_file(self, remote_path: str, content: str):
-        """Writes content to a file on the remote server."""
-        sftp = None
-        local_path = None
-        try:
-            with tempfile.NamedTemporaryFile(
-                mode="w", delete=False, suffix=".json", encoding="utf-8"
-            ) as tmp:
-                tmp.write(content)
-                local_path = tmp.name
-
-            sftp = self._client.open_sftp()
-            sftp.put(local_path, remote_path)
-        finally:
-            if sftp:
-                sftp.close()
-            if local_path and os.path.exists(local_path):
-                os.unlink(local_path)
+    def write_remote_file(self, remote_path: str, content: Union[str, bytes]):
+        """Writes content to a file on the remote server straight from memory."""
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        with profile_span("sftp.write"), self._sftp_lock:
+            self._get_sftp().putfo(io.BytesIO(data), remote_path)
 
     @requires_connection
     def save_settings_remotely(self, tmp_path: str):
@@ -549,13 +714,8 @@ class SlurmAPI:
         # Ensure remote directory exists
         self.create_remote_directory(remote_dir)
 
-        sftp = None
-        try:
-            sftp = self._client.open_sftp()
-            sftp.put(tmp_path, remote_file)
-        finally:
-            if sftp:
-                sftp.close()
+        with open(tmp_path, "rb") as f:
+            self.write_remote_file(remote_file, f.read())
 
     def _parse_tres(self, tres_string: str, prefix: str, node_dict: Dict[str, Any]):
         """Parse TRES strings"""
@@ -591,6 +751,8 @@ class SlurmAPI:
             "Account": fields[17],
             "Priority": int(fields[18]) if fields[18].isdigit() else 0,
             "GPUs": 0,
+            # ISO timestamp (cluster local time), used by 'age' filter queries
+            "Submit Time": fields[22] if len(fields) > 22 else None,
         }
 
         # Parse resources
@@ -1,5 +1,9 @@
 from dataclasses import dataclass
 from core.defaults import *
+from core.profiler import profile_span
+from core.job_columns import add_typed_values
+from core.usage_stats import UsageAggregator
+from core.utilization_history import get_utilization_history, utilization_samples
 from core.slurm_api import ConnectionState, SlurmAPI
 from models.project_model import Job, JobsModel
 
@@ -25,6 +29,18 @@ JOB_CODES = {
 }
 
 
+def sort_queue_jobs(queue_jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Default queue ordering: by status, then by user name."""
+    return sorted(
+        queue_jobs,
+        key=lambda job: (
+            job.get("Status", ""),
+            -ord(job.get("User", " ")[0]) - 0.01 * ord(job.get("User", "  ")[1]),
+        ),
+        reverse=True,
+    )
+
+
 class SlurmWorker(QThread):
     """Worker thread for SLURM operations using Qt signals for thread-safety."""
 
@@ -37,6 +53,7 @@ class SlurmWorker(QThread):
         self.jobs_model = jobs_model
         self.refresh_interval = refresh_interval_seconds
         self._stop_requested = False
+        self.usage_aggregator = UsageAggregator()
 
     def run(self):
         """Fetch data, pre-process it, and emit signals with the results."""
@@ -44,40 +61,47 @@ class SlurmWorker(QThread):
             if self.slurm_api.connection_status != ConnectionState.CONNECTED:
                 return
 
-            nodes_data = self.slurm_api.fetch_nodes_info()
-            queue_jobs = self.slurm_api.fetch_job_queue() or []
-
-            # --- MODIFICATION: Pre-sort the data in the worker thread ---
-            # This reduces the workload on the main GUI thread.
-            sorted_queue_jobs = sorted(
-                queue_jobs,
-                key=lambda job: (
-                    job.get("Status", ""),
-                    -ord(job.get("User", " ")[0]) - 0.01 * ord(job.get("User", "  ")[1]),
-                ),
-                reverse=True,
-            )
-
-            active_job_ids = self.jobs_model.get_active_job_ids()
-            job_details_data = None
-            if active_job_ids:
-                job_details_data = self.slurm_api.fetch_job_details_sacct(
-                    active_job_ids
-                )
-
-            self.data_ready.emit(
-                {
-                    "nodes": nodes_data or [],
-                    "jobs": sorted_queue_jobs,  # Emit the pre-sorted list
-                    "job_details": job_details_data or [],
-                }
-            )
+            with profile_span("worker.refresh"):
+                self._refresh()
 
         except Exception as e:
             error_message = f"Worker thread error: {e}"
             print(error_message)
             self.error_occurred.emit(error_message)
 
+    def _refresh(self):
+        """Run one fetch/pre-process cycle and emit the results."""
+        nodes_data = self.slurm_api.fetch_nodes_info()
+        queue_jobs = self.slurm_api.fetch_job_queue() or []
+
+        # --- MODIFICATION: Pre-sort the data in the worker thread ---
+        # This reduces the workload on the main GUI thread.
+        with profile_span("worker.sort_jobs"):
+            sorted_queue_jobs = sort_queue_jobs(queue_jobs)
+        # Parse times, memory and IDs once here, for sorting and filter queries
+        with profile_span("worker.typed_values"):
+            add_typed_values(sorted_queue_jobs)
+        with profile_span("worker.usage"):
+            usage = self.usage_aggregator.update(sorted_queue_jobs)
+        with profile_span("worker.history"):
+            get_utilization_history().record(time.time(), utilization_samples(nodes_data or [], usage))
+
+        active_job_ids = self.jobs_model.get_active_job_ids()
+        job_details_data = None
+        if active_job_ids:
+            job_details_data = self.slurm_api.fetch_job_details_sacct(
+                active_job_ids
+            )
+
+        self.data_ready.emit(
+            {
+                "nodes": nodes_data or [],
+                "jobs": sorted_queue_jobs,  # Emit the pre-sorted list
+                "usage": usage,
+                "job_details": job_details_data or [],
+            }
+        )
+
     def stop(self):
         """Stop the worker thread"""
         self._stop_requested = True
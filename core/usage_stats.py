@@ -0,0 +1,111 @@
+"""
+Usage Stats - who is using the cluster, aggregated from each queue snapshot.
+
+UsageAggregator keeps running totals per user, account and partition: the
+GPUs, CPUs and RAM held by running jobs and those requested by pending ones.
+Every job contributes one vector of values to its groups; between snapshots
+only the jobs that appeared, changed or left are applied (their old vector
+subtracted, the new one added), so the totals never need a full rebuild and
+no Slurm query beyond the usual squeue is needed.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.job_columns import typed_value
+
+# Job columns the totals are grouped by
+USAGE_DIMENSIONS = ("User", "Account", "Partition")
+# Values of a group's totals, in order
+USAGE_FIELDS = ("running", "pending", "gpus", "cpus", "ram", "pending_gpus", "pending_cpus", "pending_ram")
+# Statuses in which a job holds its resources
+HOLDING_STATUSES = {"RUNNING", "COMPLETING"}
+# Pending array tasks squeue folds into one row ('123_[5-100%4]'): the task list
+ARRAY_TASKS_RE = re.compile(r"_\[([^\]]*)\]$")
+
+Contribution = Tuple[Tuple[str, ...], Tuple[float, ...]]  # group keys, values
+
+
+def array_task_count(job_id: Any) -> int:
+    """Number of tasks a queue row stands for: 1, or the size of a '123_[1-5,7,10-20:2%4]' range."""
+    match = ARRAY_TASKS_RE.search(str(job_id or ""))
+    if not match:
+        return 1
+    count = 0
+    for part in match.group(1).split("%")[0].split(","):
+        bounds, _, step = part.partition(":")
+        first, _, last = bounds.partition("-")
+        try:
+            first_task = int(first)
+            last_task = int(last) if last else first_task
+            count += max(0, (last_task - first_task) // int(step or 1) + 1)
+        except ValueError:  # not a task list: counted as one task
+            count += 1
+    return max(count, 1)
+
+
+def job_contribution(job: Dict[str, Any]) -> Optional[Contribution]:
+    """What ``job`` adds to the totals of its groups, None if nothing."""
+    status = job.get("Status")
+    if status in HOLDING_STATUSES:
+        held = True
+    elif status == "PENDING":
+        held = False
+    else:
+        return None
+    gpus = job.get("GPUs") or 0
+    cpus = job.get("CPUs") or 0
+    ram = typed_value(job, "RAM") or 0
+    keys = tuple([job.get(dimension) or "" for dimension in USAGE_DIMENSIONS])
+    if held:
+        return keys, (1, 0, gpus, cpus, ram, 0, 0, 0)
+    # Every task of a pending array row requests the row's resources
+    tasks = array_task_count(job.get("Job ID"))
+    return keys, (0, tasks, 0, 0, 0, gpus * tasks, cpus * tasks, ram * tasks)
+
+
+class UsageAggregator:
+    """Per-user/account/partition resource totals, updated incrementally."""
+
+    def __init__(self):
+        self._contributions: Dict[str, Contribution] = {}  # job ID -> contribution
+        self._totals: Dict[str, Dict[str, List[float]]] = {dimension: {} for dimension in USAGE_DIMENSIONS}
+
+    def update(self, jobs: List[Dict[str, Any]]) -> Dict[str, Dict[str, Tuple[float, ...]]]:
+        """Applies a queue snapshot and returns a copy of the totals (see snapshot)."""
+        current = {}
+        for job in jobs:
+            contribution = job_contribution(job)
+            if contribution is not None:
+                # Jobs spanning several nodes have one row per node: counted once
+                current[job.get("Job ID")] = contribution
+
+        previous = self._contributions
+        for job_id, contribution in previous.items():
+            if current.get(job_id) != contribution:
+                self._apply(contribution, -1)
+        for job_id, contribution in current.items():
+            if previous.get(job_id) != contribution:
+                self._apply(contribution, 1)
+        self._contributions = current
+        return self.snapshot()
+
+    def snapshot(self) -> Dict[str, Dict[str, Tuple[float, ...]]]:
+        """Dimension -> group -> values in USAGE_FIELDS order."""
+        return {
+            dimension: {key: tuple(values) for key, values in groups.items()}
+            for dimension, groups in self._totals.items()
+        }
+
+    def _apply(self, contribution: Contribution, sign: int):
+        keys, values = contribution
+        for dimension, key in zip(USAGE_DIMENSIONS, keys):
+            groups = self._totals[dimension]
+            totals = groups.get(key)
+            if totals is None:
+                totals = groups[key] = [0] * len(USAGE_FIELDS)
+            for i, value in enumerate(values):
+                totals[i] += sign * value
+            if not totals[0] and not totals[1]:
+                # No running or pending jobs left in the group
+                del groups[key]
@@ -0,0 +1,282 @@
+"""
+Utilization History - bounded time series of cluster utilization.
+
+Every worker snapshot is recorded as samples of named series: CPU/RAM/GPU
+utilization per node, per partition and for the whole cluster, plus queue
+lengths. Each series is a set of fixed-size ``array`` ring buffers, one per
+tier of HISTORY_TIERS: a sample goes into the current slot of every tier,
+which holds the mean of the samples of its time bucket, so coarser tiers are
+downsampled as they are filled. Percentages are stored as one byte, other
+values as float32, which keeps 500 nodes within a few MB. The store can be
+saved to disk and reloaded at the next start.
+"""
+
+import json
+import math
+import os
+import struct
+import sys
+import threading
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from core.job_columns import parse_memory
+
+# (resolution in seconds, samples) of each tier, finest first: 1 h, 24 h and 7 days
+HISTORY_TIERS: Tuple[Tuple[int, int], ...] = ((10, 360), (60, 1440), (600, 1008))
+# Metrics stored as integer percentages (one byte per sample)
+PERCENT_METRICS = {"cpu", "ram", "gpu"}
+PERCENT_MISSING = 255
+FILE_MAGIC = b"SLURMHIST1\n"
+
+_history_instance = None
+
+
+def get_utilization_history() -> "UtilizationHistory":
+    global _history_instance
+    if _history_instance is None:
+        _history_instance = UtilizationHistory()
+    return _history_instance
+
+
+def series_key(scope: str, name: str, metric: str) -> str:
+    """'node/gpu01/cpu', 'partition/gpu/running', 'cluster//pending'."""
+    return f"{scope}/{name}/{metric}"
+
+
+class _Series:
+    """Ring buffers of one series, with the running mean of each tier's current bucket."""
+
+    __slots__ = ("percent", "buffers", "sums", "counts")
+
+    def __init__(self, percent: bool, tiers: Tuple[Tuple[int, int], ...]):
+        self.percent = percent
+        if percent:
+            self.buffers = [array("B", [PERCENT_MISSING]) * size for _, size in tiers]
+        else:
+            self.buffers = [array("f", [math.nan]) * size for _, size in tiers]
+        self.sums = [0.0] * len(tiers)
+        self.counts = [0] * len(tiers)
+
+    def clear_slots(self, tier: int, start: int, count: int):
+        """Marks ``count`` slots from ``start`` (wrapping around) as missing and resets the bucket mean."""
+        buffer = self.buffers[tier]
+        missing = PERCENT_MISSING if self.percent else math.nan
+        if count == 1:  # the usual case: the next bucket
+            buffer[start] = missing
+        else:
+            end = min(start + count, len(buffer))
+            buffer[start:end] = array(buffer.typecode, [missing]) * (end - start)
+            buffer[:count - (end - start)] = array(buffer.typecode, [missing]) * (count - (end - start))
+        self.sums[tier] = 0.0
+        self.counts[tier] = 0
+
+    def add(self, slots: List[Tuple[int, int]], value: float):
+        """Adds ``value`` to the current bucket (tier, slot) of every tier."""
+        sums, counts, buffers = self.sums, self.counts, self.buffers
+        for tier, slot in slots:
+            sums[tier] += value
+            counts[tier] += 1
+            mean = sums[tier] / counts[tier]
+            buffers[tier][slot] = min(max(int(mean + 0.5), 0), 100) if self.percent else mean
+
+    def decode(self, value: float) -> Optional[float]:
+        if self.percent:
+            return None if value == PERCENT_MISSING else float(value)
+        return None if math.isnan(value) else value
+
+
+class UtilizationHistory:
+    """Fixed-memory store of utilization series, written by the worker and read by the GUI."""
+
+    def __init__(self, tiers: Tuple[Tuple[int, int], ...] = HISTORY_TIERS):
+        self.tiers = tuple(tuple(tier) for tier in tiers)
+        self._series: Dict[str, _Series] = {}
+        self._buckets: List[Optional[int]] = [None] * len(self.tiers)  # current time bucket of each tier
+        self._lock = threading.Lock()
+        self._path: Optional[str] = None
+
+    # --- Writing -------------------------------------------------------------
+
+    def record(self, timestamp: float, samples: Dict[str, float]):
+        """Adds one sample per series at ``timestamp`` (seconds since the epoch)."""
+        with self._lock:
+            slots = []
+            for tier, (resolution, size) in enumerate(self.tiers):
+                bucket = int(timestamp // resolution)
+                self._advance(tier, bucket)
+                slots.append((tier, bucket % size))
+            for key, value in samples.items():
+                series = self._series.get(key)
+                if series is None:
+                    metric = key.rsplit("/", 1)[-1]
+                    series = self._series[key] = _Series(metric in PERCENT_METRICS, self.tiers)
+                series.add(slots, value)
+
+    def _advance(self, tier: int, bucket: int):
+        """Moves ``tier`` to ``bucket``, clearing the slots of the buckets without samples."""
+        current = self._buckets[tier]
+        if current is not None and bucket <= current:
+            return
+        if current is not None:
+            size = self.tiers[tier][1]
+            count = min(bucket - current, size)
+            for series in self._series.values():
+                series.clear_slots(tier, (bucket - count + 1) % size, count)
+        self._buckets[tier] = bucket
+
+    # --- Reading -------------------------------------------------------------
+
+    def keys(self, scope: Optional[str] = None) -> List[str]:
+        """Recorded series, optionally only those of ``scope`` ('node', 'partition', 'cluster')."""
+        with self._lock:
+            keys = list(self._series)
+        if scope is not None:
+            keys = [key for key in keys if key.startswith(scope + "/")]
+        return sorted(keys)
+
+    def names(self, scope: str) -> List[str]:
+        """Nodes or partitions with recorded series."""
+        return sorted({key.split("/")[1] for key in self.keys(scope)})
+
+    def values(self, key: str, tier: int = 0, points: Optional[int] = None) -> List[Optional[float]]:
+        """
+        The samples of ``key`` in ``tier``, oldest first (None where missing),
+        averaged down to at most ``points`` values if given.
+        """
+        with self._lock:
+            series = self._series.get(key)
+            bucket = self._buckets[tier]
+            if series is None or bucket is None:
+                return []
+            size = self.tiers[tier][1]
+            start = (bucket + 1) % size
+            raw = series.buffers[tier][start:] + series.buffers[tier][:start]
+            values = [series.decode(value) for value in raw]
+        return downsample(values, points) if points else values
+
+    def memory_bytes(self) -> int:
+        with self._lock:
+            return sum(
+                buffer.itemsize * len(buffer) for series in self._series.values() for buffer in series.buffers
+            )
+
+    # --- Persistence ---------------------------------------------------------
+
+    def enable_persistence(self, path: str):
+        """Loads the history saved at ``path`` (if compatible) and saves there from now on."""
+        self._path = path
+        try:
+            self.load(path)
+        except (OSError, ValueError, KeyError, struct.error) as e:
+            print(f"Could not load utilization history: {e}")
+
+    def save(self, path: Optional[str] = None):
+        """Writes the store atomically to ``path`` (default: the persistence path)."""
+        path = path or self._path
+        if not path:
+            return
+        with self._lock:
+            keys = list(self._series)
+            header = {
+                "tiers": self.tiers,
+                "buckets": self._buckets,
+                "byteorder": sys.byteorder,
+                "series": [[key, self._series[key].percent] for key in keys],
+            }
+            chunks = [buffer.tobytes() for key in keys for buffer in self._series[key].buffers]
+        data = json.dumps(header).encode()
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(FILE_MAGIC)
+            f.write(struct.pack("<I", len(data)))
+            f.write(data)
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str):
+        """Replaces the store with the one saved at ``path``; ignored if the tiers differ."""
+        if not os.path.exists(path):
+            return
+        with open(path, "rb") as f:
+            if f.read(len(FILE_MAGIC)) != FILE_MAGIC:
+                raise ValueError("not a utilization history file")
+            (length,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(length))
+            if tuple(tuple(tier) for tier in header["tiers"]) != self.tiers:
+                return
+            loaded = {}
+            for key, percent in header["series"]:
+                series = _Series(percent, self.tiers)
+                for buffer in series.buffers:
+                    buffer_bytes = f.read(buffer.itemsize * len(buffer))
+                    buffer[:] = array(buffer.typecode, buffer_bytes)
+                    if header["byteorder"] != sys.byteorder:
+                        buffer.byteswap()
+                loaded[key] = series
+        with self._lock:
+            self._series = loaded
+            self._buckets = list(header["buckets"])
+
+
+def downsample(values: List[Optional[float]], points: int) -> List[Optional[float]]:
+    """Averages consecutive values (ignoring missing ones) down to at most ``points`` values."""
+    if len(values) <= points:
+        return values
+    result = []
+    for i in range(points):
+        group = [v for v in values[i * len(values) // points:(i + 1) * len(values) // points] if v is not None]
+        result.append(sum(group) / len(group) if group else None)
+    return result
+
+
+def utilization_samples(nodes: Iterable[Dict[str, Any]], usage: Dict[str, Dict[str, tuple]]) -> Dict[str, float]:
+    """
+    Samples of one snapshot: CPU/RAM/GPU utilization (%) per node, partition
+    and cluster from 'scontrol show nodes', and queue lengths per partition and
+    cluster from the usage totals (core.usage_stats).
+    """
+    samples: Dict[str, float] = {}
+    totals: Dict[Tuple[str, str], List[float]] = {}  # (scope, name) -> alloc/total cpu, ram, gpu
+
+    for node in nodes:
+        name = node.get("NodeName")
+        if not name:
+            continue
+        try:
+            cpu = (float(node.get("alloc_cpu", 0)), float(node.get("total_cpu", 0)))
+            ram = (parse_memory(node.get("alloc_mem", "0M")) or 0.0, parse_memory(node.get("total_mem", "0M")) or 0.0)
+            gpu = (float(node.get("alloc_gres/gpu", 0)), float(node.get("total_gres/gpu", 0)))
+        except (ValueError, TypeError):
+            continue
+        for metric, (alloc, total) in (("cpu", cpu), ("ram", ram), ("gpu", gpu)):
+            if total > 0:
+                samples[series_key("node", name, metric)] = alloc / total * 100
+        groups = [("partition", p) for p in str(node.get("Partitions", "")).split(",") if p] + [("cluster", "")]
+        for group in groups:
+            sums = totals.setdefault(group, [0.0] * 6)
+            for i, value in enumerate(cpu + ram + gpu):
+                sums[i] += value
+
+    for (scope, name), sums in totals.items():
+        for metric, i in (("cpu", 0), ("ram", 2), ("gpu", 4)):
+            if sums[i + 1] > 0:
+                samples[series_key(scope, name, metric)] = sums[i] / sums[i + 1] * 100
+
+    # Queue lengths (USAGE_FIELDS: running, pending, ..., pending_gpus at index 5)
+    cluster_queue = [0.0, 0.0, 0.0]
+    # Partitions without running or pending jobs have no usage group: their queues are empty
+    for scope, name in totals:
+        if scope == "partition":
+            samples[series_key(scope, name, "running")] = 0.0
+            samples[series_key(scope, name, "pending")] = 0.0
+    for name, values in usage.get("Partition", {}).items():
+        samples[series_key("partition", name, "running")] = values[0]
+        samples[series_key("partition", name, "pending")] = values[1]
+        cluster_queue[0] += values[0]
+        cluster_queue[1] += values[1]
+        cluster_queue[2] += values[5]
+    for metric, value in zip(("running", "pending", "pending_gpus"), cluster_queue):
+        samples[series_key("cluster", "", metric)] = value
+    return samples
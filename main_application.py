@@ -20,6 +20,14 @@ from core.defaults import *
 from widgets.cluster_status_widget import ClusterStatusWidget
 from core.slurm_api import ConnectionState, SlurmAPI
 from core.event_bus import EventPriority, Events, get_event_bus
+from core.profiler import profile_span
+from core.job_query import QUERY_HELP
+from core.log_watch import get_log_watch_service
+from core.remote_fs import get_remote_path_index
+from core.env_discovery import get_environment_discovery
+from core.utilization_history import get_utilization_history
+from widgets.diagnostics_widget import DiagnosticsDialog
+from PyQt6.QtGui import QKeySequence, QShortcut
 import platform
 from functools import partial, wraps
 import os
@@ -203,6 +211,9 @@ class SlurmJobManagerApp(QMainWindow):
         self.stacked_widget = QStackedWidget()
         self.main_layout.addWidget(self.stacked_widget)
 
+        # Utilization history recorded by the worker, kept across restarts
+        get_utilization_history().enable_persistence(os.path.join(configs_dir, "utilization_history.bin"))
+
         # Create panels
         self.create_jobs_panel()
         self.slurm_worker = SlurmWorker(self.slurm_api, self.jobs_panel.model)
@@ -234,6 +245,11 @@ class SlurmJobManagerApp(QMainWindow):
         self.refresh_timer.start(REFRESH_INTERVAL_MS)
         # self.load_settings()
 
+        # Hidden diagnostics panel with the profiler timings
+        self.diagnostics_dialog = None
+        self.diagnostics_shortcut = QShortcut(QKeySequence("Ctrl+Shift+D"), self)
+        self.diagnostics_shortcut.activated.connect(self.open_diagnostics)
+
     def _event_bus_subscription(self):
         self.event_bus.subscribe(
             Events.DATA_READY, self.update_ui_with_data, priority=EventPriority.HIGH
@@ -378,6 +394,11 @@ class SlurmJobManagerApp(QMainWindow):
 
     def update_ui_with_data(self, event):
         """Updates the UI with new data from SLURM."""
+        with profile_span("ui.update"):
+            self._apply_worker_data(event)
+
+    def _apply_worker_data(self, event):
+        """Dispatches one worker snapshot to the panels."""
         nodes_data = event.data.get("nodes")
         queue_jobs = event.data.get("jobs")
         job_details = event.data.get("job_details")
@@ -393,6 +414,10 @@ class SlurmJobManagerApp(QMainWindow):
         if hasattr(self, "cluster_status_overview_widget") and nodes_data:
             self.cluster_status_overview_widget.update_status(nodes_data, queue_jobs)
 
+        usage = event.data.get("usage")
+        if hasattr(self, "cluster_status_overview_widget") and usage is not None:
+            self.cluster_status_overview_widget.update_usage(usage)
+
     # --- Navigation Bar ---
     def switch_panel(self, index, clicked_button):
         """Switches the visible panel in the QStackedWidget."""
@@ -507,6 +532,7 @@ class SlurmJobManagerApp(QMainWindow):
                 self.slurm_api._config.host,
                 self.slurm_api._config.username,
                 self.slurm_api._config.password,
+                self.slurm_api._config.port,
             )
             helper.open_ssh_terminal(connection, parent_widget=self)
 
@@ -515,6 +541,14 @@ class SlurmJobManagerApp(QMainWindow):
                 self, "Terminal Error", f"Failed to open terminal: {str(e)}"
             )
 
+    def open_diagnostics(self):
+        """Show the hidden diagnostics panel with the refresh pipeline timings."""
+        if self.diagnostics_dialog is None:
+            self.diagnostics_dialog = DiagnosticsDialog(parent=self)
+        self.diagnostics_dialog.show()
+        self.diagnostics_dialog.raise_()
+        self.diagnostics_dialog.activateWindow()
+
     # --- Panel Creation Methods ---
 
     def create_jobs_panel(self):
@@ -522,6 +556,11 @@ class SlurmJobManagerApp(QMainWindow):
         self.jobs_panel = JobsPanelWidget()  # <-- Changed this line
         self.stacked_widget.addWidget(self.jobs_panel)
 
+    def _show_filter_error(self, error: str):
+        """Marks the job filter box while its query is invalid."""
+        self.filter_jobs.setToolTip(error or QUERY_HELP)
+        self.filter_jobs.setStyleSheet(f"border: 1px solid {COLOR_RED};" if error else "")
+
     def create_cluster_panel(self):
         """Creates the panel displaying cluster status information."""
         cluster_panel = QWidget()
@@ -546,6 +585,7 @@ class SlurmJobManagerApp(QMainWindow):
         self.filter_jobs = QLineEdit()
         self.filter_jobs.setClearButtonEnabled(True)
         self.filter_jobs.setPlaceholderText("Filter jobs...")
+        self.filter_jobs.setToolTip(QUERY_HELP)
         # Use device-independent width
         self.filter_jobs.setFixedWidth(220)
         header_layout.addWidget(self.filter_jobs)
@@ -566,6 +606,7 @@ class SlurmJobManagerApp(QMainWindow):
 
         # Left Section: Job Queue
         self.job_queue_widget = JobQueueWidget()
+        self.job_queue_widget.filter_error.connect(self._show_filter_error)
         content_layout.addWidget(self.job_queue_widget)
         self.job_queue_widget.setSizePolicy(
             QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding
@@ -732,6 +773,13 @@ class SlurmJobManagerApp(QMainWindow):
         # if hasattr(self, 'jobs_panel') and self.jobs_panel.project_storer:
         #     self.jobs_panel.project_storer.stop_job_monitoring()
         self.slurm_worker.stop()
+        get_log_watch_service().stop()
+        get_remote_path_index().stop()
+        get_environment_discovery().stop()
+        try:
+            get_utilization_history().save()
+        except OSError as e:
+            print(f"Could not save utilization history: {e}")
         self.slurm_api.disconnect()
         print("Closing application.")
         event.accept()
@@ -1,5 +1,6 @@
 from typing import Dict, List, Any
 from PyQt6.QtCore import QObject, pyqtSignal
+from core.profiler import timed
 
 # MODEL
 class ClusterStatusModel(QObject):
@@ -71,6 +72,7 @@ class ClusterStatusModel(QObject):
             'reserved': reserved
         }
 
+    @timed("cluster_model.sort_nodes")
     def _sort_nodes_data(self, nodes_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Sort nodes data by partition and memory"""
         # Filter nodes that have Partitions key
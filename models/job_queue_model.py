@@ -1,18 +1,71 @@
 from pathlib import Path
 from core.defaults import *
 from utils import settings_path
+from core.profiler import timed
+from core.job_columns import COLUMN_TYPES, typed_value
+from core.job_query import JobQuery, compile_query
 from PyQt6.QtCore import QAbstractTableModel, Qt
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+
+
+# Separates the cells of a row's search key, so a filter never matches across cells
+SEARCH_KEY_SEPARATOR = "\x1f"
+# Role of a cell's native sort key: typed value for typed columns, lowercase text otherwise
+SORT_ROLE = Qt.ItemDataRole.UserRole + 1
+
+
+def display_text(value: Any) -> str:
+    """Text shown for a cell value ('Time Used' is a [text, timedelta] pair)."""
+    if isinstance(value, list) and len(value) == 2:
+        value = value[0]
+    return "" if value is None else str(value)
+
+
+def sort_key(job: Dict[str, Any], column: str) -> tuple:
+    """Sort key of a cell; unknown values sort first."""
+    if column in COLUMN_TYPES:
+        value = typed_value(job, column)
+        return (0,) if value is None else (1, value)
+    return (1, display_text(job.get(column)).lower())
 
 
 class JobQueueTableModel(QAbstractTableModel):
-    """A Qt-compliant table model for displaying the job queue efficiently."""
+    """
+    A Qt-compliant table model for displaying the job queue efficiently.
+
+    Filtering happens here rather than row by row in the proxy: the filter
+    text is compiled once into a JobQuery, evaluated against per-column
+    indexes, typed columns and a precomputed lowercase search key per row
+    (rebuilt only when the row changes), and the matching rows are published
+    in one reset, so the view never calls back into Python per row.
+
+    Sorting also happens here, on native keys (see SORT_ROLE) instead of
+    through lessThan: the rank of every row for a column and order is
+    computed once per snapshot with a stable sort (ties keep the worker's
+    default order), and reapplied to every refresh until the sort changes.
+    """
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._jobs: List[Dict[str, Any]] = []
+        self._all_jobs: List[Dict[str, Any]] = []  # the full snapshot
+        self._jobs: List[Dict[str, Any]] = []  # the rows passing the filter
         self._headers: List[str] = JOB_QUEUE_FIELDS
         self._displayable_fields: Dict[str, bool] = {}
+        # Lookup structures over _all_jobs, built on demand for the current snapshot
+        self._search_keys: Optional[List[str]] = None
+        self._indexes: Dict[str, Dict[str, List[int]]] = {}  # column -> lowercase value -> rows
+        self._typed_columns: Dict[str, List[Any]] = {}  # column -> typed value per row
+        self._key_cache: Dict[str, Tuple[tuple, str]] = {}  # job ID -> (values, search key)
+        self._sort_ranks: Dict[Tuple[int, Qt.SortOrder], List[int]] = {}  # (column, order) -> rank per row
+        # Filter state
+        self._filter_text = ""
+        self._query: Optional[JobQuery] = None
+        self._column_filter_keywords: List[str] = []
+        self._column_filter_column = -1
+        self._column_filter_negative = False
+        # Sort state (-1: the worker's default order)
+        self._sort_column = -1
+        self._sort_order = Qt.SortOrder.AscendingOrder
 
     def rowCount(self, parent=None) -> int:
         return len(self._jobs)
@@ -41,11 +94,14 @@ class JobQueueTableModel(QAbstractTableModel):
             return QColor(STATE_COLORS.get(status, COLOR_DARK_FG))
             
         # Handle data for sorting
+        if role == SORT_ROLE:
+            return sort_key(job, column_name)
+
         if role == Qt.ItemDataRole.EditRole:
             value = job.get(column_name)
             if isinstance(value, list) and len(value) == 2:
-                # For time, sort by seconds
-                return value[1].seconds 
+                # For time, the total seconds
+                return int(value[1].total_seconds())
             return value
 
         return None
@@ -56,12 +112,145 @@ class JobQueueTableModel(QAbstractTableModel):
                 return self._headers[section]
         return None
 
+    @timed("view.job_queue")
     def update_jobs(self, new_jobs: List[Dict[str, Any]]):
         """Efficiently updates the data and signals the view to redraw."""
         self.beginResetModel()
-        self._jobs = new_jobs
+        self._all_jobs = new_jobs
+        self._search_keys = None
+        self._indexes, self._typed_columns, self._sort_ranks = {}, {}, {}
+        self._jobs = self._filtered_jobs()
+        self.endResetModel()
+
+    # --- Sorting -------------------------------------------------------------
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder):
+        """Sorts the rows by ``column``, keeping selections on the same jobs."""
+        self.layoutAboutToBeChanged.emit()
+        old_jobs = self._jobs
+        self._sort_column, self._sort_order = column, order
+        self._jobs = self._filtered_jobs()
+        persistent = self.persistentIndexList()
+        if persistent:
+            new_rows = {id(job): row for row, job in enumerate(self._jobs)}
+            self.changePersistentIndexList(
+                persistent,
+                [self.index(new_rows[id(old_jobs[index.row()])], index.column()) for index in persistent],
+            )
+        self.layoutChanged.emit()
+
+    def _sort_rank(self) -> List[int]:
+        """Position of every row of the snapshot in the current sort order."""
+        cache_key = (self._sort_column, self._sort_order)
+        rank = self._sort_ranks.get(cache_key)
+        if rank is None:
+            column = self._headers[self._sort_column]
+            keys = [sort_key(job, column) for job in self._all_jobs]
+            # Stable even when reversed: ties keep the snapshot order
+            order = sorted(
+                range(len(keys)), key=keys.__getitem__, reverse=self._sort_order == Qt.SortOrder.DescendingOrder
+            )
+            rank = [0] * len(keys)
+            for position, row in enumerate(order):
+                rank[row] = position
+            self._sort_ranks[cache_key] = rank
+        return rank
+
+    # --- Filtering -----------------------------------------------------------
+
+    def set_text_filter(self, text: str):
+        """
+        Shows only rows matching the query ``text`` (see core.job_query).
+        Raises JobQueryError, keeping the current filter, if it is invalid.
+        """
+        if text == self._filter_text:
+            return
+        query = compile_query(text)
+        self._filter_text = text
+        self._query = query or None
+        self._apply_filter()
+
+    def set_column_filter(self, keywords: list, column: int, negative: bool = False):
+        """Shows only rows whose ``column`` contains one of ``keywords`` (or none of them if ``negative``)."""
+        self._column_filter_keywords = [kw.lower() for kw in keywords if kw]
+        self._column_filter_column = column
+        self._column_filter_negative = negative
+        self._apply_filter()
+
+    def _apply_filter(self):
+        self.beginResetModel()
+        self._jobs = self._filtered_jobs()
         self.endResetModel()
 
+    def _filtered_jobs(self) -> List[Dict[str, Any]]:
+        """Rows of the snapshot passing the column filter and the query, in sort order."""
+        keywords, column = self._column_filter_keywords, self._column_filter_column
+        sorting = 0 <= self._sort_column < len(self._headers)
+        if self._query is None and not (keywords and column >= 0) and not sorting:
+            return self._all_jobs
+        rows = range(len(self._all_jobs))
+        if keywords and column >= 0:
+            index = self.column_index(self._headers[column])
+            matched = set()
+            for value, value_rows in index.items():
+                if any(kw in value for kw in keywords):
+                    matched.update(value_rows)
+            negative = self._column_filter_negative
+            rows = [row for row in rows if (row in matched) != negative]
+        if self._query is not None:
+            rows = self._query.select(self, rows)
+        if sorting:
+            rows = sorted(rows, key=self._sort_rank().__getitem__)
+        jobs = self._all_jobs
+        return [jobs[row] for row in rows]
+
+    def column_index(self, column: str) -> Dict[str, List[int]]:
+        """Lowercase displayed value of ``column`` -> rows of the snapshot having it."""
+        index = self._indexes.get(column)
+        if index is None:
+            index = {}
+            for row, job in enumerate(self._all_jobs):
+                index.setdefault(display_text(job.get(column)).lower(), []).append(row)
+            self._indexes[column] = index
+        return index
+
+    def typed_column(self, column: str) -> List[Any]:
+        """Typed value (see job_columns.COLUMN_TYPES) of ``column`` for every row of the snapshot."""
+        values = self._typed_columns.get(column)
+        if values is None:
+            values = [typed_value(job, column) for job in self._all_jobs]
+            self._typed_columns[column] = values
+        return values
+
+    def search_keys(self) -> List[str]:
+        """Lowercase search key of every row, reusing the keys of unchanged rows."""
+        if self._search_keys is not None:
+            return self._search_keys
+        headers, cache = self._headers, self._key_cache
+        new_cache, keys = {}, []
+        for job in self._all_jobs:
+            values = tuple(job.get(h) for h in headers)
+            job_id = str(values[0])
+            cached = cache.get(job_id)
+            if cached is None or cached[0] != values:
+                key = SEARCH_KEY_SEPARATOR.join(display_text(v).lower() for v in values)
+                cached = (values, key)
+            new_cache[job_id] = cached
+            keys.append(cached[1])
+        self._key_cache = new_cache
+        self._search_keys = keys
+        return keys
+
+    def job_rows(self, job_ids) -> Dict[str, int]:
+        """Row of each of ``job_ids`` among the rows shown (IDs filtered out are missing)."""
+        wanted = set(job_ids)
+        rows = {}
+        for row, job in enumerate(self._jobs):
+            job_id = str(job.get("Job ID"))
+            if job_id in wanted:
+                rows[job_id] = row
+        return rows
+
     def set_displayable_fields(self, fields: Dict[str, bool]):
         """Sets which columns are available and visible."""
         self.beginResetModel()
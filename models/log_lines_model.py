@@ -0,0 +1,66 @@
+from typing import Optional
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt
+from core.log_cache import LogSpool
+
+
+class LogLinesModel(QAbstractListModel):
+    """
+    List model over a LogSpool: the view only asks for the visible rows,
+    which are read from the memory-mapped cache on demand. The open
+    (provisional) line is kept in memory as an extra last row.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._spool: Optional[LogSpool] = None
+        self._provisional = ""
+
+    def set_spool(self, spool: Optional[LogSpool], provisional: str = ""):
+        self.beginResetModel()
+        self._spool = spool
+        self._provisional = provisional
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid() or self._spool is None:
+            return 0
+        return self._spool.line_count + (1 if self._provisional else 0)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        row = index.row()
+        if row == self._spool.line_count:
+            return self._provisional
+        return self._spool.line(row)
+
+    def append(self, lines, provisional: str):
+        """Writes completed lines to the spool and updates the provisional row."""
+        if self._spool is None:
+            return
+        had_provisional = bool(self._provisional)
+        first = self._spool.line_count
+        if lines:
+            if had_provisional:
+                # The old provisional row becomes the first completed line
+                self.beginRemoveRows(QModelIndex(), first, first)
+                self._provisional = ""
+                self.endRemoveRows()
+                had_provisional = False
+            self.beginInsertRows(QModelIndex(), first, first + len(lines) - 1)
+            self._spool.append_lines(lines)
+            self.endInsertRows()
+
+        row = self._spool.line_count
+        if provisional and had_provisional:
+            self._provisional = provisional
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+        elif provisional:
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._provisional = provisional
+            self.endInsertRows()
+        elif had_provisional:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self._provisional = ""
+            self.endRemoveRows()
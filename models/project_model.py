@@ -1,4 +1,5 @@
 import copy
+import functools
 from dataclasses import dataclass, field
 import uuid
 from core.event_bus import get_event_bus, Events
@@ -13,136 +14,10 @@ from dataclasses import dataclass, field
 from typing import Optional
 
 
-@dataclass
-class Job:
-    """
-    A comprehensive data structure for a single SLURM job, designed to
-    closely mirror sbatch command-line options.
-    """
-
-    # --- sbatch Options ---
-    name: str = "new_job"
-    account: Optional[str] = None
-    array: Optional[str] = None
-    working_directory: Optional[str] = None
-    constraint: Optional[List[str]] = None
-    cpus_per_task: Optional[int] = 1
-    dependency: Optional[str] = None
-    error_file: Optional[str] = None
-    gpus: Optional[str] = None
-    gpus_per_task: Optional[str] = None
-    mem: Optional[str] = "1G"  # Default to 1GB
-    nice: Optional[int] = None
-    nodes: Optional[str] = 1
-    ntasks: Optional[int] = 1
-    output_file: Optional[str] = None
-    oversubscribe: bool = False
-    partition: Optional[str] = None
-    qos: Optional[str] = None
-    nodelist: Optional[List[str]] = None
-    time_limit: Optional[str] = None
-    # --- Custom Fields ---
-    venv: Optional[str] = None
-    project_name: Optional[str] = None  # To link the job to a project in the GUI
-    optional_sbatch: Optional[str] = None
-    script_commands: str = "echo 'Hello from SLURM!'"
-    discord_notifications: bool = False
-
-    # --- Internal State ---
-    id: Optional[str] = None
-    status: str = "NOT_SUBMITTED"
-    elapsed: str = "00:00:00"
-    
-    def __post_init__(self):
-        if self.error_file is None or self.output_file is None:
-            # Import here to avoid circular import at module level
-            from core.slurm_api import SlurmAPI
-            remote_home = SlurmAPI().remote_home or "~/"
-            if self.error_file is None:
-                self.error_file = f"{remote_home}/.slurm_logs/err_%A.log"
-            if self.output_file is None:
-                self.output_file = f"{remote_home}/.slurm_logs/out_%A.log"
+# Distinct variants of each script section kept by the generation caches
+SCRIPT_SECTION_CACHE_SIZE = 256
 
-    def to_dict(self):
-        """Converts the Job object to a dictionary for JSON serialization."""
-        return dataclasses.asdict(self)
-
-    @classmethod
-    def from_dict(cls, data: dict):
-        """Creates a Job instance from a dictionary."""
-        return cls(**data)
-    
-    def create_sbatch_script(self) -> str:
-        """
-        Generates the content for an sbatch submission script based on the
-        job's attributes. Uses os.linesep for cross-platform compatibility.
-        """
-        lines = ["#!/bin/bash"]
-
-        # --- Standard SBATCH Options ---
-        if self.name:
-            lines.append(f"#SBATCH --job-name={self.name}")
-        if self.account:
-            lines.append(f"#SBATCH --account={self.account}")
-        if self.array:
-            lines.append(f"#SBATCH --array={self.array}")
-        if self.working_directory:
-            lines.append(f"#SBATCH --chdir={self.working_directory}")
-        if self.constraint:
-            value = self.constraint[0]
-            if len(self.constraint) >= 1:
-                for c in self.constraint[1:]:
-                    value += f"|{c}"
-            lines.append(f"#SBATCH --constraint='{value }'")
-        if self.cpus_per_task:
-            lines.append(f"#SBATCH --cpus-per-task={self.cpus_per_task}")
-        if self.dependency:
-            lines.append(f"#SBATCH --dependency={self.dependency}")
-        if self.error_file:
-            lines.append(f"#SBATCH --error={self.error_file}")
-        if self.gpus:
-            lines.append(f"#SBATCH --gpus={self.gpus}")
-        if self.gpus_per_task:
-            lines.append(f"#SBATCH --gpus-per-task={self.gpus_per_task}")
-        if self.mem:
-            lines.append(f"#SBATCH --mem={self.mem}")
-        if self.nice is not None:
-            lines.append(f"#SBATCH --nice={self.nice}")
-        if self.nodes:
-            lines.append(f"#SBATCH --nodes={self.nodes}")
-        if self.ntasks:
-            # Only add ntasks if it's not a job array with the default of 1 task
-            if not self.array or (self.array and self.ntasks > 1):
-                lines.append(f"#SBATCH --ntasks={self.ntasks}")
-        if self.output_file:
-            lines.append(f"#SBATCH --output={self.output_file}")
-        if self.oversubscribe:
-            lines.append("#SBATCH --oversubscribe")
-        if self.partition:
-            lines.append(f"#SBATCH --partition={self.partition}")
-        if self.qos:
-            lines.append(f"#SBATCH --qos={self.qos}")
-        if self.nodelist:
-            lines.append(f"#SBATCH --nodelist={self.nodelist}")
-        if self.time_limit:
-            lines.append(f"#SBATCH --time={self.time_limit}") 
-        
-        # --- Custom Options ---
-        if self.optional_sbatch:
-            lines.append(self.optional_sbatch)
-
-        lines.append("")  # Blank line before commands
-
-        if self.discord_notifications:
-            from models.settings_model import SettingsModel
-            settings = SettingsModel()
-            webhook_url = settings._notification_settings.get('discord_webhook_url')
-            if settings._notification_settings.get('discord_enabled') and webhook_url:
-                lines.append("# --- Discord Notifications (Improved) ---")
-                lines.append(f'DISCORD_WEBHOOK_URL="{webhook_url}"')
-                
-                # Improved Discord notification script
-                discord_script = '''
+DISCORD_NOTIFICATION_SCRIPT = '''
 # Global variables for better state tracking
 CANCELLED=0
 NOTIFICATION_SENT=0
@@ -263,35 +138,212 @@ send_discord_notification "🚀 STARTED" "3447003"
 # Add a small delay to ensure start notification is sent
 sleep 1
 '''
-                lines.append(discord_script)
 
-        lines.append("# --- Your commands start here ---")
 
-        # Add setup for virtual environment if specified
-        if self.venv:
-            lines.append(f"source {self.venv}/bin/activate")
-            lines.append("")
+@functools.lru_cache(maxsize=SCRIPT_SECTION_CACHE_SIZE)
+def _header_section(name, account, array, working_directory, constraint, cpus_per_task, dependency,
+                    error_file, gpus, gpus_per_task, mem, nice, nodes, ntasks, output_file, oversubscribe,
+                    partition, qos, nodelist, time_limit, optional_sbatch) -> str:
+    """Shebang, #SBATCH options and custom options, followed by a blank line."""
+    lines = ["#!/bin/bash"]
+
+    # --- Standard SBATCH Options ---
+    if name:
+        lines.append(f"#SBATCH --job-name={name}")
+    if account:
+        lines.append(f"#SBATCH --account={account}")
+    if array:
+        lines.append(f"#SBATCH --array={array}")
+    if working_directory:
+        lines.append(f"#SBATCH --chdir={working_directory}")
+    if constraint:
+        lines.append(f"#SBATCH --constraint='{'|'.join(constraint)}'")
+    if cpus_per_task:
+        lines.append(f"#SBATCH --cpus-per-task={cpus_per_task}")
+    if dependency:
+        lines.append(f"#SBATCH --dependency={dependency}")
+    if error_file:
+        lines.append(f"#SBATCH --error={error_file}")
+    if gpus:
+        lines.append(f"#SBATCH --gpus={gpus}")
+    if gpus_per_task:
+        lines.append(f"#SBATCH --gpus-per-task={gpus_per_task}")
+    if mem:
+        lines.append(f"#SBATCH --mem={mem}")
+    if nice is not None:
+        lines.append(f"#SBATCH --nice={nice}")
+    if nodes:
+        lines.append(f"#SBATCH --nodes={nodes}")
+    if ntasks:
+        # Only add ntasks if it's not a job array with the default of 1 task
+        if not array or (array and ntasks > 1):
+            lines.append(f"#SBATCH --ntasks={ntasks}")
+    if output_file:
+        lines.append(f"#SBATCH --output={output_file}")
+    if oversubscribe:
+        lines.append("#SBATCH --oversubscribe")
+    if partition:
+        lines.append(f"#SBATCH --partition={partition}")
+    if qos:
+        lines.append(f"#SBATCH --qos={qos}")
+    if nodelist:
+        lines.append(f"#SBATCH --nodelist={nodelist}")
+    if time_limit:
+        lines.append(f"#SBATCH --time={time_limit}")
+
+    # --- Custom Options ---
+    if optional_sbatch:
+        lines.append(optional_sbatch)
+
+    lines.append("")  # Blank line before commands
+    return "\n".join(lines)
+
+
+@functools.lru_cache(maxsize=8)
+def _notification_section(webhook_url: str) -> str:
+    """Discord notification functions and traps for ``webhook_url``."""
+    return "\n".join([
+        "# --- Discord Notifications (Improved) ---",
+        f'DISCORD_WEBHOOK_URL="{webhook_url}"',
+        DISCORD_NOTIFICATION_SCRIPT,
+    ])
+
+
+@functools.lru_cache(maxsize=SCRIPT_SECTION_CACHE_SIZE)
+def _body_section(venv: Optional[str], script_commands: str, discord_notifications: bool,
+                  sweep_key: Optional[str]) -> str:
+    """Environment activation, sweep parameters (``sweep_key`` is the JSON of an array sweep) and user commands."""
+    lines = ["# --- Your commands start here ---"]
+
+    # Add setup for virtual environment if specified (conda envs may have no bin/activate)
+    if venv:
+        lines.append(
+            f"if [ -f {venv}/bin/activate ]; then source {venv}/bin/activate; "
+            f'else eval "$(conda shell.bash hook)" && conda activate {venv}; fi'
+        )
+        lines.append("")
+
+    if sweep_key:
+        from models.sweep import Sweep, array_script_lines, runtime_commands
+        lines.extend(array_script_lines(Sweep.from_dict(json.loads(sweep_key))))
+        script_commands = runtime_commands(script_commands)
+
+    # Wrap user commands with better signal handling if discord notifications are enabled
+    if discord_notifications:
+        lines.append("# Execute user commands with proper signal propagation")
+        lines.append("(")
+        lines.append("  # User commands in subshell for better signal handling")
+        lines.append(f"  {script_commands}")
+        lines.append(") &")
+        lines.append("USER_CMD_PID=$!")
+        lines.append("")
+        lines.append("# Wait for user commands to complete")
+        lines.append("wait $USER_CMD_PID")
+        lines.append("USER_EXIT_CODE=$?")
+        lines.append("")
+        lines.append("# Exit with the same code as user commands")
+        lines.append("exit $USER_EXIT_CODE")
+    else:
+        lines.append(script_commands)
+
+    return "\n".join(lines)
 
-        # Wrap user commands with better signal handling if discord notifications are enabled
-        if self.discord_notifications:
-            lines.append("# Execute user commands with proper signal propagation")
-            lines.append("(")
-            lines.append("  # User commands in subshell for better signal handling")
-            lines.append(f"  {self.script_commands}")
-            lines.append(") &")
-            lines.append("USER_CMD_PID=$!")
-            lines.append("")
-            lines.append("# Wait for user commands to complete")
-            lines.append("wait $USER_CMD_PID")
-            lines.append("USER_EXIT_CODE=$?")
-            lines.append("")
-            lines.append("# Exit with the same code as user commands")
-            lines.append("exit $USER_EXIT_CODE")
-        else:
-            lines.append(self.script_commands)
 
-        # Join lines with the appropriate separator for the OS
-        return "\n".join(lines)
+@dataclass
+class Job:
+    """
+    A comprehensive data structure for a single SLURM job, designed to
+    closely mirror sbatch command-line options.
+    """
+
+    # --- sbatch Options ---
+    name: str = "new_job"
+    account: Optional[str] = None
+    array: Optional[str] = None
+    working_directory: Optional[str] = None
+    constraint: Optional[List[str]] = None
+    cpus_per_task: Optional[int] = 1
+    dependency: Optional[str] = None
+    error_file: Optional[str] = None
+    gpus: Optional[str] = None
+    gpus_per_task: Optional[str] = None
+    mem: Optional[str] = "1G"  # Default to 1GB
+    nice: Optional[int] = None
+    nodes: Optional[str] = 1
+    ntasks: Optional[int] = 1
+    output_file: Optional[str] = None
+    oversubscribe: bool = False
+    partition: Optional[str] = None
+    qos: Optional[str] = None
+    nodelist: Optional[List[str]] = None
+    time_limit: Optional[str] = None
+    # --- Custom Fields ---
+    venv: Optional[str] = None
+    project_name: Optional[str] = None  # To link the job to a project in the GUI
+    optional_sbatch: Optional[str] = None
+    script_commands: str = "echo 'Hello from SLURM!'"
+    discord_notifications: bool = False
+    sweep: Optional[Dict] = None  # models.sweep.Sweep.to_dict() of a sweep template or array
+    depends_on: Optional[List[str]] = None  # IDs of project jobs this job runs after (afterok)
+    workflow: Optional[str] = None  # ID shared by the jobs of a workflow submitted together
+
+    # --- Internal State ---
+    id: Optional[str] = None
+    status: str = "NOT_SUBMITTED"
+    elapsed: str = "00:00:00"
+    
+    def __post_init__(self):
+        if self.error_file is None or self.output_file is None:
+            # Import here to avoid circular import at module level
+            from core.slurm_api import SlurmAPI
+            remote_home = SlurmAPI().remote_home or "~/"
+            if self.error_file is None:
+                self.error_file = f"{remote_home}/.slurm_logs/err_%A.log"
+            if self.output_file is None:
+                self.output_file = f"{remote_home}/.slurm_logs/out_%A.log"
+
+    def to_dict(self):
+        """Converts the Job object to a dictionary for JSON serialization."""
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Creates a Job instance from a dictionary."""
+        return cls(**data)
+    
+    def create_sbatch_script(self, notification_settings=None) -> str:
+        """
+        Generates the content for an sbatch submission script based on the
+        job's attributes. The header, notification block and body are cached
+        on the fields they depend on, so regenerating an unchanged script is a
+        few dictionary lookups. ``notification_settings`` defaults to the
+        shared snapshot (models.settings_model.get_notification_settings).
+        """
+        sections = [_header_section(*self._header_fields())]
+
+        if self.discord_notifications:
+            if notification_settings is None:
+                from models.settings_model import get_notification_settings
+                notification_settings = get_notification_settings()
+            webhook_url = notification_settings.discord_webhook_url
+            if notification_settings.discord_enabled and webhook_url:
+                sections.append(_notification_section(webhook_url))
+
+        # A sweep mapped to a job array: each task reads its parameters from the table
+        sweep_key = json.dumps(self.sweep, sort_keys=True) if self.sweep and self.array else None
+        sections.append(_body_section(self.venv, self.script_commands, self.discord_notifications, sweep_key))
+        return "\n".join(sections)
+
+    def _header_fields(self) -> tuple:
+        """Hashable values of the fields rendered as #SBATCH options, in _header_section's order."""
+        constraint = tuple(self.constraint) if self.constraint else None
+        nodelist = ",".join(self.nodelist) if isinstance(self.nodelist, list) else self.nodelist
+        return (
+            self.name, self.account, self.array, self.working_directory, constraint, self.cpus_per_task,
+            self.dependency, self.error_file, self.gpus, self.gpus_per_task, self.mem, self.nice, self.nodes,
+            self.ntasks, self.output_file, self.oversubscribe, self.partition, self.qos, nodelist,
+            self.time_limit, self.optional_sbatch,
+        )
 
     def to_table_row(self):
         return [ self.id, self.name, self.status, self.elapsed, self.cpus_per_task,self.mem, self.gpus if self.gpus != None else "0"]
@@ -458,11 +510,12 @@ class JobsModel:
         project = next((p for p in self.projects if p.name == project_name), None)
         if project:
             job_to_add.project_name = project.name
-            project.jobs.append(job_to_add)
+            project.jobs.extend(self._expand_sweep(job_to_add))
             project.cached_job = copy.deepcopy(job_to_add)
             project.cached_job.id = None
             project.cached_job.status = "NOT_SUBMITTED"
             project.cached_job.dependency = None
+            project.cached_job.workflow = None
             self.event_bus.emit(
                 Events.PROJECT_LIST_CHANGED, data={"projects": self.projects}
             )
@@ -470,6 +523,27 @@ class JobsModel:
         else:
             show_error_toast(None, "Error", f"Project '{project_name}' not found.")
     
+    def _expand_sweep(self, job: Job) -> List[Job]:
+        """Jobs created from a (possibly sweep template) job: itself, one array job or one job per point."""
+        if not job.sweep:
+            return [job]
+        from models.sweep import expand_sweep
+        jobs = expand_sweep(job)
+        for expanded in jobs:
+            expanded.project_name = job.project_name
+        return jobs
+
+    def _replace_dependency(self, project: Project, old_id: str, new_ids: List[str]):
+        """Points the workflow edges of the project's jobs from ``old_id`` to ``new_ids``."""
+        for job in project.jobs:
+            if job.depends_on and old_id in job.depends_on:
+                depends_on = []
+                for dep in job.depends_on:
+                    for new_dep in (new_ids if dep == old_id else [dep]):
+                        if new_dep not in depends_on and new_dep != job.id:
+                            depends_on.append(new_dep)
+                job.depends_on = depends_on or None
+
     def get_job_by_id(self, project_name: str, job_id: str) -> Optional[Job]:
         """Retrieves a job by its ID from a specific project."""
         project = next((p for p in self.projects if p.name == project_name), None)
@@ -485,11 +559,15 @@ class JobsModel:
         if project:
             for i, job in enumerate(project.jobs):
                 if job.id == job_id:
-                    project.jobs[i] = modified_job_data
+                    expanded = self._expand_sweep(modified_job_data)
+                    project.jobs[i:i + 1] = expanded
+                    if [j.id for j in expanded] != [job_id]:
+                        self._replace_dependency(project, job_id, [j.id for j in expanded])
                     project.cached_job = copy.deepcopy(modified_job_data)
                     project.cached_job.id = None
                     project.cached_job.status = "NOT_SUBMITTED"
                     project.cached_job.dependency = None
+                    project.cached_job.workflow = None
                     self.event_bus.emit(
                         Events.PROJECT_LIST_CHANGED, data={"projects": self.projects}
                     )
@@ -510,6 +588,7 @@ class JobsModel:
             new_job.name = f"{original_job.name}_copy"
             new_job.status = "NOT_SUBMITTED"
             new_job.dependency = None  # Clear dependencies
+            new_job.workflow = None  # Workflow edges (depends_on) are kept
 
             # Add the duplicated job to the project
             project.jobs.append(new_job)
@@ -525,17 +604,28 @@ class JobsModel:
     
     def update_job_after_submission(self, project_name: str, temp_job_id: str, new_slurm_id: str):
         """Updates a job's ID and status after successful submission."""
-        project = next((p for p in self.projects if p.name == project_name), None)
-        if project:
+        self.update_jobs_after_submission([(project_name, temp_job_id, new_slurm_id)])
+
+    def update_jobs_after_submission(self, submissions: List[tuple]):
+        """Applies (project_name, temp_job_id, new_slurm_id[, workflow_id]) results with one update and one save."""
+        updated = False
+        for submission in submissions:
+            project_name, temp_job_id, new_slurm_id = submission[:3]
             job_to_update = self.get_job_by_id(project_name, temp_job_id)
             if job_to_update:
                 job_to_update.id = new_slurm_id
                 job_to_update.status = "PENDING"
-                self.event_bus.emit(
-                    Events.PROJECT_LIST_CHANGED, data={"projects": self.projects}
-                )
-                self.save_to_remote()
-              
+                if len(submission) > 3:
+                    job_to_update.workflow = submission[3]
+                project = next(p for p in self.projects if p.name == project_name)
+                self._replace_dependency(project, temp_job_id, [new_slurm_id])
+                updated = True
+        if updated:
+            self.event_bus.emit(
+                Events.PROJECT_LIST_CHANGED, data={"projects": self.projects}
+            )
+            self.save_to_remote()
+
     def remove_job_from_project(self, project_name: str, job_id: str):
         """Removes a job from a specific project."""
         project = next((p for p in self.projects if p.name == project_name), None)
@@ -543,6 +633,7 @@ class JobsModel:
             job_to_remove = next((j for j in project.jobs if j.id == job_id), None)
             if job_to_remove:
                 project.jobs.remove(job_to_remove)
+                self._replace_dependency(project, job_id, [])
                 self.event_bus.emit(
                     Events.PROJECT_LIST_CHANGED, data={"projects": self.projects}
                 )
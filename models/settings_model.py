@@ -6,6 +6,37 @@ from core.event_bus import Event, Events, get_event_bus
 from PyQt6.QtCore import QSettings
 import tempfile
 import os
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class NotificationSettings:
+    """Immutable snapshot of the notification settings, passed to script generation."""
+    discord_enabled: bool = False
+    discord_webhook_url: str = ""
+
+
+_notification_settings_snapshot: Optional[NotificationSettings] = None
+
+
+def get_notification_settings() -> NotificationSettings:
+    """Current notification settings; the INI file is read once and the snapshot replaced when they change."""
+    global _notification_settings_snapshot
+    if _notification_settings_snapshot is None:
+        settings = QSettings(str(Path(settings_path)), QSettings.Format.IniFormat)
+        settings.beginGroup("NotificationSettings")
+        _notification_settings_snapshot = NotificationSettings(
+            settings.value("discord_enabled", False, type=bool),
+            settings.value("discord_webhook_url", "", type=str),
+        )
+        settings.endGroup()
+    return _notification_settings_snapshot
+
+
+def set_notification_settings(snapshot: Optional[NotificationSettings]):
+    """Replaces the shared snapshot (None to re-read the INI file on next use)."""
+    global _notification_settings_snapshot
+    _notification_settings_snapshot = snapshot
 
 # MODEL
 class SettingsModel(QObject):
@@ -55,6 +86,14 @@ class SettingsModel(QObject):
             'discord_webhook_url': self.settings.value("discord_webhook_url", "", type=str)
         }
         self.settings.endGroup()
+        self._publish_notification_settings()
+
+    def _publish_notification_settings(self):
+        """Makes the current notification settings the snapshot used for job scripts."""
+        set_notification_settings(NotificationSettings(
+            bool(self._notification_settings['discord_enabled']),
+            self._notification_settings['discord_webhook_url'] or "",
+        ))
 
     def save_to_remote_server(func):
         """Decorator to save configuration to a remote server after the method execution."""
@@ -114,6 +153,7 @@ class SettingsModel(QObject):
                         remote_settings.endGroup()
                     self.settings.sync()
                     os.remove(remote_settings_file.name)
+                    set_notification_settings(None)
                     print("Remote settings loaded and synced.")
             except Exception as e:
                 print(f"Failed to load remote settings: {e}")
@@ -180,6 +220,7 @@ class SettingsModel(QObject):
         else:
             settings = event_data
         self._notification_settings.update(settings)
+        self._publish_notification_settings()
         # Save notification settings
         self.settings.beginGroup("NotificationSettings")
         self.settings.setValue("discord_enabled",
@@ -0,0 +1,307 @@
+"""
+Parameter sweeps - expands a job template over parameter axes.
+
+A template job carries a ``sweep`` (see Sweep.to_dict) and uses ``{{name}}``
+placeholders in its text fields. The sweep is expanded lazily, point by
+point, either into separate jobs or - when only the script commands depend
+on the parameters - into a single Slurm job array: the parameter table is
+written into the batch script and each task reads its row by
+SLURM_ARRAY_TASK_ID, so one array job replaces N separate submissions.
+Sweeps larger than Slurm's default MaxArraySize become several arrays.
+"""
+
+import copy
+import itertools
+import random
+import re
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+SWEEP_GRID = "grid"  # every combination of the axis values
+SWEEP_ZIP = "zip"  # the i-th value of every axis together
+SWEEP_RANDOM = "random"  # a seeded random sample of the grid
+SWEEP_MODES = [SWEEP_GRID, SWEEP_ZIP, SWEEP_RANDOM]
+
+PLACEHOLDER_RE = re.compile(r"\{\{\s*([A-Za-z_]\w*)\s*\}\}")
+IDENTIFIER_RE = re.compile(r"^[A-Za-z_]\w*$")
+# Text fields of Job that may contain placeholders
+TEMPLATE_FIELDS = ["name", "working_directory", "output_file", "error_file", "venv", "optional_sbatch", "script_commands"]
+# Fields a running array task can resolve itself (from its row of the table)
+ARRAY_RUNTIME_FIELDS = {"script_commands"}
+# Delimiter of the parameter table embedded in array scripts
+TABLE_DELIMITER = "SWEEP_PARAMS"
+# Prefix of the shell variables holding the parameters of an array task, so a
+# parameter named e.g. PATH or SLURM_ARRAY_TASK_ID cannot replace the real one
+SHELL_VARIABLE_PREFIX = "SWEEP_"
+# Largest sweep that can be expanded (the points become table rows or jobs)
+MAX_SWEEP_POINTS = 10000
+# Tasks per job array: Slurm's default MaxArraySize of 1001 allows task IDs
+# 0-1000, so larger sweeps are split into several arrays
+MAX_ARRAY_TASKS = 1000
+
+
+@dataclass
+class SweepAxis:
+    name: str
+    values: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Sweep:
+    axes: List[SweepAxis] = field(default_factory=list)
+    mode: str = SWEEP_GRID
+    samples: int = 0  # number of points drawn in random mode
+    seed: int = 0
+    as_array: bool = True  # submit as one job array when possible
+    max_concurrent: int = 0  # array throttle ('%N', per array), 0 for none
+    tasks: Optional[List[int]] = None  # [first, stop) of the points run by one array of a split sweep
+
+    def __post_init__(self):
+        self._sample: Optional[List[int]] = None
+
+    # --- Size and points -----------------------------------------------------
+
+    def grid_size(self) -> int:
+        size = 1
+        for axis in self.axes:
+            size *= len(axis.values)
+        return size if self.axes else 0
+
+    def __len__(self) -> int:
+        if not self.axes:
+            return 0
+        if self.mode == SWEEP_ZIP:
+            return min(len(axis.values) for axis in self.axes)
+        if self.mode == SWEEP_RANDOM:
+            return min(self.samples, self.grid_size())
+        return self.grid_size()
+
+    def point(self, index: int) -> Dict[str, str]:
+        """Parameter values of point ``index`` (0-based), computed without expanding the sweep."""
+        if not 0 <= index < len(self):
+            raise IndexError(f"Sweep point {index} out of range (0-{len(self) - 1})")
+        if self.mode == SWEEP_ZIP:
+            return {axis.name: axis.values[index] for axis in self.axes}
+        if self.mode == SWEEP_RANDOM:
+            index = self._random_sample()[index]
+        # Mixed-radix decoding: the last axis varies fastest, like itertools.product
+        values = {}
+        for axis in reversed(self.axes):
+            index, digit = divmod(index, len(axis.values))
+            values[axis.name] = axis.values[digit]
+        return {axis.name: values[axis.name] for axis in self.axes}
+
+    def points(self) -> Iterator[Dict[str, str]]:
+        """All points in order, generated one at a time."""
+        names = [axis.name for axis in self.axes]
+        if self.mode == SWEEP_GRID:
+            for combination in itertools.product(*(axis.values for axis in self.axes)):
+                yield dict(zip(names, combination))
+        else:
+            for index in range(len(self)):
+                yield self.point(index)
+
+    def task_range(self) -> range:
+        """Points expanded from this sweep: all of them, or one part of a sweep split into arrays."""
+        size = len(self)
+        if not self.tasks:
+            return range(size)
+        return range(min(self.tasks[0], size), min(self.tasks[1], size))
+
+    def _random_sample(self) -> List[int]:
+        """Grid indices drawn for random mode; sampling a range never materializes the grid."""
+        if self._sample is None:
+            self._sample = random.Random(self.seed).sample(range(self.grid_size()), len(self))
+        return self._sample
+
+    # --- Validation and serialization ----------------------------------------
+
+    def validate(self) -> Optional[str]:
+        """Error message describing why the sweep cannot be expanded, or None."""
+        if not self.axes:
+            return "Add at least one parameter."
+        if self.mode not in SWEEP_MODES:
+            return f"Unknown sweep mode '{self.mode}'."
+        names = [axis.name for axis in self.axes]
+        if len(set(names)) != len(names):
+            return "Parameter names must be unique."
+        for axis in self.axes:
+            if not IDENTIFIER_RE.match(axis.name):
+                return f"'{axis.name}' is not a valid parameter name (letters, digits and '_')."
+            if not axis.values:
+                return f"Parameter '{axis.name}' has no values."
+            if any(not v or "\t" in v or "\n" in v for v in axis.values):
+                return f"Values of '{axis.name}' must be non-empty and contain no tabs or newlines."
+        if self.mode == SWEEP_ZIP and len({len(axis.values) for axis in self.axes}) > 1:
+            return "In zip mode all parameters need the same number of values."
+        if self.mode == SWEEP_RANDOM and self.samples <= 0:
+            return "Random mode needs a number of samples."
+        if len(self) > MAX_SWEEP_POINTS:
+            return f"The sweep has {len(self)} points; at most {MAX_SWEEP_POINTS} are supported."
+        if not self.task_range():
+            return f"This part of the sweep (points {self.tasks[0]}-{self.tasks[1] - 1}) no longer exists."
+        return None
+
+    def to_dict(self) -> dict:
+        return {
+            "axes": [{"name": axis.name, "values": list(axis.values)} for axis in self.axes],
+            "mode": self.mode,
+            "samples": self.samples,
+            "seed": self.seed,
+            "as_array": self.as_array,
+            "max_concurrent": self.max_concurrent,
+            "tasks": list(self.tasks) if self.tasks else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Sweep":
+        axes = [SweepAxis(a["name"], list(a.get("values", []))) for a in data.get("axes", [])]
+        return cls(
+            axes=axes,
+            mode=data.get("mode", SWEEP_GRID),
+            samples=data.get("samples", 0),
+            seed=data.get("seed", 0),
+            as_array=data.get("as_array", True),
+            max_concurrent=data.get("max_concurrent", 0),
+            tasks=data.get("tasks"),
+        )
+
+
+# --- Templates ---------------------------------------------------------------
+
+def substitute(text: Optional[str], values: Dict[str, str]) -> Optional[str]:
+    """Replaces ``{{name}}`` placeholders with values (unknown names are left as they are)."""
+    if not text:
+        return text
+    return PLACEHOLDER_RE.sub(lambda m: values.get(m.group(1), m.group(0)), text)
+
+
+def template_fields(job) -> Dict[str, List[str]]:
+    """Placeholder names used by each text field of ``job``."""
+    used = {}
+    for name in TEMPLATE_FIELDS:
+        value = getattr(job, name, None)
+        names = PLACEHOLDER_RE.findall(value) if isinstance(value, str) else []
+        if names:
+            used[name] = names
+    return used
+
+
+def array_mapping_blocker(job, sweep: Sweep) -> Optional[str]:
+    """Why ``job`` cannot run as one job array for ``sweep``, or None if it can."""
+    if not sweep.as_array:
+        return "separate jobs were requested"
+    fixed = [name for name in template_fields(job) if name not in ARRAY_RUNTIME_FIELDS]
+    if fixed:
+        return f"parameters are used in {', '.join(fixed)}"
+    if job.array:
+        return "the job already defines an array"
+    return None
+
+
+def array_chunks(sweep: Sweep) -> List[range]:
+    """Points of each job array of ``sweep``: one array, or several of MAX_ARRAY_TASKS tasks."""
+    size = len(sweep)
+    return [range(first, min(first + MAX_ARRAY_TASKS, size)) for first in range(0, size, MAX_ARRAY_TASKS)]
+
+
+def array_spec(sweep: Sweep) -> str:
+    spec = f"0-{len(sweep.task_range()) - 1}"
+    return f"{spec}%{sweep.max_concurrent}" if sweep.max_concurrent else spec
+
+
+def task_log_path(path: Optional[str]) -> Optional[str]:
+    """Makes a log path per array task by adding '%a' (before the extension) if missing."""
+    if not path or "%a" in path:
+        return path
+    directory, _, name = path.rpartition("/")
+    stem, dot, extension = name.rpartition(".")
+    name = f"{stem}_%a.{extension}" if dot and stem else f"{name}_%a"
+    return f"{directory}/{name}" if directory else name
+
+
+def render_job(template, values: Dict[str, str], index: int):
+    """Separate job for one sweep point: placeholders replaced by the point's values."""
+    job = copy.deepcopy(template)
+    for name in TEMPLATE_FIELDS:
+        setattr(job, name, substitute(getattr(job, name), values))
+    if not PLACEHOLDER_RE.search(template.name or ""):
+        job.name = f"{template.name}_{index}"
+    job.sweep = None
+    job.id = uuid.uuid4().hex[:8].capitalize()
+    job.status = "NOT_SUBMITTED"
+    return job
+
+
+def iter_sweep_jobs(template, sweep: Sweep) -> Iterator:
+    """Separate jobs of a sweep, generated one at a time."""
+    tasks = sweep.task_range()
+    for index, values in enumerate(itertools.islice(sweep.points(), tasks.start, tasks.stop), tasks.start):
+        yield render_job(template, values, index)
+
+
+def to_array_job(template, sweep: Sweep, tasks: Optional[range] = None):
+    """Array job running the sweep points in ``tasks`` (default: all) as one task each."""
+    job = copy.deepcopy(template)
+    if tasks is not None and len(tasks) < len(sweep):
+        sweep = copy.copy(sweep)
+        sweep.tasks = [tasks.start, tasks.stop]
+        job.name = f"{template.name}_{tasks.start}-{tasks.stop - 1}"
+        job.id = uuid.uuid4().hex[:8].capitalize()
+        job.status = "NOT_SUBMITTED"
+    job.sweep = sweep.to_dict()
+    job.array = array_spec(sweep)
+    job.output_file = task_log_path(job.output_file)
+    job.error_file = task_log_path(job.error_file)
+    return job
+
+
+def expand_sweep(template) -> List:
+    """
+    Jobs to add for a template carrying a sweep: array jobs when possible
+    (one per MAX_ARRAY_TASKS points), else one job per point. An edited part
+    of a split sweep stays that part.
+    """
+    sweep = Sweep.from_dict(template.sweep)
+    if array_mapping_blocker(template, sweep) is None:
+        chunks = array_chunks(sweep)
+        if sweep.tasks or len(chunks) == 1:
+            return [to_array_job(template, sweep)]
+        return [to_array_job(template, sweep, tasks) for tasks in chunks]
+    return list(iter_sweep_jobs(template, sweep))
+
+
+def shell_variable(name: str) -> str:
+    """Shell variable of parameter ``name`` in an array task ('lr' -> 'SWEEP_lr')."""
+    return SHELL_VARIABLE_PREFIX + name
+
+
+def array_script_lines(sweep: Sweep) -> List[str]:
+    """
+    Batch script lines selecting the parameters of $SLURM_ARRAY_TASK_ID from
+    the embedded table into exported SWEEP_<name> variables. The table holds
+    the rows of ``sweep.task_range()`` only, so task 0 of every array of a
+    split sweep reads the first row of its own part.
+    """
+    names = [axis.name for axis in sweep.axes]
+    variables = " ".join(shell_variable(name) for name in names)
+    lines = [
+        "# --- Sweep parameters: row $SLURM_ARRAY_TASK_ID of the table below ---",
+        f"_SWEEP_ROW=$(awk -v row=\"$((SLURM_ARRAY_TASK_ID + 2))\" 'NR == row' <<'{TABLE_DELIMITER}'",
+        "\t".join(names),
+    ]
+    tasks = sweep.task_range()
+    points = itertools.islice(sweep.points(), tasks.start, tasks.stop)
+    lines.extend("\t".join(values[name] for name in names) for values in points)
+    lines.append(TABLE_DELIMITER)
+    lines.append(")")
+    lines.append(f"IFS=$'\\t' read -r {variables} <<< \"$_SWEEP_ROW\"")
+    lines.append(f"export {variables}")
+    lines.append("")
+    return lines
+
+
+def runtime_commands(script_commands: str) -> str:
+    """Script commands of an array task: placeholders become the exported shell variables."""
+    return PLACEHOLDER_RE.sub(lambda m: "${" + shell_variable(m.group(1)) + "}", script_commands)
@@ -0,0 +1,91 @@
+from typing import Dict, List, Tuple
+
+from PyQt6.QtCore import QAbstractTableModel, Qt
+
+from core.usage_stats import USAGE_FIELDS
+
+# Column header -> index of the value in USAGE_FIELDS (None: the group name, "share": GPU share)
+USAGE_COLUMNS = [
+    ("Name", None),
+    ("Running", USAGE_FIELDS.index("running")),
+    ("Pending", USAGE_FIELDS.index("pending")),
+    ("GPUs", USAGE_FIELDS.index("gpus")),
+    ("GPU Share", "share"),
+    ("CPUs", USAGE_FIELDS.index("cpus")),
+    ("RAM", USAGE_FIELDS.index("ram")),
+    ("Pending GPUs", USAGE_FIELDS.index("pending_gpus")),
+    ("Pending CPUs", USAGE_FIELDS.index("pending_cpus")),
+    ("Pending RAM", USAGE_FIELDS.index("pending_ram")),
+]
+RAM_FIELDS = {USAGE_FIELDS.index("ram"), USAGE_FIELDS.index("pending_ram")}
+GPUS_FIELD = USAGE_FIELDS.index("gpus")
+# Role returning the numeric value of a cell, used for sorting
+USAGE_SORT_ROLE = Qt.ItemDataRole.UserRole + 1
+
+
+def format_bytes(size: float) -> str:
+    """17179869184 -> '16.0G'."""
+    for unit in ("B", "K", "M", "G", "T"):
+        if size < 1024 or unit == "T":
+            return f"{size:.0f}{unit}" if unit in ("B", "K") else f"{size:.1f}{unit}"
+        size /= 1024
+
+
+class UsageTableModel(QAbstractTableModel):
+    """Table of the usage totals of one dimension (users, accounts or partitions)."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[Tuple[str, Tuple[float, ...]]] = []
+        self._total_gpus = 0
+        self._name_header = "Name"
+
+    def rowCount(self, parent=None) -> int:
+        return len(self._rows)
+
+    def columnCount(self, parent=None) -> int:
+        return len(USAGE_COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        name, values = self._rows[index.row()]
+        field = USAGE_COLUMNS[index.column()][1]
+        if field is None:
+            value = name
+        elif field == "share":
+            value = values[GPUS_FIELD] / self._total_gpus * 100 if self._total_gpus else 0.0
+        else:
+            value = values[field]
+
+        if role == USAGE_SORT_ROLE:
+            return value
+        if role == Qt.ItemDataRole.DisplayRole:
+            if field == "share":
+                return f"{value:.1f}%"
+            if field in RAM_FIELDS:
+                return format_bytes(value)
+            return value if field is None else f"{value:g}"
+        if role == Qt.ItemDataRole.TextAlignmentRole and field is not None:
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            if section == 0:
+                return self._name_header
+            if section < len(USAGE_COLUMNS):
+                return USAGE_COLUMNS[section][0]
+        return None
+
+    def update_groups(self, name_header: str, groups: Dict[str, Tuple[float, ...]]):
+        """Shows the totals of ``groups`` (group -> values in USAGE_FIELDS order)."""
+        self.beginResetModel()
+        self._name_header = name_header
+        self._rows = list(groups.items())
+        self._total_gpus = sum(values[GPUS_FIELD] for values in groups.values())
+        self.endResetModel()
+
+    def totals(self) -> Dict[str, float]:
+        """Sum of every field over all groups."""
+        return {field: sum(values[i] for _, values in self._rows) for i, field in enumerate(USAGE_FIELDS)}
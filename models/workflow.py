@@ -0,0 +1,112 @@
+"""
+Workflows - jobs of a project linked into a dependency graph (DAG).
+
+A job lists the project jobs it waits for in ``depends_on`` (their IDs in the
+project). A workflow is submitted level by level: every job of a level only
+depends on jobs of earlier levels or on jobs already in the queue, so a
+level is submitted as one pipelined batch and its '--dependency=afterok:'
+options are filled in with the Slurm IDs returned for the levels before it.
+"""
+
+import uuid
+from typing import Dict, Iterable, List, Optional
+
+# Slurm dependency type used for the edges of a workflow
+WORKFLOW_DEPENDENCY_TYPE = "afterok"
+# Statuses in which a workflow job has finished, successfully or not
+FINISHED_STATUSES = {"COMPLETED", "FAILED", "CANCELLED", "STOPPED", "TIMEOUT", "NODE_FAIL", "OUT_OF_MEMORY"}
+
+
+class WorkflowError(ValueError):
+    """The dependency graph cannot be submitted (cycle or unknown job)."""
+
+
+def new_workflow_id() -> str:
+    return f"wf-{uuid.uuid4().hex[:6]}"
+
+
+def topological_levels(jobs: List) -> List[List[int]]:
+    """
+    Indexes of ``jobs`` grouped into levels (Kahn's algorithm). Dependencies on
+    IDs outside ``jobs`` are ignored: they are expected to be in the queue.
+    Raises WorkflowError if the graph has a cycle.
+    """
+    index_of = {job.id: index for index, job in enumerate(jobs)}
+    remaining = [0] * len(jobs)
+    dependents: Dict[int, List[int]] = {}
+    for index, job in enumerate(jobs):
+        for dep in set(job.depends_on or []):
+            if dep in index_of:
+                remaining[index] += 1
+                dependents.setdefault(index_of[dep], []).append(index)
+
+    level = [index for index, count in enumerate(remaining) if count == 0]
+    levels = []
+    while level:
+        levels.append(level)
+        following = []
+        for index in level:
+            for dependent in dependents.get(index, []):
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    following.append(dependent)
+        level = sorted(following)
+
+    if sum(len(level) for level in levels) != len(jobs):
+        cyclic = [jobs[index].name for index, count in enumerate(remaining) if count > 0]
+        raise WorkflowError(f"Dependency cycle between: {', '.join(cyclic)}")
+    return levels
+
+
+def ancestors(jobs_by_id: Dict[str, object], job_ids: Iterable[str]) -> List[str]:
+    """IDs of ``job_ids`` and of every job they (transitively) depend on that is in ``jobs_by_id``."""
+    seen, stack = [], list(job_ids)
+    while stack:
+        job_id = stack.pop()
+        if job_id in seen or job_id not in jobs_by_id:
+            continue
+        seen.append(job_id)
+        stack.extend(jobs_by_id[job_id].depends_on or [])
+    return seen
+
+
+def descendants(jobs: List, job_id: str) -> List[str]:
+    """IDs of the jobs that (transitively) depend on ``job_id``."""
+    found, stack = [], [job_id]
+    while stack:
+        current = stack.pop()
+        for job in jobs:
+            if current in (job.depends_on or []) and job.id not in found:
+                found.append(job.id)
+                stack.append(job.id)
+    return found
+
+
+def dependency_spec(job, slurm_ids: Dict[str, str]) -> Optional[str]:
+    """
+    The job's '--dependency' value: its workflow edges as 'afterok:<ids>'
+    (``slurm_ids`` maps project IDs submitted in this batch to Slurm IDs; other
+    IDs are already Slurm IDs) combined with any hand-written dependency.
+    """
+    parts = []
+    if job.depends_on:
+        ids = [slurm_ids.get(dep, dep) for dep in job.depends_on]
+        parts.append(f"{WORKFLOW_DEPENDENCY_TYPE}:{':'.join(ids)}")
+    if job.dependency:
+        parts.append(job.dependency)
+    # ',' means all of the dependencies must be satisfied
+    return ",".join(parts) if parts else None
+
+
+def workflow_summary(jobs: List, workflow_id: str) -> str:
+    """Progress of a workflow, e.g. '3/5 finished, 1 running'."""
+    members = [job for job in jobs if job.workflow == workflow_id]
+    finished = sum(1 for job in members if job.status in FINISHED_STATUSES)
+    failed = sum(1 for job in members if job.status in FINISHED_STATUSES and job.status != "COMPLETED")
+    running = sum(1 for job in members if job.status == "RUNNING")
+    summary = f"{finished}/{len(members)} finished"
+    if running:
+        summary += f", {running} running"
+    if failed:
+        summary += f", {failed} not completed"
+    return summary
@@ -2,6 +2,7 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
 from core.defaults import STUDENTS_JOBS_KEYWORD
+from core.profiler import timed
 from core.slurm_api import SlurmAPI
 from utils import parse_memory_size
 import os
@@ -184,12 +185,18 @@ class Cluster:
     nodes: Dict[str, Node] = field(default_factory=dict)
     jobs: List[Dict[str, Any]] = field(default_factory=list)
 
+    @timed("cluster.update_from_data")
     def update_from_data(
         self, nodes_data: List[Dict[str, Any]], jobs_data: List[Dict[str, Any]]
     ) -> None:
         """Update cluster nodes from pre-fetched data."""
         self.jobs = jobs_data
 
+        # Group jobs by node once instead of scanning the whole queue per node
+        jobs_by_node: Dict[str, List[Dict[str, Any]]] = {}
+        for job in jobs_data:
+            jobs_by_node.setdefault(job.get("Nodelist"), []).append(job)
+
         for node_info in nodes_data:
             name = node_info.get("NodeName")
             if not name:
@@ -198,7 +205,7 @@ class Cluster:
             if not node:
                 node = Node(name=name)
                 self.nodes[name] = node
-            node.update(node_info, jobs_data)
+            node.update(node_info, jobs_by_node.get(name, []))
 
     def as_dicts(self) -> List[Dict[str, Any]]:
         """Return list of raw node dictionaries."""
@@ -1,5 +1,23 @@
 from core.defaults import *
 from core.style import AppStyles
+from core.profiler import timed
+from core.usage_stats import USAGE_DIMENSIONS
+from core.utilization_history import PERCENT_METRICS, get_utilization_history
+from models.usage_model import GPUS_FIELD, USAGE_COLUMNS, USAGE_SORT_ROLE, UsageTableModel, format_bytes
+from widgets.sparkline_widget import SparklineWidget
+from PyQt6.QtWidgets import QTableView
+from typing import Tuple
+
+# History tab ranges: label, tier of core.utilization_history.HISTORY_TIERS
+HISTORY_RANGES = [("Last hour", 0), ("Last 24 hours", 1), ("Last 7 days", 2)]
+# History tab trend charts: metric, label, color (node scopes only have the first three)
+HISTORY_METRICS = [
+    ("cpu", "CPU", COLOR_BLUE),
+    ("ram", "RAM", COLOR_PURPLE),
+    ("gpu", "GPU", COLOR_GREEN),
+    ("running", "Running jobs", COLOR_ORANGE),
+    ("pending", "Pending jobs", COLOR_RED),
+]
 
 # VIEW
 class ClusterStatusView(QWidget):
@@ -29,11 +47,15 @@ class ClusterStatusView(QWidget):
         self.node_status_tab = NodeStatusTabView(parent=self.tab_widget, theme_stylesheet=self.theme_stylesheet)
         self.cpu_usage_tab = CpuUsageTabView(parent=self.tab_widget, theme_stylesheet=self.theme_stylesheet)
         self.ram_usage_tab = RamUsageTabView(parent=self.tab_widget, theme_stylesheet=self.theme_stylesheet)
+        self.usage_tab = UsageTabView(parent=self.tab_widget, theme_stylesheet=self.theme_stylesheet)
+        self.history_tab = HistoryTabView(parent=self.tab_widget, theme_stylesheet=self.theme_stylesheet)
 
         # Add the tab widgets to the QTabWidget
         self.tab_widget.addTab(self.node_status_tab, "Node Status")
         self.tab_widget.addTab(self.cpu_usage_tab, "CPU Usage")
         self.tab_widget.addTab(self.ram_usage_tab, "RAM Usage")
+        self.tab_widget.addTab(self.usage_tab, "Usage")
+        self.tab_widget.addTab(self.history_tab, "History")
 
         # Add the tab widget to the main layout
         self.main_layout.addWidget(self.tab_widget)
@@ -43,6 +65,7 @@ class ClusterStatusView(QWidget):
         self.setStyleSheet(self.theme_stylesheet)
         self.tab_widget.setStyleSheet(self.theme_stylesheet)
     
+    @timed("view.cluster_status")
     def update_display(self, processed_data: dict):
         """Update all tab displays with processed data"""
         if not processed_data.get('is_connected', False):
@@ -53,12 +76,20 @@ class ClusterStatusView(QWidget):
         self.node_status_tab.update_content(processed_data.get('node_data', {}))
         self.cpu_usage_tab.update_content(processed_data.get('node_data', {}))
         self.ram_usage_tab.update_content(processed_data.get('node_data', {}))
+
+    def update_usage(self, usage: dict):
+        """Update the Usage tab with the worker's per-user/account/partition totals"""
+        self.usage_tab.update_content(usage)
+        # The worker recorded the snapshot in the history store before emitting it
+        self.history_tab.refresh()
     
     def _show_connection_error(self):
         """Show connection error in all tabs"""
         self.node_status_tab.show_connection_error()
         self.cpu_usage_tab.show_connection_error()
         self.ram_usage_tab.show_connection_error()
+        self.usage_tab.show_connection_error()
+        self.history_tab.show_connection_error()
 
     def shutdown_ui(self, is_connected=False):
         """Show only a 'No connection' panel if not connected, else restore normal UI."""
@@ -572,4 +603,235 @@ class RamUsageTabView(QWidget):
         error_label = QLabel("⚠️ Unavailable Connection\n\nPlease check SLURM connection")
         error_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         error_label.setStyleSheet(f"color: {COLOR_RED}; font-size: 16px; padding: 40px;")
-        self.usage_grid_layout.addWidget(error_label, 0, 0)
\ No newline at end of file
+        self.usage_grid_layout.addWidget(error_label, 0, 0)
+
+class UsageTabView(QWidget):
+    """View for the GPU/CPU/RAM usage and pending demand per user, account or partition"""
+
+    def __init__(self, parent=None, theme_stylesheet=None):
+        super().__init__(parent)
+        self.theme_stylesheet = theme_stylesheet
+        self._usage: Dict[str, Dict[str, tuple]] = {}
+        self._setup_ui()
+
+    def _setup_ui(self):
+        """Set up the UI layout"""
+        self.main_layout = QVBoxLayout(self)
+        self.main_layout.setContentsMargins(15, 15, 15, 15)
+        self.main_layout.setSpacing(10)
+
+        title_layout = QHBoxLayout()
+        title_layout.setContentsMargins(0, 0, 0, 0)
+        section_title = QLabel("Usage by")
+        section_title.setObjectName("sectionTitle")
+        title_layout.addWidget(section_title)
+
+        self.dimension_combo = QComboBox()
+        self.dimension_combo.addItems(USAGE_DIMENSIONS)
+        self.dimension_combo.currentTextChanged.connect(self._show_dimension)
+        title_layout.addWidget(self.dimension_combo)
+        title_layout.addStretch()
+        self.main_layout.addLayout(title_layout)
+
+        self.summary_label = QLabel("")
+        self.main_layout.addWidget(self.summary_label)
+
+        self.table_model = UsageTableModel(self)
+        self.proxy_model = QSortFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.table_model)
+        self.proxy_model.setSortRole(USAGE_SORT_ROLE)
+        self.table_view = QTableView()
+        self.table_view.setModel(self.proxy_model)
+        self.table_view.setSortingEnabled(True)
+        self.table_view.sortByColumn(USAGE_COLUMNS.index(("GPUs", GPUS_FIELD)), Qt.SortOrder.DescendingOrder)
+        self.table_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table_view.setAlternatingRowColors(True)
+        self.table_view.verticalHeader().setVisible(False)
+        self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.main_layout.addWidget(self.table_view)
+
+        if self.theme_stylesheet:
+            self.setStyleSheet(self.theme_stylesheet)
+            section_title.setStyleSheet(f"color: {COLOR_DARK_FG};")
+
+    def update_content(self, usage: Dict[str, Dict[str, tuple]]):
+        """Update the table with the totals computed by the worker"""
+        self._usage = usage or {}
+        self._show_dimension(self.dimension_combo.currentText())
+
+    def _show_dimension(self, dimension: str):
+        self.table_model.update_groups(dimension, self._usage.get(dimension, {}))
+        totals = self.table_model.totals()
+        self.summary_label.setText(
+            f"{totals['running']:g} running jobs hold {totals['gpus']:g} GPUs, {totals['cpus']:g} CPUs, "
+            f"{format_bytes(totals['ram'])} RAM. {totals['pending']:g} pending jobs ask for "
+            f"{totals['pending_gpus']:g} GPUs, {totals['pending_cpus']:g} CPUs."
+        )
+
+    def show_connection_error(self):
+        """Show connection error message"""
+        self.update_content({})
+        self.summary_label.setText("⚠️ Unavailable Connection")
+
+class HistoryTabView(QWidget):
+    """View for the utilization history: trend charts of one scope and sparklines per partition"""
+
+    def __init__(self, parent=None, theme_stylesheet=None):
+        super().__init__(parent)
+        self.theme_stylesheet = theme_stylesheet
+        self.history = get_utilization_history()
+        self._metric_rows: List[Tuple[str, SparklineWidget, QLabel]] = []
+        self._partition_rows: Dict[str, Tuple[SparklineWidget, SparklineWidget, QLabel]] = {}
+        self._setup_ui()
+
+    def _setup_ui(self):
+        """Set up the UI layout"""
+        self.main_layout = QVBoxLayout(self)
+        self.main_layout.setContentsMargins(15, 15, 15, 15)
+        self.main_layout.setSpacing(10)
+
+        title_layout = QHBoxLayout()
+        title_layout.setContentsMargins(0, 0, 0, 0)
+        section_title = QLabel("History of")
+        section_title.setObjectName("sectionTitle")
+        title_layout.addWidget(section_title)
+        self.scope_combo = QComboBox()
+        self.scope_combo.addItem("Cluster", "cluster/")
+        self.scope_combo.setSizeAdjustPolicy(QComboBox.SizeAdjustPolicy.AdjustToContents)
+        self.scope_combo.currentIndexChanged.connect(self._rebuild_metric_rows)
+        title_layout.addWidget(self.scope_combo)
+        self.range_combo = QComboBox()
+        for label, _ in HISTORY_RANGES:
+            self.range_combo.addItem(label)
+        self.range_combo.currentIndexChanged.connect(self.refresh)
+        title_layout.addWidget(self.range_combo)
+        title_layout.addStretch()
+        self.memory_label = QLabel("")
+        title_layout.addWidget(self.memory_label)
+        self.main_layout.addLayout(title_layout)
+
+        self.metrics_layout = QGridLayout()
+        self.metrics_layout.setColumnStretch(1, 1)
+        self.main_layout.addLayout(self.metrics_layout, 2)
+
+        partitions_title = QLabel("Partitions (CPU / GPU)")
+        partitions_title.setObjectName("sectionTitle")
+        self.main_layout.addWidget(partitions_title)
+        partitions_widget = QWidget()
+        self.partitions_layout = QGridLayout(partitions_widget)
+        self.partitions_layout.setContentsMargins(0, 0, 0, 0)
+        self.partitions_layout.setColumnStretch(1, 1)
+        self.partitions_layout.setColumnStretch(2, 1)
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setWidget(partitions_widget)
+        self.main_layout.addWidget(scroll_area, 1)
+
+        if self.theme_stylesheet:
+            self.setStyleSheet(self.theme_stylesheet)
+            section_title.setStyleSheet(f"color: {COLOR_DARK_FG};")
+            partitions_title.setStyleSheet(f"color: {COLOR_DARK_FG};")
+        self._rebuild_metric_rows()
+
+    def _tier(self) -> int:
+        return HISTORY_RANGES[max(self.range_combo.currentIndex(), 0)][1]
+
+    def _update_scopes(self):
+        """Lists the partitions and nodes with history in the scope combo, keeping the selection"""
+        scopes = [("Cluster", "cluster/")]
+        scopes += [(f"Partition {name}", f"partition/{name}") for name in self.history.names("partition")]
+        scopes += [(f"Node {name}", f"node/{name}") for name in self.history.names("node")]
+        if [self.scope_combo.itemData(i) for i in range(self.scope_combo.count())] == [key for _, key in scopes]:
+            return
+        current = self.scope_combo.currentData()
+        self.scope_combo.blockSignals(True)
+        self.scope_combo.clear()
+        for label, key in scopes:
+            self.scope_combo.addItem(label, key)
+        self.scope_combo.setCurrentIndex(max(self.scope_combo.findData(current), 0))
+        self.scope_combo.blockSignals(False)
+        if self.scope_combo.currentData() != current:
+            self._rebuild_metric_rows()
+
+    def _rebuild_metric_rows(self):
+        """One trend chart per metric of the selected scope"""
+        _clear_layout(self.metrics_layout)
+        self._metric_rows = []
+        scope = self.scope_combo.currentData() or "cluster/"
+        metrics = HISTORY_METRICS if not scope.startswith("node/") else HISTORY_METRICS[:3]
+        for row, (metric, label, color) in enumerate(metrics):
+            percent = metric in PERCENT_METRICS
+            chart = SparklineWidget(color=color, max_value=100 if percent else None,
+                                    unit="%" if percent else "", axis=True, height=40)
+            value_label = QLabel("")
+            value_label.setMinimumWidth(60)
+            value_label.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            self.metrics_layout.addWidget(QLabel(label), row, 0)
+            self.metrics_layout.addWidget(chart, row, 1)
+            self.metrics_layout.addWidget(value_label, row, 2)
+            self._metric_rows.append((f"{scope}/{metric}", chart, value_label))
+        self.refresh()
+
+    def _update_partition_rows(self, tier: int):
+        """Compact CPU and GPU sparklines for every partition"""
+        names = self.history.names("partition")
+        if list(self._partition_rows) != names:
+            _clear_layout(self.partitions_layout)
+            self._partition_rows = {}
+            for row, name in enumerate(names):
+                cpu = SparklineWidget(color=COLOR_BLUE, max_value=100, unit="%")
+                gpu = SparklineWidget(color=COLOR_GREEN, max_value=100, unit="%")
+                value_label = QLabel("")
+                self.partitions_layout.addWidget(QLabel(name), row, 0)
+                self.partitions_layout.addWidget(cpu, row, 1)
+                self.partitions_layout.addWidget(gpu, row, 2)
+                self.partitions_layout.addWidget(value_label, row, 3)
+                self._partition_rows[name] = (cpu, gpu, value_label)
+        for name, (cpu, gpu, value_label) in self._partition_rows.items():
+            cpu_values = self.history.values(f"partition/{name}/cpu", tier, max(cpu.width(), 1))
+            gpu_values = self.history.values(f"partition/{name}/gpu", tier, max(gpu.width(), 1))
+            cpu.set_values(cpu_values)
+            gpu.set_values(gpu_values)
+            value_label.setText(f"{_last_value(cpu_values, '%')} / {_last_value(gpu_values, '%')}")
+
+    def refresh(self):
+        """Redraw the charts from the history store (skipped while the tab is hidden)"""
+        if not self.isVisible():
+            return
+        self._update_scopes()
+        tier = self._tier()
+        for key, chart, value_label in self._metric_rows:
+            values = self.history.values(key, tier, max(chart.width(), 1))
+            chart.set_values(values)
+            value_label.setText(_last_value(values, chart.unit))
+        self._update_partition_rows(tier)
+        self.memory_label.setText(f"{self.history.memory_bytes() / 1024 ** 2:.1f} MB")
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.refresh()
+
+    def show_connection_error(self):
+        """History stays readable while disconnected"""
+        self.refresh()
+
+
+def _clear_layout(layout):
+    while layout.count():
+        item = layout.takeAt(0)
+        widget = item.widget()
+        if widget is not None:
+            widget.setParent(None)
+            widget.deleteLater()
+
+
+def _last_value(values: List[Optional[float]], unit: str) -> str:
+    for value in reversed(values):
+        if value is not None:
+            return f"{value:.0f}{unit}"
+    return "-"
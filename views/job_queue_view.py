@@ -1,8 +1,14 @@
 from PyQt6.QtWidgets import QTableView
 from core.defaults import *
-from PyQt6.QtCore import QAbstractTableModel, QSortFilterProxyModel, Qt
+from PyQt6.QtCore import QAbstractTableModel, QItemSelection, QItemSelectionModel, QSortFilterProxyModel, Qt
 import traceback
-from typing import Dict
+from typing import Dict, List, Optional, Set, Tuple
+
+from core.job_actions import add_job_action_menu
+
+# Rows (visible ones first) measured when fitting columns to their contents;
+# Qt's default of 1000 costs ~0.5 s of data() calls whenever the sort changes
+HEADER_RESIZE_PRECISION = 100
 
 
 class JobQueueView(QTableView):  # Changed from QWidget
@@ -11,6 +17,9 @@ class JobQueueView(QTableView):  # Changed from QWidget
     def __init__(self, parent=None):
         super().__init__(parent)
         self._shutdown_panel = None
+        # Selection kept across model resets (see _save_selection)
+        self._saved_selection: Dict[str, Set[int]] = {}
+        self._saved_current: Optional[Tuple[str, int]] = None
         self._setup_table_properties()
 
     def _setup_table_properties(self):
@@ -24,12 +33,68 @@ class JobQueueView(QTableView):  # Changed from QWidget
         self.setSortingEnabled(True)
         self.setAlternatingRowColors(True)
         self.horizontalHeader().setStretchLastSection(True)
+        self.horizontalHeader().setResizeContentsPrecision(HEADER_RESIZE_PRECISION)
         self.setMinimumHeight(200)
 
         # --- MODIFICATION: Restore the context menu ---
         self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.customContextMenuRequested.connect(self._show_context_menu)
 
+    def setModel(self, model):
+        super().setModel(model)
+        # Every refresh resets the model; keep the selected cells on the same jobs
+        model.modelAboutToBeReset.connect(self._save_selection)
+        model.modelReset.connect(self._restore_selection)
+
+    def _save_selection(self):
+        """Remembers the selected cells and the current cell by job ID and column."""
+        column = JOB_QUEUE_FIELDS.index("Job ID")
+        model = self.model()
+        selected: Dict[str, Set[int]] = {}
+        for index in self.selectionModel().selectedIndexes():
+            job_id = str(model.index(index.row(), column).data(Qt.ItemDataRole.DisplayRole))
+            selected.setdefault(job_id, set()).add(index.column())
+        current = self.currentIndex()
+        if current.isValid():
+            job_id = str(model.index(current.row(), column).data(Qt.ItemDataRole.DisplayRole))
+            self._saved_current = (job_id, current.column())
+        else:
+            self._saved_current = None
+        self._saved_selection = selected
+
+    def _restore_selection(self):
+        """Selects the saved cells again on the rows now showing their jobs."""
+        selected, current = self._saved_selection, self._saved_current
+        self._saved_selection, self._saved_current = {}, None
+        ids = set(selected)
+        if current:
+            ids.add(current[0])
+        if not ids:
+            return
+        model = self.model()
+        source = model.sourceModel()
+        rows = source.job_rows(ids)
+        selection = QItemSelection()
+        for job_id, columns in selected.items():
+            row = rows.get(job_id)
+            if row is None:
+                continue
+            # One range per run of adjacent columns, so whole rows stay one range each
+            runs = []
+            for column in sorted(columns):
+                if runs and column == runs[-1][1] + 1:
+                    runs[-1][1] = column
+                else:
+                    runs.append([column, column])
+            for first, last in runs:
+                selection.select(model.mapFromSource(source.index(row, first)), model.mapFromSource(source.index(row, last)))
+        self.selectionModel().select(selection, QItemSelectionModel.SelectionFlag.ClearAndSelect)
+        if current and current[0] in rows:
+            self.selectionModel().setCurrentIndex(
+                model.mapFromSource(source.index(rows[current[0]], current[1])),
+                QItemSelectionModel.SelectionFlag.NoUpdate,
+            )
+
     def _show_context_menu(self, position):
         """Show context menu for copying cell values."""
         menu = QMenu(self)
@@ -46,9 +111,19 @@ class JobQueueView(QTableView):  # Changed from QWidget
         select_column_action = QAction("Select Column", self)
         select_column_action.triggered.connect(self._select_column)
         menu.addAction(select_column_action)
+
+        menu.addSeparator()
+        add_job_action_menu(menu, self, self.selected_job_ids(), source="JobQueueView")
         
         menu.exec(self.mapToGlobal(position))
 
+    def selected_job_ids(self) -> List[str]:
+        """Job IDs (array tasks as '123_4') of every row with a selected cell."""
+        column = JOB_QUEUE_FIELDS.index("Job ID")
+        rows = sorted({index.row() for index in self.selectionModel().selectedIndexes()})
+        model = self.model()
+        return [str(model.index(row, column).data(Qt.ItemDataRole.DisplayRole)) for row in rows]
+
     def _copy_selected_cells(self):
         """Copy selected cell values to clipboard."""
         indexes = self.selectionModel().selectedIndexes()
@@ -6,6 +6,8 @@ from core.defaults import *
 from core.event_bus import Events, get_event_bus
 from core.style import AppStyles
 from models.project_model import Job, Project
+from models.workflow import workflow_summary
+from core.job_actions import add_job_action_menu
 from widgets.toast_widget import show_warning_toast
 # from models.project_model import Project
 from utils import script_dir
@@ -197,6 +199,14 @@ class JobsTableView(QWidget):
         self.new_jobs_button.raise_()  # Make sure it's on top
         self.new_jobs_button.hide() # Initially hidden
 
+        # Submits every unsubmitted job of the current project in one pipelined batch
+        self.submit_all_button = QPushButton("Submit All", self)
+        self.submit_all_button.setToolTip("Submit all unsubmitted jobs of this project")
+        self.submit_all_button.clicked.connect(self._submit_all_for_current_project)
+        self.submit_all_button.setFixedSize(120, 40)
+        self.submit_all_button.raise_()
+        self.submit_all_button.hide()
+
         self._apply_stylesheet()
 
 
@@ -220,6 +230,9 @@ class JobsTableView(QWidget):
             1, QHeaderView.ResizeMode.Stretch
         )
         table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        table.customContextMenuRequested.connect(partial(self._show_table_menu, table))
         table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         table.verticalHeader().setVisible(False)
         table.setAlternatingRowColors(True)
@@ -285,9 +298,11 @@ class JobsTableView(QWidget):
         if project_name in self.tables:
             self.stacked_widget.setCurrentWidget(self.tables[project_name])
             self.new_jobs_button.show()
+            self.submit_all_button.show()
         else:
             self.stacked_widget.setCurrentWidget(self.placeholder_widget)
             self.new_jobs_button.hide()
+            self.submit_all_button.hide()
 
 
     def update_jobs_for_project(self, project_name: str, jobs: List[Job]):
@@ -299,8 +314,13 @@ class JobsTableView(QWidget):
             old_scroll_position = scrollbar.value()
 
             table.setRowCount(0)
+            names = {job.id: job.name for job in jobs}
+            summaries = {}  # workflow ID -> progress, computed once per update
             for job_data in jobs:
                 self._add_job_to_table(table, job_data)
+                if job_data.depends_on or job_data.workflow:
+                    tooltip = self._workflow_tooltip(job_data, jobs, names, summaries)
+                    table.item(table.rowCount() - 1, 1).setToolTip(tooltip)
 
             if was_at_bottom:
                 scrollbar.setValue(scrollbar.maximum())
@@ -308,6 +328,38 @@ class JobsTableView(QWidget):
                 scrollbar.setValue(old_scroll_position)
 
 
+    def _show_table_menu(self, table: QTableWidget, position):
+        """Context menu acting on every selected job of the table at once."""
+        rows = sorted({index.row() for index in table.selectionModel().selectedRows()})
+        selected = [(table.item(row, 0).text(), table.item(row, 2).text()) for row in rows if table.item(row, 0)]
+        unsubmitted = [job_id for job_id, status in selected if status == NOT_SUBMITTED]
+        submitted = [job_id for job_id, status in selected if status != NOT_SUBMITTED]
+
+        menu = QMenu(self)
+        submit_action = menu.addAction(f"Submit Selected ({len(unsubmitted)})")
+        submit_action.setEnabled(bool(unsubmitted))
+        submit_action.triggered.connect(
+            lambda: get_event_bus().emit(
+                Events.SUBMIT_JOBS,
+                data={"project_name": table.objectName(), "job_ids": unsubmitted},
+                source="JobsTableView",
+            )
+        )
+        menu.addSeparator()
+        add_job_action_menu(menu, self, submitted, source="JobsTableView")
+        menu.exec(table.viewport().mapToGlobal(position))
+
+    def _workflow_tooltip(self, job: Job, jobs: List[Job], names: dict, summaries: dict) -> str:
+        """Workflow progress and upstream jobs of a job, shown on its name."""
+        lines = []
+        if job.workflow:
+            if job.workflow not in summaries:
+                summaries[job.workflow] = workflow_summary(jobs, job.workflow)
+            lines.append(f"Workflow {job.workflow}: {summaries[job.workflow]}")
+        if job.depends_on:
+            lines.append("Runs after: " + ", ".join(names.get(dep, dep) for dep in job.depends_on))
+        return "\n".join(lines)
+
     def _apply_state_color(self, item: QTableWidgetItem):
         """Apply color based on job status"""
         txt = item.text().lower()
@@ -351,6 +403,10 @@ class JobsTableView(QWidget):
                 self.width() - self.new_jobs_button.width() - 20,
                 self.height() - self.new_jobs_button.height() - 20
             )
+            self.submit_all_button.move(
+                self.new_jobs_button.x() - self.submit_all_button.width() - 10,
+                self.new_jobs_button.y()
+            )
 
     def _create_new_job_for_current_project(self):
         """Creates a new job for the currently selected project."""
@@ -362,6 +418,16 @@ class JobsTableView(QWidget):
         elif current_widget is self.placeholder_widget:
             show_warning_toast(self, "No Project Selected", "Please select or create a project first.")
 
+    def _submit_all_for_current_project(self):
+        """Submits all unsubmitted jobs of the currently selected project."""
+        current_widget = self.stacked_widget.currentWidget()
+        if isinstance(current_widget, QTableWidget) and current_widget.objectName():
+            get_event_bus().emit(
+                Events.SUBMIT_JOBS,
+                data={"project_name": current_widget.objectName()},
+                source="JobsTableView",
+            )
+
     def _create_new_job(self, project_name):
         get_event_bus().emit(
             Events.CREATE_JOB_DIALOG_REQUESTED,
@@ -202,8 +202,14 @@ class ProjectGroup(QGroupBox):
         self.add_button = QPushButton("New Project")
         self.add_button.setObjectName(BTN_GREEN)
         self.add_button.clicked.connect(self._prompt_for_new_project)
+        self.dashboard_button = QPushButton("Log Dashboard")
+        self.dashboard_button.setToolTip("Watch the logs of all running jobs")
+        self.dashboard_button.clicked.connect(
+            lambda: get_event_bus().emit(Events.OPEN_LOG_DASHBOARD, source="JobsPanelView.ProjectGroup")
+        )
         self.layout.addWidget(self.scroll_area)
         self.layout.addWidget(self.add_button)
+        self.layout.addWidget(self.dashboard_button)
         self._project_widgets = {}
         self._selected_widget = None
 
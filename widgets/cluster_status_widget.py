@@ -48,3 +48,7 @@ class ClusterStatusWidget(QWidget):
         jobs_data = self.cluster.jobs
 
         self.controller.update_status(nodes_data, jobs_data)
+
+    def update_usage(self, usage):
+        """Show the per-user/account/partition usage totals of the latest snapshot."""
+        self.controller.update_usage(usage)
@@ -0,0 +1,128 @@
+"""
+Diagnostics Dialog - hidden panel showing the timing spans recorded by the profiler.
+Opened with Ctrl+Shift+D from the main window.
+"""
+
+from core.defaults import *
+from core.profiler import HISTOGRAM_EDGES_MS, get_profiler
+from core.style import AppStyles
+from widgets.toast_widget import show_error_toast, show_success_toast
+
+DIAGNOSTICS_COLUMNS = ["Span", "Count", "Last (ms)", "Mean (ms)", "p50 (ms)", "p95 (ms)", "Max (ms)", "Total (s)"]
+DIAGNOSTICS_REFRESH_MS = 1000
+
+
+class DiagnosticsDialog(QDialog):
+    """Live table of per-span timing statistics with a dump-to-JSON option."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.profiler = get_profiler()
+
+        self.setWindowTitle("Diagnostics")
+        self.setMinimumSize(900, 450)
+        self.setStyleSheet(AppStyles.get_complete_stylesheet())
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self._refresh)
+
+        self._setup_ui()
+
+    def _setup_ui(self):
+        """Initializes the user interface of the dialog."""
+        layout = QVBoxLayout(self)
+
+        self.table = QTableWidget()
+        self.table.setColumnCount(len(DIAGNOSTICS_COLUMNS))
+        self.table.setHorizontalHeaderLabels(DIAGNOSTICS_COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setAlternatingRowColors(True)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        self.enabled_check = QCheckBox("Recording")
+        self.enabled_check.setChecked(self.profiler.enabled())
+        self.enabled_check.toggled.connect(self._toggle_recording)
+        button_layout.addWidget(self.enabled_check)
+        button_layout.addStretch()
+
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self._reset)
+        button_layout.addWidget(reset_button)
+
+        dump_button = QPushButton("Dump to JSON...")
+        dump_button.setObjectName(BTN_BLUE)
+        dump_button.clicked.connect(self._dump_json)
+        button_layout.addWidget(dump_button)
+
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+    def _refresh(self):
+        """Reloads the table from the profiler snapshot."""
+        snapshot = self.profiler.snapshot()
+        self.table.setRowCount(len(snapshot))
+        for row, (name, stats) in enumerate(snapshot.items()):
+            values = [
+                name,
+                str(stats.get("count", 0)),
+                f"{stats.get('last_ms', 0):.1f}",
+                f"{stats.get('mean_ms', 0):.1f}",
+                f"{stats.get('p50_ms', 0):.1f}",
+                f"{stats.get('p95_ms', 0):.1f}",
+                f"{stats.get('max_ms', 0):.1f}",
+                f"{stats.get('total_s', 0):.2f}",
+            ]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col > 0:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, col, item)
+            self.table.item(row, 0).setToolTip(self._histogram_tooltip(stats.get("histogram", [])))
+
+    def _histogram_tooltip(self, histogram: List[int]) -> str:
+        lines = []
+        lower = 0
+        for edge, count in zip(HISTOGRAM_EDGES_MS, histogram):
+            if count:
+                upper = "inf" if edge == float("inf") else f"{edge}"
+                lines.append(f"{lower}-{upper} ms: {count}")
+            lower = edge
+        return "\n".join(lines) or "No samples"
+
+    def _toggle_recording(self, checked: bool):
+        if checked:
+            self.profiler.enable()
+        else:
+            self.profiler.disable()
+
+    def _reset(self):
+        self.profiler.reset()
+        self._refresh()
+
+    def _dump_json(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Save Diagnostics", "slurm_gui_diagnostics.json", "JSON Files (*.json)"
+        )
+        if not path:
+            return
+        try:
+            self.profiler.dump_json(path)
+            show_success_toast(self, "Diagnostics Saved", f"Timings written to {path}")
+        except OSError as e:
+            show_error_toast(self, "Save Failed", str(e))
+
+    def showEvent(self, event):
+        """Resumes live refresh when the dialog is shown again."""
+        self._refresh()
+        self.timer.start(DIAGNOSTICS_REFRESH_MS)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        """Ensures the timer is stopped when the dialog is hidden or closed."""
+        self.timer.stop()
+        super().hideEvent(event)
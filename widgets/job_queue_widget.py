@@ -3,18 +3,28 @@ from core.defaults import *
 from core.event_bus import EventPriority, Events, get_event_bus
 from core.style import AppStyles
 
+# Typing in the search box filters the queue only after this pause
+FILTER_DEBOUNCE_MS = 150
+
 
 class JobQueueWidget(QGroupBox):
     """
     Job Queue Widget: pure proxy to the MVC model, no UI/layout logic here.
     """
 
+    filter_error = pyqtSignal(str)  # error of the last filter query, "" if valid
+
     def __init__(self, parent=None):
         super().__init__("Job Queue", parent)
         self.controller = JobQueueController(self)
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.addWidget(self.controller.view)
+        self._pending_filter = ""
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(FILTER_DEBOUNCE_MS)
+        self._filter_timer.timeout.connect(self._apply_pending_filter)
         self._event_bus_subscription()
 
     def _event_bus_subscription(self):
@@ -53,10 +63,17 @@ class JobQueueWidget(QGroupBox):
         self.controller.filter_table_by_user(keywords, negative=negative)
 
     def filter_table(self, kw: str):
-        self.controller.filter_table(kw)
+        """Filters the queue once typing pauses for FILTER_DEBOUNCE_MS."""
+        self._pending_filter = kw
+        self._filter_timer.start()
+
+    def _apply_pending_filter(self):
+        self.filter_error.emit(self.controller.filter_table(self._pending_filter))
 
     def show_all_rows(self):
-        self.controller.filter_table("")
+        self._filter_timer.stop()
+        self._pending_filter = ""
+        self.filter_error.emit(self.controller.filter_table(""))
 
     # If you need to access the view for layout, do it from outside this widget:
     @property
@@ -0,0 +1,106 @@
+"""
+Log Dashboard Dialog - live overview of the logs of all running project jobs.
+Fed by the shared LogWatchService: one batched stat per interval for all jobs.
+"""
+
+from datetime import datetime
+
+from core.defaults import *
+from core.event_bus import Events, get_event_bus
+from core.log_watch import JobLogStatus, get_log_watch_service
+from core.style import AppStyles
+from widgets.log_viewer_widget import format_size
+
+DASHBOARD_COLUMNS = ["Job ID", "Name", "Project", "Status", "Output", "Updated", "Last output line", "Last error line"]
+
+
+class LogDashboardDialog(QDialog):
+    """Table of running jobs with log sizes and last lines; double-click opens the log viewer."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.watch_service = get_log_watch_service()
+        self.event_bus = get_event_bus()
+
+        self.setWindowTitle("Log Dashboard")
+        self.setMinimumSize(1000, 400)
+        self.setStyleSheet(AppStyles.get_complete_stylesheet())
+
+        self._setup_ui()
+        self.watch_service.jobs_updated.connect(self._on_jobs_updated)
+
+    def _setup_ui(self):
+        """Initializes the user interface of the dialog."""
+        layout = QVBoxLayout(self)
+
+        self.table = QTableWidget()
+        self.table.setColumnCount(len(DASHBOARD_COLUMNS))
+        self.table.setHorizontalHeaderLabels(DASHBOARD_COLUMNS)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setAlternatingRowColors(True)
+        self.table.horizontalHeader().setSectionResizeMode(6, QHeaderView.ResizeMode.Stretch)
+        self.table.cellDoubleClicked.connect(self._open_logs)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        self.summary_label = QLabel("Waiting for the first update...")
+        button_layout.addWidget(self.summary_label)
+        button_layout.addStretch()
+        refresh_button = QPushButton("Refresh Now")
+        refresh_button.clicked.connect(self.watch_service.wake)
+        button_layout.addWidget(refresh_button)
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+    def _on_jobs_updated(self, statuses: List[JobLogStatus]):
+        """Reloads the table from the latest watch results."""
+        self.table.setRowCount(len(statuses))
+        for row, status in enumerate(statuses):
+            output = status.output
+            values = [
+                status.job_id,
+                status.name,
+                status.project_name,
+                status.status,
+                format_size(output.size) if output else "-",
+                datetime.fromtimestamp(output.mtime).strftime("%H:%M:%S") if output else "-",
+                status.output_tail,
+                status.error_tail,
+            ]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col == 0:
+                    item.setData(Qt.ItemDataRole.UserRole, status.project_name)
+                if col == 4:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                if col == 7 and value:
+                    item.setForeground(QColor(COLOR_RED))
+                self.table.setItem(row, col, item)
+            if output:
+                self.table.item(row, 6).setToolTip(output.path)
+        now = datetime.now().strftime("%H:%M:%S")
+        self.summary_label.setText(f"{len(statuses)} running job(s), updated {now}")
+
+    def _open_logs(self, row: int, column: int):
+        item = self.table.item(row, 0)
+        if item is None:
+            return
+        self.event_bus.emit(
+            Events.VIEW_LOGS,
+            data={"project_name": item.data(Qt.ItemDataRole.UserRole), "job_id": item.text()},
+            source="LogDashboardDialog",
+        )
+
+    def showEvent(self, event):
+        """Starts tracking the running jobs while the dashboard is visible."""
+        self.watch_service.track_jobs(True)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        """Stops tracking when the dashboard is hidden or closed."""
+        self.watch_service.track_jobs(False)
+        super().hideEvent(event)
@@ -1,5 +1,6 @@
 import os
-import re
+from fnmatch import fnmatchcase
+from typing import List, Optional
 from PyQt6.QtWidgets import (
     QDialog,
     QVBoxLayout,
@@ -9,42 +10,858 @@ from PyQt6.QtWidgets import (
     QPushButton,
     QHBoxLayout,
     QLabel,
+    QCheckBox,
+    QTableView,
+    QHeaderView,
+    QAbstractItemView,
+    QStackedWidget,
+    QLineEdit,
+    QListWidget,
+    QListWidgetItem,
+    QSplitter,
+    QTextEdit,
+    QComboBox,
 )
-from PyQt6.QtCore import QTimer, Qt
-from PyQt6.QtGui import QFont
+from pathlib import Path
+from PyQt6.QtCore import QSettings, QThread, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QTextCursor
 from models.project_model import Job
+from core.log_cache import LogSpool, acquire_log_spool, prune_log_cache
+from core.log_follower import LogFollower
+from core.log_paths import GLOB_CACHE_TTL_S, LogFileInfo, get_log_path_resolver
+from core.log_reader import LogBlockReader, LogRangeReader
+from core.log_search import GREP_MAX_MATCHES, LogSearchWorker
+from core.log_watch import get_log_watch_service
+from core.log_stream import LogChunkProcessor
 from core.slurm_api import SlurmAPI
 from core.style import AppStyles
-from core.defaults import STATUS_RUNNING, STATUS_COMPLETING
+from core.defaults import STATUS_RUNNING, STATUS_COMPLETING, COLOR_DARK_BG_HOVER, COLOR_GRAY
+from models.log_lines_model import LogLinesModel
+from utils import settings_path
+
+# Large logs are opened at the tail: only this many bytes are loaded at first
+INITIAL_TAIL_BYTES = 512 * 1024
+# Bytes read around a search result (and per "Earlier"/"Later" step) in the excerpt view
+EXCERPT_BYTES = 64 * 1024
+
+
+def format_size(size: int) -> str:
+    """Human readable byte size."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class LogExcerptView(QWidget):
+    """
+    Window of a remote log around a byte offset, extendable in both directions.
+    Each block is read in a LogBlockReader, one at a time.
+    """
+
+    back_requested = pyqtSignal()
+
+    def __init__(self, font: QFont, parent=None):
+        super().__init__(parent)
+        self.path = ""
+        self.start = 0          # First byte shown
+        self.end = 0            # Byte after the last one shown
+        self.first_line = 1     # Line number of the first line shown
+        self.line_count = 0
+        self.target_line = 0
+        self.reader: Optional[LogBlockReader] = None
+        self._request = None    # (handler, requested start, requested end) of the running read
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        header = QHBoxLayout()
+        self.label = QLabel()
+        header.addWidget(self.label)
+        header.addStretch()
+        self.earlier_button = QPushButton("Earlier")
+        self.earlier_button.clicked.connect(self.load_earlier)
+        header.addWidget(self.earlier_button)
+        self.later_button = QPushButton("Later")
+        self.later_button.clicked.connect(self.load_later)
+        header.addWidget(self.later_button)
+        back_button = QPushButton("Back to Log")
+        back_button.clicked.connect(self.back_requested)
+        header.addWidget(back_button)
+        layout.addLayout(header)
+
+        self.view = QPlainTextEdit()
+        self.view.setReadOnly(True)
+        self.view.setFont(font)
+        self.view.setUndoRedoEnabled(False)
+        self.view.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        layout.addWidget(self.view)
+
+    def show_around(self, path: str, offset: int, line_no: int):
+        """Loads the lines around ``offset`` (the start of line ``line_no``) and highlights it."""
+        self.stop_reader()
+        self.path = path
+        self.target_line = line_no
+        self.label.setText(f"Loading line {line_no} of {path}...")
+        self.view.clear()
+        self.earlier_button.setEnabled(False)
+        self.later_button.setEnabled(False)
+        self._read(
+            lambda data, start: self._show_block(data, start, offset, line_no),
+            max(0, offset - EXCERPT_BYTES // 2),
+            offset + EXCERPT_BYTES // 2,
+        )
+
+    def _show_block(self, data: Optional[bytes], start: int, offset: int, line_no: int):
+        if data is None:
+            self.view.setPlainText(f"Could not read {self.path} around byte {offset}.")
+            return
+        self.start = start
+        self.end = start + len(data)
+        self.first_line = line_no - data.count(b"\n", 0, max(0, offset - start))
+        lines = self._to_lines(data)
+        self.line_count = len(lines)
+        self.view.setPlainText("\n".join(lines))
+        self.later_button.setEnabled(True)
+        self._highlight_target()
+
+    def load_earlier(self):
+        if self.start <= 0 or self.reader is not None:
+            return
+        self._read(self._prepend_block, max(0, self.start - EXCERPT_BYTES), self.start)
+
+    def _prepend_block(self, data: Optional[bytes], start: int):
+        if not data:
+            return
+        lines = self._to_lines(data)
+        cursor = QTextCursor(self.view.document())
+        cursor.movePosition(QTextCursor.MoveOperation.Start)
+        cursor.insertText("\n".join(lines) + "\n")
+        self.start = start
+        self.first_line -= len(lines)
+        self.line_count += len(lines)
+        self._highlight_target()
+
+    def load_later(self):
+        if self.reader is not None:
+            return
+        self._read(self._append_block, self.end, self.end + EXCERPT_BYTES)
+
+    def _append_block(self, data: Optional[bytes], start: int):
+        if not data or start != self.end:
+            return
+        lines = self._to_lines(data)
+        cursor = QTextCursor(self.view.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText("\n" + "\n".join(lines))
+        self.end += len(data)
+        self.line_count += len(lines)
+        self._update_label()
+
+    def _read(self, handler, start: int, end: int):
+        """Reads [start, end) in a LogBlockReader; ``handler(data, start)`` gets the whole lines (None on error)."""
+        # Read one byte earlier to know whether ``start`` already begins a line
+        read_from = max(0, start - 1)
+        self._request = (handler, start, end)
+        self.reader = LogBlockReader(self.path, read_from, end - read_from, self)
+        self.reader.block_ready.connect(self._on_block_read)
+        self.reader.read_failed.connect(self._on_read_failed)
+        self.reader.finished.connect(self._on_read_finished)
+        self.reader.finished.connect(self.reader.deleteLater)
+        self.reader.start()
+
+    def stop_reader(self):
+        if self.reader is None:
+            return
+        reader, self.reader = self.reader, None
+        reader.stop()
+
+    def _on_block_read(self, data: bytes, read_from: int):
+        if self.sender() is not self.reader:
+            return
+        handler, start, end = self._request
+        handler(*self._whole_lines(data, read_from, end))
+
+    def _on_read_failed(self, message: str):
+        if self.sender() is not self.reader:
+            return
+        handler, start, _ = self._request
+        handler(None, start)
+
+    def _on_read_finished(self):
+        if self.sender() is self.reader:
+            self.reader = None
+
+    @staticmethod
+    def _whole_lines(data: bytes, read_from: int, end: int):
+        """Narrows a block read from ``read_from`` to whole lines; returns (data, actual start)."""
+        start = read_from
+        if read_from > 0:
+            newline = data.find(b"\n")
+            if newline == -1:
+                return b"", end
+            data = data[newline + 1:]
+            start += newline + 1
+        if len(data) + (start - read_from) == end - read_from:
+            # Not at the end of the file: drop the partial last line
+            data = data[: data.rfind(b"\n") + 1]
+        return data, start
+
+    @staticmethod
+    def _to_lines(data: bytes) -> List[str]:
+        lines, rest = LogChunkProcessor().feed(data, final=True)
+        if rest:
+            lines.append(rest)
+        return lines
+
+    def _highlight_target(self):
+        block = self.view.document().findBlockByNumber(self.target_line - self.first_line)
+        selection = QTextEdit.ExtraSelection()
+        selection.cursor = QTextCursor(block)
+        selection.format.setBackground(QColor(COLOR_DARK_BG_HOVER))
+        selection.format.setProperty(selection.format.Property.FullWidthSelection, True)
+        self.view.setExtraSelections([selection])
+        self.view.setTextCursor(QTextCursor(block))
+        self.view.centerCursor()
+        self._update_label()
+
+    def _update_label(self):
+        last_line = self.first_line + self.line_count - 1
+        self.label.setText(
+            f"Lines {self.first_line}-{last_line} of {self.path} (match on line {self.target_line})"
+        )
+        self.earlier_button.setEnabled(self.start > 0)
+
+
+class LogPane(QWidget):
+    """
+    Incrementally updated view of one remote log file.
+
+    Keeps the byte offset already read, fetches only the new range on refresh
+    (in a LogRangeReader thread) and appends it chunk by chunk; the last
+    (unterminated) line is provisional and replaced on the next update. Large
+    files are opened at the tail, earlier parts can be loaded on demand.
+
+    With the disk cache enabled the whole file is spooled in the background to
+    a local LogSpool and shown through a table view with fixed row heights that
+    only reads the visible lines, so memory stays flat for multi-GB logs and
+    reopening resumes from the cached offset. A file shown by two panes is
+    spooled by the first one only; the other keeps the in-memory view.
+
+    The search bar greps the file on the cluster; only the matching lines come
+    back, and results outside the loaded range open in a LogExcerptView.
+
+    In follow mode new output is pushed by a LogFollower ('tail -F' channel)
+    and refresh() does nothing; if the channel fails the pane falls back to
+    polling.
+    """
+
+    def __init__(self, not_defined_msg: str, font: QFont, parent=None):
+        super().__init__(parent)
+        self.slurm_api = SlurmAPI()
+        self.not_defined_msg = not_defined_msg
+        self.path = ""
+        self.processor = LogChunkProcessor()
+        self.offset = -1         # Next byte to read (-1: not opened yet)
+        self.head_offset = 0     # First byte shown in the view
+        self.file_size = 0
+        self.inode: Optional[int] = None  # Identity of the file the content was read from
+        self.follow_enabled = False
+        self.follower: Optional[LogFollower] = None
+        self.spool_enabled = False
+        self.spool: Optional[LogSpool] = None
+        self.reader: Optional[LogRangeReader] = None
+        self._read_started = False
+        self._refresh_pending = False
+        self._pending_info: Optional[LogFileInfo] = None
+        self.search_worker: Optional[LogSearchWorker] = None
+        self._last_result_line = 0
+        self.earlier_reader: Optional[LogBlockReader] = None
+        self._earlier_end = 0  # head_offset the running "Load Earlier" read ends at
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        search_layout = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search this log on the cluster (grep)...")
+        self.search_input.returnPressed.connect(self.search)
+        search_layout.addWidget(self.search_input)
+        self.regex_checkbox = QCheckBox("Regex")
+        search_layout.addWidget(self.regex_checkbox)
+        self.case_checkbox = QCheckBox("Match case")
+        search_layout.addWidget(self.case_checkbox)
+        search_button = QPushButton("Search")
+        search_button.clicked.connect(self.search)
+        search_layout.addWidget(search_button)
+        self.search_status = QLabel()
+        search_layout.addWidget(self.search_status)
+        layout.addLayout(search_layout)
+
+        self.info_bar = QWidget()
+        info_layout = QHBoxLayout(self.info_bar)
+        info_layout.setContentsMargins(0, 0, 0, 0)
+        self.info_label = QLabel()
+        info_layout.addWidget(self.info_label)
+        info_layout.addStretch()
+        self.load_earlier_button = QPushButton("Load Earlier")
+        self.load_earlier_button.clicked.connect(self.load_earlier)
+        info_layout.addWidget(self.load_earlier_button)
+        self.info_bar.hide()
+        layout.addWidget(self.info_bar)
+
+        self.stack = QStackedWidget()
+        self.view = QPlainTextEdit()
+        self.view.setReadOnly(True)
+        self.view.setFont(font)
+        self.view.setUndoRedoEnabled(False)
+        self.stack.addWidget(self.view)
+
+        # A single-column table rather than a QListView: with fixed row heights
+        # it never lays out rows outside the viewport
+        self.lines_model = LogLinesModel(self)
+        self.lines_view = QTableView()
+        self.lines_view.setFont(font)
+        self.lines_view.setModel(self.lines_model)
+        self.lines_view.setShowGrid(False)
+        self.lines_view.setWordWrap(False)
+        self.lines_view.setTextElideMode(Qt.TextElideMode.ElideNone)
+        self.lines_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.lines_view.setHorizontalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.lines_view.horizontalHeader().hide()
+        self.lines_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.lines_view.horizontalHeader().setMinimumSectionSize(0)
+        vertical_header = self.lines_view.verticalHeader()
+        vertical_header.hide()
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(QFontMetrics(font).height() + 2)
+        self._char_width = QFontMetrics(font).horizontalAdvance("M")
+        self._longest_line = 0
+        self.stack.addWidget(self.lines_view)
+
+        self.excerpt = LogExcerptView(font)
+        self.excerpt.back_requested.connect(self._show_content)
+        self.stack.addWidget(self.excerpt)
+
+        self.results_list = QListWidget()
+        self.results_list.setFont(font)
+        self.results_list.itemActivated.connect(self._jump_to_result)
+        self.results_list.hide()
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        splitter.addWidget(self.stack)
+        splitter.addWidget(self.results_list)
+        splitter.setStretchFactor(0, 3)
+        splitter.setStretchFactor(1, 1)
+        layout.addWidget(splitter)
+
+    def set_path(self, path: str, info: Optional[LogFileInfo] = None):
+        """Sets the remote file to follow and loads it from the tail (or the disk cache)."""
+        self.close_spool()
+        self.stop_search()
+        self.results_list.clear()
+        self.results_list.hide()
+        self.search_status.clear()
+        self.path = path
+        self._reset()
+        if self.spool_enabled and path:
+            self._open_spool()
+        self.refresh(info)
+
+    def set_spooled(self, enabled: bool):
+        """Switches between the in-memory view and the disk cache, reopening the file."""
+        if enabled == self.spool_enabled:
+            return
+        self.spool_enabled = enabled
+        self.set_path(self.path)
+
+    def _open_spool(self):
+        host = self.slurm_api._config.host or ""
+        self.spool = acquire_log_spool(f"{host}:{self.path}")
+        if self.spool is None:
+            # Another pane spools this file; stay with the in-memory view
+            return
+        self.processor.restore(self.spool.carry)
+        self.offset = self.spool.remote_offset
+        self.inode = self.spool.inode
+        self.lines_model.set_spool(self.spool, self.processor.provisional_line())
+        self._longest_line = 0
+        self._fit_column([self.processor.provisional_line()])
+        self.stack.setCurrentWidget(self.lines_view)
+
+    def close_spool(self):
+        if self.spool is None:
+            return
+        self.lines_model.set_spool(None)
+        self.spool.close()
+        self.spool = None
+
+    def _reset(self):
+        self.stop_follow()
+        self.stop_reader()
+        self.stop_load_earlier()
+        self.excerpt.stop_reader()
+        self._clear_state()
+
+    def _clear_state(self):
+        self.processor.reset()
+        self.offset = -1
+        self.head_offset = 0
+        self.file_size = 0
+        self.inode = None
+        self._clear_content()
+
+    def _clear_content(self):
+        self.view.clear()
+        self.info_bar.hide()
+        if self.spool is not None:
+            self.spool.clear()
+            self.lines_model.set_spool(self.spool)
+
+    def _show_message(self, message: str):
+        self.view.setPlainText(message)
+        self.stack.setCurrentWidget(self.view)
+
+    def refresh(self, info: Optional[LogFileInfo] = None):
+        """
+        Reads and appends whatever was written since the last refresh. ``info``
+        is a stat result obtained by the caller (e.g. batched for several files),
+        which saves the stat: content is only fetched when the size or inode
+        changed. A new inode or a shrunk file starts over; a changed mtime alone
+        (e.g. 'touch') does not, as appends always grow the file.
+        The read runs in a LogRangeReader, which stats the file itself without
+        ``info`` and also starts over when the inode differs from the one the
+        content (or the disk cache) was read from. A refresh requested meanwhile
+        is applied once it finished.
+        """
+        if not self.path:
+            self._show_message(self.not_defined_msg)
+            return
+        if self.follower is not None:
+            return
+        if self.reader is not None:
+            self._refresh_pending = True
+            self._pending_info = info
+            return
+
+        if info is not None and info.size >= 0:
+            same_file = info.inode is None or self.inode is None or info.inode == self.inode
+            if same_file and info.size == self.offset == self.file_size:
+                self.inode = info.inode if info.inode is not None else self.inode
+                return
+        self._start_reader(info)
+
+    def _start_reader(self, info: Optional[LogFileInfo]):
+        tail_bytes = 0 if self.spool is not None else INITIAL_TAIL_BYTES
+        self._read_started = False
+        self.reader = LogRangeReader(self.path, self.offset, info, self.inode, tail_bytes, self)
+        self.reader.range_started.connect(self._on_range_started)
+        self.reader.chunk_ready.connect(self._on_read_chunk)
+        self.reader.read_failed.connect(self._on_read_failed)
+        self.reader.finished.connect(self._on_read_finished)
+        self.reader.finished.connect(self.reader.deleteLater)
+        self.reader.start()
+
+    def stop_reader(self):
+        self._refresh_pending = False
+        self._pending_info = None
+        if self.reader is None:
+            return
+        reader, self.reader = self.reader, None
+        reader.stop()
+
+    def _on_range_started(self, start: int, info: LogFileInfo, restarted: bool):
+        if self.sender() is not self.reader:
+            return
+        self._read_started = True
+        if restarted:
+            # The file was truncated or replaced: start over (this clears the disk cache too)
+            self._clear_state()
+        if self.offset < 0:
+            self.head_offset = start
+        self.offset = start
+        self.file_size = info.size
+        self.inode = info.inode if info.inode is not None else self.inode
+        if self.spool is not None and self.spool.inode != self.inode:
+            # Record the file the cache is filled from, even before its first line
+            pending, carry = self.processor.checkpoint()
+            self.spool.save(self.offset - pending, carry, self.inode)
+        if self.spool is not None and self.stack.currentWidget() is self.view:
+            self.stack.setCurrentWidget(self.lines_view)
+        self._update_info()
+
+    def _on_read_chunk(self, data: bytes):
+        # Chunks still queued from a stopped reader are re-read by the next refresh
+        if self.sender() is not self.reader:
+            return
+        self.offset += len(data)
+        completed, provisional = self.processor.feed(data)
+        self._append(completed, provisional)
+        self._update_info()
+        self.reader.ack()
+
+    def _on_read_failed(self, message: str):
+        if self.sender() is not self.reader or self._read_started:
+            # Errors while reading an opened range are retried by the next refresh
+            return
+        # Keep the disk cache over transient errors; it is validated on the next refresh
+        if self.spool is None:
+            self._clear_state()
+        self._show_message(f"Could not load log file:\n{self.path}\n\nError:\n{message}")
+
+    def _on_read_finished(self):
+        if self.sender() is not self.reader:
+            return
+        self.reader = None
+        self._update_info()
+        if self._refresh_pending:
+            info = self._pending_info
+            self._refresh_pending, self._pending_info = False, None
+            self.refresh(info)
+        elif self.follow_enabled:
+            self._start_follow()
+
+    def _show_content(self):
+        self.stack.setCurrentWidget(self.lines_view if self.spool is not None else self.view)
+
+    # --- Search --------------------------------------------------------------
+
+    def search(self):
+        """Greps the log on the cluster; results stream into the list below the view."""
+        self.stop_search()
+        self.results_list.clear()
+        self._last_result_line = 0
+        pattern = self.search_input.text()
+        if not pattern or not self.path:
+            self.results_list.hide()
+            self.search_status.clear()
+            return
+        self.search_status.setText("Searching...")
+        self.results_list.show()
+        self.search_worker = LogSearchWorker(
+            self.path,
+            pattern,
+            regex=self.regex_checkbox.isChecked(),
+            ignore_case=not self.case_checkbox.isChecked(),
+            parent=self,
+        )
+        self.search_worker.results_ready.connect(self._on_search_results)
+        self.search_worker.search_finished.connect(self._on_search_finished)
+        self.search_worker.search_failed.connect(self._on_search_failed)
+        self.search_worker.finished.connect(self._on_search_thread_finished)
+        self.search_worker.finished.connect(self.search_worker.deleteLater)
+        self.search_worker.start()
+
+    def stop_search(self):
+        if self.search_worker is None:
+            return
+        worker, self.search_worker = self.search_worker, None
+        worker.stop()
+
+    def _on_search_results(self, results):
+        if self.sender() is not self.search_worker:
+            return
+        context_color = QColor(COLOR_GRAY)
+        for result in results:
+            if self._last_result_line and result.line_no > self._last_result_line + 1:
+                self.results_list.addItem("...")
+            self._last_result_line = result.line_no
+            item = QListWidgetItem(f"{result.line_no:>8}{':' if result.is_match else ' '} {result.text}")
+            item.setData(Qt.ItemDataRole.UserRole, (result.line_no, result.offset))
+            if not result.is_match:
+                item.setForeground(context_color)
+            self.results_list.addItem(item)
+
+    def _on_search_finished(self, total: int, truncated: bool):
+        if self.sender() is not self.search_worker:
+            return
+        self.search_worker = None
+        text = f"{total} match{'es' if total != 1 else ''}"
+        if truncated:
+            text += f" (first {GREP_MAX_MATCHES} listed)"
+        self.search_status.setText(text)
+
+    def _on_search_failed(self, message: str):
+        if self.sender() is not self.search_worker:
+            return
+        self.search_worker = None
+        self.search_status.setText("Search failed")
+        self.search_status.setToolTip(message)
+
+    def _on_search_thread_finished(self):
+        if self.sender() is self.search_worker:
+            # Ended without reporting (an unexpected error); the worker is deleted
+            self.search_worker = None
+            self.search_status.setText("Search failed")
+
+    def _jump_to_result(self, item: QListWidgetItem):
+        location = item.data(Qt.ItemDataRole.UserRole)
+        if location:
+            self.jump_to(*location)
+
+    def jump_to(self, line_no: int, offset: int):
+        """Shows line ``line_no`` (starting at byte ``offset``), in the view if it is loaded."""
+        if self.spool is not None and line_no <= self.spool.line_count:
+            index = self.lines_model.index(line_no - 1)
+            self.stack.setCurrentWidget(self.lines_view)
+            self.lines_view.scrollTo(index, QAbstractItemView.ScrollHint.PositionAtCenter)
+            self.lines_view.selectRow(index.row())
+            return
+        if self.spool is None and self.head_offset == 0 and offset < self.offset:
+            # The whole file is loaded, so block numbers are line numbers
+            block = self.view.document().findBlockByNumber(line_no - 1)
+            if block.isValid():
+                cursor = QTextCursor(block)
+                cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock, QTextCursor.MoveMode.KeepAnchor)
+                self.stack.setCurrentWidget(self.view)
+                self.view.setTextCursor(cursor)
+                self.view.centerCursor()
+                return
+        self.excerpt.show_around(self.path, offset, line_no)
+        self.stack.setCurrentWidget(self.excerpt)
+
+    def set_follow(self, enabled: bool):
+        """Switches between live follow and polling with refresh()."""
+        self.follow_enabled = enabled
+        if enabled:
+            self.refresh()
+        else:
+            self.stop_follow()
+
+    def _start_follow(self):
+        """Continues from the current offset over a persistent 'tail -F' channel."""
+        if self.follower is not None or self.offset < 0:
+            return
+        self.follower = LogFollower(self.path, self.offset, self)
+        self.follower.chunk_ready.connect(self._on_follow_chunk)
+        self.follower.file_reset.connect(self._on_follow_reset)
+        self.follower.follow_failed.connect(self._on_follow_failed)
+        self.follower.finished.connect(self._on_follow_finished)
+        self.follower.finished.connect(self.follower.deleteLater)
+        self.follower.start()
+
+    def stop_follow(self):
+        if self.follower is None:
+            return
+        follower, self.follower = self.follower, None
+        follower.stop()
+
+    def _on_follow_chunk(self, data: bytes):
+        # Chunks still queued from a stopped follower are re-read by the next refresh
+        if self.sender() is not self.follower:
+            return
+        self.offset += len(data)
+        self.file_size = max(self.file_size, self.offset)
+        completed, provisional = self.processor.feed(data)
+        self._append(completed, provisional)
+        self._update_info()
+        self.follower.ack()
+
+    def _on_follow_reset(self):
+        """The file was truncated or replaced; tail restarts from its beginning."""
+        if self.sender() is not self.follower:
+            return
+        self._clear_state()
+        self.offset = 0
+
+    def _on_follow_failed(self, message: str):
+        if self.sender() is not self.follower:
+            return
+        print(f"Log follow for '{self.path}' stopped, falling back to polling: {message}")
+        self.follow_enabled = False
+        self.stop_follow()
+
+    def _on_follow_finished(self):
+        if self.sender() is self.follower:
+            # Ended without reporting (an unexpected error); poll from now on
+            self.follow_enabled = False
+            self.follower = None
+
+    def _append(self, completed: List[str], provisional: str):
+        """Replaces the provisional last block with the completed lines and the new provisional line."""
+        if self.spool is not None:
+            self._append_spooled(completed, provisional)
+            return
+        scrollbar = self.view.verticalScrollBar()
+        at_bottom = scrollbar.value() == scrollbar.maximum()
+
+        cursor = QTextCursor(self.view.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.movePosition(QTextCursor.MoveOperation.StartOfBlock, QTextCursor.MoveMode.KeepAnchor)
+        cursor.insertText("\n".join(completed + [provisional]))
+
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def _append_spooled(self, completed: List[str], provisional: str):
+        scrollbar = self.lines_view.verticalScrollBar()
+        at_bottom = scrollbar.value() == scrollbar.maximum()
+        self.lines_model.append(completed, provisional)
+        self._fit_column(completed + [provisional])
+        pending, carry = self.processor.checkpoint()
+        self.spool.save(self.offset - pending, carry, self.inode)
+        if at_bottom:
+            self.lines_view.scrollToBottom()
+
+    def _fit_column(self, lines: List[str]):
+        """Widens the column for the longest line so far (monospace: width follows length)."""
+        longest = max(map(len, lines), default=0)
+        if longest > self._longest_line or self._longest_line == 0:
+            self._longest_line = max(longest, self._longest_line)
+            self.lines_view.setColumnWidth(0, (self._longest_line + 2) * self._char_width)
+
+    def load_earlier(self):
+        """Prepends the chunk of the file before the first loaded byte (read in a LogBlockReader)."""
+        if self.head_offset <= 0 or self.earlier_reader is not None:
+            return
+        start = max(0, self.head_offset - INITIAL_TAIL_BYTES)
+        # As in LogRangeReader._tail_start, read one byte earlier so a chunk never starts mid-line
+        read_from = max(0, start - 1)
+        self._earlier_end = self.head_offset
+        self.earlier_reader = LogBlockReader(self.path, read_from, self.head_offset - read_from, self)
+        self.earlier_reader.block_ready.connect(self._on_earlier_read)
+        self.earlier_reader.finished.connect(self._on_earlier_finished)
+        self.earlier_reader.finished.connect(self.earlier_reader.deleteLater)
+        self.load_earlier_button.setEnabled(False)
+        self.earlier_reader.start()
+
+    def stop_load_earlier(self):
+        if self.earlier_reader is None:
+            return
+        reader, self.earlier_reader = self.earlier_reader, None
+        reader.stop()
+        self.load_earlier_button.setEnabled(True)
+
+    def _on_earlier_finished(self):
+        if self.sender() is self.earlier_reader:
+            self.earlier_reader = None
+            self.load_earlier_button.setEnabled(True)
+
+    def _on_earlier_read(self, data: bytes, read_from: int):
+        # Dropped if the view started over (truncated file) in the meantime
+        if self.sender() is not self.earlier_reader or self._earlier_end != self.head_offset:
+            return
+        start = read_from
+        if read_from > 0:
+            newline = data.find(b"\n")
+            if newline != -1:
+                data = data[newline + 1:]
+                start += newline + 1
+
+        processor = LogChunkProcessor()
+        lines, rest = processor.feed(data, final=True)
+        if rest:
+            lines.append(rest)
+
+        scrollbar = self.view.verticalScrollBar()
+        old_value = scrollbar.value()
+        cursor = QTextCursor(self.view.document())
+        cursor.movePosition(QTextCursor.MoveOperation.Start)
+        cursor.insertText("\n".join(lines) + "\n")
+        scrollbar.setValue(old_value + len(lines))
+
+        self.head_offset = start
+        self._update_info()
+
+    def _update_info(self):
+        if self.spool is not None and 0 <= self.offset < self.file_size:
+            self.info_label.setText(
+                f"Caching to disk: {format_size(self.offset)} of {format_size(self.file_size)}"
+            )
+            self.load_earlier_button.hide()
+            self.info_bar.show()
+        elif self.head_offset > 0:
+            self.info_label.setText(
+                f"Showing the last {format_size(self.file_size - self.head_offset)} "
+                f"of {format_size(self.file_size)}"
+            )
+            self.load_earlier_button.show()
+            self.info_bar.show()
+        else:
+            self.info_bar.hide()
+
+
+class TaskLogResolveWorker(QThread):
+    """Resolves the error/output log files of a job (a remote glob stat) off the GUI thread."""
+
+    resolved = pyqtSignal(list, list)  # error and output LogFileInfo lists
+
+    def __init__(self, job: Job, max_age: float, parent=None):
+        super().__init__(parent)
+        self.job = job
+        self.max_age = max_age
+
+    def run(self):
+        resolver = get_log_path_resolver()
+        try:
+            errors = resolver.resolve(self.job, self.job.error_file, self.max_age)
+            outputs = resolver.resolve(self.job, self.job.output_file, self.max_age)
+        except Exception as e:
+            print(f"Could not resolve the logs of job {self.job.id}: {e}")
+            return
+        self.resolved.emit(errors, outputs)
 
 
 class LogViewerDialog(QDialog):
     """
     A dialog for viewing job logs, including the submission script,
-    standard output, and standard error. Features auto-refresh for running jobs.
+    standard output, and standard error. Output of running jobs is followed
+    live over 'tail -F' channels; otherwise the shared LogWatchService polls
+    them together with the files of every other open viewer. Log paths are
+    resolved from the sbatch filename patterns in a TaskLogResolveWorker and
+    the panes read in their own threads, so no remote call blocks the dialog.
+    Array jobs get a task selector.
     """
 
     def __init__(self, job: Job, parent=None):
         super().__init__(parent)
         self.job = job
         self.slurm_api = SlurmAPI()
+        self.resolver = get_log_path_resolver()
+        self._task_logs = {}  # task id (None for regular jobs) -> (error path, output path)
+        self.resolve_worker: Optional[TaskLogResolveWorker] = None
+        self._resolve_pending = False
+        self.watch_service = get_log_watch_service()
+        self._watched: List[str] = []
 
         self.setWindowTitle(f"Logs for Job: {self.job.name} ({self.job.id})")
         self.setMinimumSize(800, 600)
         self.setStyleSheet(AppStyles.get_complete_stylesheet())
 
+        self.settings = QSettings(str(Path(settings_path)), QSettings.Format.IniFormat)
+
         self._setup_ui()
+        self._load_spool_setting()
         self._load_initial_data()
 
-        # Setup a timer to refresh logs if the job is in a running state.
+        # Follow the logs if the job is in a running state. The watch service
+        # only updates panes that are not followed (disabled or failed channel).
         if self.job.status in [STATUS_RUNNING, STATUS_COMPLETING]:
-            self.timer = QTimer(self)
-            self.timer.timeout.connect(self._update_logs)
-            self.timer.start(5000)  # Refresh every 5 seconds
+            self.follow_checkbox.show()
+            self._set_follow(True)
+            self._watched = [
+                self.resolver.watch_pattern(self.job, self.job.error_file),
+                self.resolver.watch_pattern(self.job, self.job.output_file),
+            ]
+            self.watch_service.files_changed.connect(self._on_files_changed)
+            self.watch_service.watch(self._watched)
 
     def _setup_ui(self):
         """Initializes the user interface of the dialog."""
         layout = QVBoxLayout(self)
+
+        # Array task selector (array jobs only)
+        self.task_bar = QWidget()
+        task_layout = QHBoxLayout(self.task_bar)
+        task_layout.setContentsMargins(0, 0, 0, 0)
+        task_layout.addWidget(QLabel("Array task:"))
+        self.task_combo = QComboBox()
+        self.task_combo.setMinimumWidth(120)
+        self.task_combo.currentIndexChanged.connect(self._on_task_changed)
+        task_layout.addWidget(self.task_combo)
+        task_layout.addStretch()
+        self.task_bar.hide()
+        layout.addWidget(self.task_bar)
+
         self.tab_widget = QTabWidget()
         layout.addWidget(self.tab_widget)
 
@@ -63,36 +880,88 @@ class LogViewerDialog(QDialog):
         # Tab 2: Error Log
         error_tab = QWidget()
         error_layout = QVBoxLayout(error_tab)
-        self.error_view = QPlainTextEdit()
-        self.error_view.setReadOnly(True)
-        self.error_view.setFont(log_font)
-        error_layout.addWidget(self.error_view)
+        self.error_pane = LogPane("No error log file defined or found for this job.", log_font)
+        error_layout.addWidget(self.error_pane)
         self.tab_widget.addTab(error_tab, "Error Log")
 
         # Tab 3: Output Log
         output_tab = QWidget()
         output_layout = QVBoxLayout(output_tab)
-        self.output_view = QPlainTextEdit()
-        self.output_view.setReadOnly(True)
-        self.output_view.setFont(log_font)
-        output_layout.addWidget(self.output_view)
+        self.output_pane = LogPane("No output log file defined or found for this job.", log_font)
+        output_layout.addWidget(self.output_pane)
         self.tab_widget.addTab(output_tab, "Output Log")
 
-        # Close button
+        # Follow toggle and close button
         button_layout = QHBoxLayout()
+        self.follow_checkbox = QCheckBox("Follow")
+        self.follow_checkbox.setToolTip("Stream new output as it is written")
+        self.follow_checkbox.toggled.connect(self._set_follow)
+        self.follow_checkbox.hide()
+        button_layout.addWidget(self.follow_checkbox)
+        self.spool_checkbox = QCheckBox("Disk cache")
+        self.spool_checkbox.setToolTip(
+            "Spool logs to a local cache file and render only the visible lines (for very large logs)"
+        )
+        self.spool_checkbox.toggled.connect(self._set_spooled)
+        button_layout.addWidget(self.spool_checkbox)
         button_layout.addStretch()
         close_button = QPushButton("Close")
         close_button.clicked.connect(self.accept)
         button_layout.addWidget(close_button)
         layout.addLayout(button_layout)
 
-    def _resolve_log_path(self, log_path_template: str) -> str:
-        """Replaces SLURM filename patterns (%A, %a) with job ID."""
-        if not log_path_template or not self.job.id:
-            return ""
-        # Basic replacement for job ID. A more advanced implementation
-        # could handle more SLURM filename patterns.
-        return log_path_template.replace("%A", str(self.job.id))
+    def _resolve_task_logs(self, max_age: float = GLOB_CACHE_TTL_S):
+        """Resolves the error/output files per array task (a single entry for regular jobs) in a worker."""
+        if self.resolve_worker is not None:
+            # New files appeared during the resolution: list them again afterwards
+            self._resolve_pending = True
+            return
+        self.resolve_worker = TaskLogResolveWorker(self.job, max_age, self)
+        self.resolve_worker.resolved.connect(self._on_task_logs_resolved)
+        self.resolve_worker.finished.connect(self._on_resolve_finished)
+        self.resolve_worker.finished.connect(self.resolve_worker.deleteLater)
+        self.resolve_worker.start()
+
+    def _on_task_logs_resolved(self, errors: List[LogFileInfo], outputs: List[LogFileInfo]):
+        if self.sender() is not self.resolve_worker:
+            return
+        if not self.job.array:
+            paths = (errors[0].path if errors else "", outputs[0].path if outputs else "")
+            if self._task_logs.get(None) != paths:
+                self._task_logs = {None: paths}
+                self._set_pane_paths(*paths)
+            return
+        for info in errors:
+            self._task_logs[info.task_id] = (info.path, self._task_logs.get(info.task_id, ("", ""))[1])
+        for info in outputs:
+            self._task_logs[info.task_id] = (self._task_logs.get(info.task_id, ("", ""))[0], info.path)
+
+        known = {self.task_combo.itemData(i) for i in range(self.task_combo.count())}
+        for task_id in sorted(self._task_logs, key=lambda t: (t is None, t or 0)):
+            if task_id not in known:
+                # The first task added is selected, which loads it
+                label = str(task_id) if task_id is not None else "other"
+                self.task_combo.addItem(label, task_id)
+        self.task_bar.setVisible(self.task_combo.count() > 0)
+        if self.task_combo.count() == 0:
+            message = "No log files found yet for this array job."
+            self.error_pane._show_message(message)
+            self.output_pane._show_message(message)
+
+    def _on_resolve_finished(self):
+        if self.sender() is not self.resolve_worker:
+            return
+        self.resolve_worker = None
+        if self._resolve_pending:
+            self._resolve_pending = False
+            self._resolve_task_logs(max_age=0)
+
+    def _stop_resolving(self):
+        self._resolve_pending = False
+        if self.resolve_worker is None:
+            return
+        worker, self.resolve_worker = self.resolve_worker, None
+        worker.wait()
 
     def _load_initial_data(self):
         """Loads the initial content for all tabs."""
@@ -100,77 +969,82 @@ class LogViewerDialog(QDialog):
         script_content = self.job.create_sbatch_script()
         self.script_view.setPlainText(script_content)
 
-        # Load log files
-        self._update_logs()
+        # Load log files (opened at the tail) once they are resolved
+        self.error_pane._show_message("Looking for the log file...")
+        self.output_pane._show_message("Looking for the log file...")
+        self._resolve_task_logs()
 
-    def _process_log_for_display(self, content: str) -> str:
-        """
-        Processes log content to correctly render progress bars and carriage returns.
-        """
-        if not content:
-            return ""
-
-        # Remove ANSI escape codes
-        ansi_escape = re.compile(r"\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])")
-        content = ansi_escape.sub("", content)
-
-        # Normalize line endings
-        content = content.replace("\r\n", "\n")
-
-        lines = content.split("\n")
-        final_lines = []
-        for line in lines:
-            # The last part of a \r-split line is the final visual state.
-            final_lines.append(line.split("\r")[-1])
-
-        return "\n".join(final_lines)
-
-    
-    def _update_logs(self):
-        """Fetches and displays the latest content of the log files, preserving scroll position if possible."""
-
-        def update_view(view, path, not_defined_msg):
-            if path:
-                content, err = self.slurm_api.read_remote_file(path)
-                if err:
-                    new_text = f"Could not load log file:\n{path}\n\nError:\n{err}"
-                else:
-                    new_text = self._process_log_for_display(content)
-            else:
-                new_text = not_defined_msg
-
-            # Only update if content changed
-            old_text = view.toPlainText()
-            if old_text != new_text:
-                # Save scroll position
-                scrollbar = view.verticalScrollBar()
-                old_value = scrollbar.value()
-                max_value = scrollbar.maximum()
-                at_bottom = old_value == max_value
-
-                view.setPlainText(new_text)
-
-                # Restore scroll position
-                if at_bottom:
-                    scrollbar.setValue(scrollbar.maximum())
-                else:
-                    # Try to restore previous position (may not be perfect if line count changed)
-                    scrollbar.setValue(min(old_value, scrollbar.maximum()))
-
-        # Update error log
-        error_path = self._resolve_log_path(self.job.error_file)
-        update_view(
-            self.error_view, error_path, "Error log path not defined for this job."
-        )
+    def _on_task_changed(self, index: int):
+        if index < 0:
+            return
+        self._set_pane_paths(*self._task_logs.get(self.task_combo.itemData(index), ("", "")))
 
-        # Update output log
-        output_path = self._resolve_log_path(self.job.output_file)
-        update_view(
-            self.output_view, output_path, "Output log path not defined for this job."
-        )
+    def _set_pane_paths(self, error_path: str, output_path: str):
+        # The panes stat the files in their reader threads
+        self.error_pane.set_path(error_path)
+        self.output_pane.set_path(output_path)
+
+    def _on_files_changed(self, changed: dict):
+        """Appends the new content of the shown log files reported as changed."""
+        if self.job.array:
+            known = {path for paths in self._task_logs.values() for path in paths}
+            new = [p for p in changed if p not in known and any(fnmatchcase(p, w) for w in self._watched)]
+            if new:
+                # A task started writing logs since the last resolution
+                self._resolve_task_logs(max_age=0)
+        for pane in (self.error_pane, self.output_pane):
+            if pane.path in changed and pane.follower is None:
+                pane.refresh(changed[pane.path])
+
+    def _load_spool_setting(self):
+        enabled = self.settings.value("LogViewer/spool", False, type=bool)
+        self.spool_checkbox.blockSignals(True)
+        self.spool_checkbox.setChecked(enabled)
+        self.spool_checkbox.blockSignals(False)
+        self.error_pane.spool_enabled = enabled
+        self.output_pane.spool_enabled = enabled
+        if enabled:
+            prune_log_cache()
+
+    def _set_spooled(self, enabled: bool):
+        self.settings.setValue("LogViewer/spool", enabled)
+        if enabled:
+            prune_log_cache()
+        self.error_pane.set_spooled(enabled)
+        self.output_pane.set_spooled(enabled)
+
+    def _set_follow(self, enabled: bool):
+        self.follow_checkbox.blockSignals(True)
+        self.follow_checkbox.setChecked(enabled)
+        self.follow_checkbox.blockSignals(False)
+        self.error_pane.set_follow(enabled)
+        self.output_pane.set_follow(enabled)
+
+    def _stop_updates(self):
+        self._stop_resolving()
+        if self._watched:
+            self.watch_service.unwatch(self._watched)
+            self.watch_service.files_changed.disconnect(self._on_files_changed)
+            self._watched = []
+        self.error_pane.stop_follow()
+        self.output_pane.stop_follow()
+        self.error_pane.stop_reader()
+        self.output_pane.stop_reader()
+        self.error_pane.stop_load_earlier()
+        self.output_pane.stop_load_earlier()
+        self.error_pane.excerpt.stop_reader()
+        self.output_pane.excerpt.stop_reader()
+        self.error_pane.close_spool()
+        self.output_pane.close_spool()
+        self.error_pane.stop_search()
+        self.output_pane.stop_search()
+
+    def done(self, result):
+        """Closes the follow channels whichever way the dialog is dismissed."""
+        self._stop_updates()
+        super().done(result)
 
     def closeEvent(self, event):
-        """Ensures the timer is stopped when the dialog is closed."""
-        if hasattr(self, "timer"):
-            self.timer.stop()
+        """Ensures the watch and follow channels are stopped when the dialog is closed."""
+        self._stop_updates()
         event.accept()
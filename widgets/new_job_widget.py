@@ -7,12 +7,19 @@ from models.project_model import Job
 from core.defaults import *
 from core.style import AppStyles
 from core.slurm_api import ConnectionState, SlurmAPI
+from core.env_discovery import PythonEnvironment, get_environment_discovery
+from models.workflow import descendants
+from models.sweep import (MAX_ARRAY_TASKS, MAX_SWEEP_POINTS, SWEEP_GRID, SWEEP_RANDOM, SWEEP_ZIP, Sweep,
+                          SweepAxis, array_chunks, array_mapping_blocker, render_job, to_array_job)
 import uuid
 import copy
 
-from widgets.remote_directory_widget import RemoteDirectoryDialog
+from widgets.remote_directory_widget import RemoteDirectoryDialog, RemotePathCompleter
 from widgets.toast_widget import show_warning_toast
 
+# Quiet time after the last edit before the script preview is regenerated
+PREVIEW_DEBOUNCE_MS = 200
+
 
 class ConstraintDialog(QDialog):
     def __init__(self, constraints, selected, parent=None):
@@ -46,10 +53,15 @@ class ConstraintDialog(QDialog):
 class JobCreationDialog(QDialog):
     """Dialog for creating a new SLURM job with tabbed interface"""
     
-    def __init__(self, parent=None, project_name=None, job_to_modify=None, cached_job=None):
+    def __init__(self, parent=None, project_name=None, job_to_modify=None, cached_job=None, project_jobs=None):
         super().__init__(parent)
         self.project_name = project_name
         self.job_to_modify = job_to_modify
+        self.project_jobs = project_jobs or []
+        # Part of a split sweep edited by the dialog (see Sweep.tasks)
+        self._sweep_tasks = None
+        if job_to_modify and job_to_modify.sweep:
+            self._sweep_tasks = Sweep.from_dict(job_to_modify.sweep).tasks
         
         if job_to_modify:
             self.setWindowTitle("Modify Job")
@@ -70,6 +82,11 @@ class JobCreationDialog(QDialog):
         # Apply dark theme
         self.setStyleSheet(AppStyles.get_complete_stylesheet(THEME_DARK))
             
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(PREVIEW_DEBOUNCE_MS)
+        self._preview_timer.timeout.connect(self._update_preview)
+
         self._setup_ui()
         self._populate_fields_from_job()
         self._connect_signals()
@@ -99,6 +116,7 @@ class JobCreationDialog(QDialog):
         self._create_resources_tab()
         self._create_dependencies_tab()
         self._create_advanced_tab()
+        self._create_sweep_tab()
         self._create_preview_tab()
         
         # Dialog buttons
@@ -177,6 +195,7 @@ class JobCreationDialog(QDialog):
         dir_layout = QHBoxLayout()
         self.working_dir_edit = QLineEdit(self.job.working_directory or "")
         self.working_dir_edit.setPlaceholderText("Leave empty for current directory")
+        self.working_dir_completer = RemotePathCompleter(self.working_dir_edit)
         dir_layout.addWidget(self.working_dir_edit)
         
         browse_btn = QPushButton("Browse...")
@@ -185,11 +204,28 @@ class JobCreationDialog(QDialog):
         layout.addRow("Working Directory:", dir_layout)
         
         # Virtual environment
+        # Editable dropdown of the environments discovered on the cluster (cached per host)
         venv_layout = QHBoxLayout()
-        self.venv_edit = QLineEdit(self.job.venv or "")
+        self.venv_combo = QComboBox()
+        self.venv_combo.setEditable(True)
+        self.venv_combo.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
+        self.venv_combo.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        self.venv_combo.setCompleter(None)
+        self.venv_edit = self.venv_combo.lineEdit()
         self.venv_edit.setPlaceholderText("Path to virtual environment (optional)")
-        venv_layout.addWidget(self.venv_edit)
-        
+        self.venv_completer = RemotePathCompleter(self.venv_edit)
+        venv_layout.addWidget(self.venv_combo)
+
+        self.env_discovery = get_environment_discovery()
+        self._populate_venv_combo(self.env_discovery.environments())
+        self.env_discovery.environments_changed.connect(self._populate_venv_combo)
+        self.env_discovery.refresh()
+
+        venv_rescan_btn = QPushButton("Rescan")
+        venv_rescan_btn.setToolTip("Search the cluster again for virtualenvs and conda environments")
+        venv_rescan_btn.clicked.connect(lambda: self.env_discovery.refresh(force=True))
+        venv_layout.addWidget(venv_rescan_btn)
+
         venv_browse_btn = QPushButton("Browse...")
         venv_browse_btn.clicked.connect(self._browse_venv)
         venv_layout.addWidget(venv_browse_btn)
@@ -321,6 +357,20 @@ class JobCreationDialog(QDialog):
         
         self._load_user_jobs()
         layout.addWidget(dep_group)
+
+        # Workflow edges: jobs of this project to run after (submitted together, afterok)
+        workflow_group = QGroupBox("Workflow (this project)")
+        workflow_layout = QFormLayout(workflow_group)
+        self.workflow_dep_list = QListWidget()
+        self.workflow_dep_list.setSelectionMode(QAbstractItemView.SelectionMode.MultiSelection)
+        self.workflow_dep_list.setMaximumHeight(150)
+        self.workflow_dep_list.setToolTip(
+            "This job starts after the selected jobs complete successfully. "
+            "Submitting it also submits the selected jobs that are not submitted yet."
+        )
+        self._load_project_jobs()
+        workflow_layout.addRow("Run After:", self.workflow_dep_list)
+        layout.addWidget(workflow_group)
         layout.addStretch()
         
         self.tab_widget.addTab(tab, "Dependencies & Arrays")
@@ -353,6 +403,20 @@ class JobCreationDialog(QDialog):
             self.dep_job_list.setEnabled(False)
             print(f"Error fetching user jobs for dependency list: {e}")
 
+    def _load_project_jobs(self):
+        """Lists the project jobs this job may depend on (never its own dependents, which would make a cycle)."""
+        excluded = set(descendants(self.project_jobs, self.job.id)) | {self.job.id}
+        for job in self.project_jobs:
+            if job.id in excluded:
+                continue
+            item = QListWidgetItem(f"{job.name} ({job.id}) - {job.status}")
+            item.setData(Qt.ItemDataRole.UserRole, job.id)
+            self.workflow_dep_list.addItem(item)
+            item.setSelected(job.id in (self.job.depends_on or []))
+        if self.workflow_dep_list.count() == 0:
+            self.workflow_dep_list.addItem("No other jobs in this project")
+            self.workflow_dep_list.setEnabled(False)
+
     def _create_advanced_tab(self):
         """Create the advanced settings tab"""
         tab = QWidget()
@@ -433,7 +497,143 @@ class JobCreationDialog(QDialog):
         layout.addRow(self.optional_sbatch_edit)
         
         self.tab_widget.addTab(tab, "Advanced")
-        
+
+    def _create_sweep_tab(self):
+        """Create the parameter sweep tab"""
+        self.sweep_tab = QWidget()
+        layout = QVBoxLayout(self.sweep_tab)
+        layout.setSpacing(15)
+
+        self.sweep_group = QGroupBox("Parameter Sweep")
+        self.sweep_group.setCheckable(True)
+        self.sweep_group.setChecked(False)
+        sweep_layout = QVBoxLayout(self.sweep_group)
+        sweep_layout.setSpacing(10)
+
+        hint = QLabel(
+            "Use {{name}} in the job name, paths or script commands; the job is expanded "
+            "once per parameter combination. When only the script commands use parameters, "
+            "the sweep is submitted as a single job array."
+        )
+        hint.setWordWrap(True)
+        hint.setStyleSheet("color: #8be9fd; font-style: italic;")
+        sweep_layout.addWidget(hint)
+
+        self.sweep_table = QTableWidget(0, 2)
+        self.sweep_table.setHorizontalHeaderLabels(["Parameter", "Values (comma-separated)"])
+        self.sweep_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        self.sweep_table.horizontalHeader().setStretchLastSection(True)
+        self.sweep_table.verticalHeader().setVisible(False)
+        sweep_layout.addWidget(self.sweep_table)
+
+        table_buttons = QHBoxLayout()
+        add_param_btn = QPushButton("Add Parameter")
+        add_param_btn.clicked.connect(self._add_sweep_parameter)
+        remove_param_btn = QPushButton("Remove Parameter")
+        remove_param_btn.clicked.connect(self._remove_sweep_parameter)
+        table_buttons.addWidget(add_param_btn)
+        table_buttons.addWidget(remove_param_btn)
+        table_buttons.addStretch()
+        sweep_layout.addLayout(table_buttons)
+
+        options = QFormLayout()
+        self.sweep_mode_combo = QComboBox()
+        self.sweep_mode_combo.addItem("Grid (every combination)", SWEEP_GRID)
+        self.sweep_mode_combo.addItem("Zip (i-th values together)", SWEEP_ZIP)
+        self.sweep_mode_combo.addItem("Random sample of the grid", SWEEP_RANDOM)
+        options.addRow("Mode:", self.sweep_mode_combo)
+
+        self.sweep_samples_spin = QSpinBox()
+        self.sweep_samples_spin.setRange(1, MAX_SWEEP_POINTS)
+        self.sweep_samples_spin.setValue(10)
+        options.addRow("Samples:", self.sweep_samples_spin)
+
+        self.sweep_seed_spin = QSpinBox()
+        self.sweep_seed_spin.setRange(0, 2147483647)
+        options.addRow("Seed:", self.sweep_seed_spin)
+
+        self.sweep_array_check = QCheckBox("Submit as one job array when possible")
+        self.sweep_array_check.setChecked(True)
+        options.addRow(self.sweep_array_check)
+
+        self.sweep_concurrency_spin = QSpinBox()
+        self.sweep_concurrency_spin.setRange(0, 1024)
+        self.sweep_concurrency_spin.setToolTip("Maximum number of array tasks to run at once (0 for no limit)")
+        options.addRow("Concurrency Limit (%):", self.sweep_concurrency_spin)
+        sweep_layout.addLayout(options)
+
+        self.sweep_summary = QLabel()
+        self.sweep_summary.setWordWrap(True)
+        self.sweep_summary.setStyleSheet("font-weight: bold;")
+        sweep_layout.addWidget(self.sweep_summary)
+
+        layout.addWidget(self.sweep_group)
+        layout.addStretch()
+
+        self.tab_widget.addTab(self.sweep_tab, "Sweep")
+
+    def _add_sweep_parameter(self, name: str = "", values: str = ""):
+        row = self.sweep_table.rowCount()
+        self.sweep_table.insertRow(row)
+        self.sweep_table.setItem(row, 0, QTableWidgetItem(name))
+        self.sweep_table.setItem(row, 1, QTableWidgetItem(values))
+        if not name:
+            self.sweep_table.editItem(self.sweep_table.item(row, 0))
+
+    def _remove_sweep_parameter(self):
+        row = self.sweep_table.currentRow()
+        if row < 0:
+            row = self.sweep_table.rowCount() - 1
+        if row >= 0:
+            self.sweep_table.removeRow(row)
+            self._handle_input_change()
+
+    def _sweep_from_ui(self) -> Optional[Sweep]:
+        """Sweep defined in the Sweep tab, or None if the sweep is disabled."""
+        if not self.sweep_group.isChecked():
+            return None
+        axes = []
+        for row in range(self.sweep_table.rowCount()):
+            name_item, values_item = self.sweep_table.item(row, 0), self.sweep_table.item(row, 1)
+            name = name_item.text().strip() if name_item else ""
+            values = [v.strip() for v in (values_item.text() if values_item else "").split(",")]
+            if name or any(values):
+                axes.append(SweepAxis(name, [v for v in values if v]))
+        return Sweep(
+            axes=axes,
+            mode=self.sweep_mode_combo.currentData(),
+            samples=self.sweep_samples_spin.value(),
+            seed=self.sweep_seed_spin.value(),
+            as_array=self.sweep_array_check.isChecked(),
+            max_concurrent=self.sweep_concurrency_spin.value(),
+            tasks=self._sweep_tasks,
+        )
+
+    def _update_sweep_summary(self, sweep: Optional[Sweep]):
+        is_random = self.sweep_mode_combo.currentData() == SWEEP_RANDOM
+        self.sweep_samples_spin.setEnabled(is_random)
+        self.sweep_seed_spin.setEnabled(is_random)
+        self.array_group.setEnabled(sweep is None)
+        if sweep is None:
+            self.sweep_summary.setText("")
+            return
+        error = sweep.validate()
+        if error:
+            self.sweep_summary.setText(error)
+            return
+        tasks = sweep.task_range()
+        points = f"Points {tasks.start}-{tasks.stop - 1} of {len(sweep)}" if sweep.tasks else f"{len(sweep)} points"
+        blocker = array_mapping_blocker(self.job, sweep)
+        if blocker is not None:
+            self.sweep_summary.setText(f"{points}: {len(tasks)} separate jobs ({blocker}).")
+        elif sweep.tasks or len(tasks) <= MAX_ARRAY_TASKS:
+            self.sweep_summary.setText(f"{points}: one job array with {len(tasks)} tasks.")
+        else:
+            self.sweep_summary.setText(
+                f"{points}: {len(array_chunks(sweep))} job arrays of up to {MAX_ARRAY_TASKS} tasks "
+                f"(the preview shows the first)."
+            )
+
     def _open_constraint_dialog(self):
         dlg = ConstraintDialog(self._all_constraints, self.job.constraint or [], self)
         if dlg.exec():
@@ -475,13 +675,26 @@ class JobCreationDialog(QDialog):
             }
         """)
         layout.addWidget(self.preview_text)
-        
+
+        # Sweep point shown when a sweep expands into separate jobs
+        self.sweep_point_row = QWidget()
+        point_layout = QHBoxLayout(self.sweep_point_row)
+        point_layout.setContentsMargins(0, 0, 0, 0)
+        point_layout.addWidget(QLabel("Sweep point:"))
+        self.sweep_point_spin = QSpinBox()
+        self.sweep_point_spin.setRange(0, 0)
+        point_layout.addWidget(self.sweep_point_spin)
+        point_layout.addStretch()
+        self.sweep_point_row.setVisible(False)
+        layout.addWidget(self.sweep_point_row)
+
         # Copy button
         copy_btn = QPushButton("Copy to Clipboard")
         copy_btn.setObjectName(BTN_BLUE)
         copy_btn.clicked.connect(self._copy_preview)
         layout.addWidget(copy_btn)
         
+        self.preview_tab = tab
         self.tab_widget.addTab(tab, "Preview")
         
     def _connect_signals(self):
@@ -492,6 +705,7 @@ class JobCreationDialog(QDialog):
         self.partition_edit.currentTextChanged.connect(self._handle_input_change)
         self.working_dir_edit.textChanged.connect(self._handle_input_change)
         self.venv_edit.textChanged.connect(self._handle_input_change)
+        self.venv_combo.activated.connect(self._on_venv_selected)
         self.script_edit.textChanged.connect(self._handle_input_change)
         self.time_days_spin.valueChanged.connect(self._handle_input_change)
         self.time_hours_spin.valueChanged.connect(self._handle_input_change)
@@ -514,6 +728,7 @@ class JobCreationDialog(QDialog):
         self.array_concurrency_spin.valueChanged.connect(self._handle_input_change)
         self.dep_type_combo.currentTextChanged.connect(self._handle_input_change)
         self.dep_job_list.itemSelectionChanged.connect(self._handle_input_change)
+        self.workflow_dep_list.itemSelectionChanged.connect(self._handle_input_change)
         
         # Advanced tab
         self.qos_edit.editTextChanged.connect(self._handle_input_change)
@@ -522,6 +737,16 @@ class JobCreationDialog(QDialog):
         self.oversubscribe_check.stateChanged.connect(self._handle_input_change)
         self.discord_notify_check.stateChanged.connect(self._handle_input_change)
         self.optional_sbatch_edit.textChanged.connect(self._handle_input_change)
+
+        # Sweep tab
+        self.sweep_group.toggled.connect(self._handle_input_change)
+        self.sweep_table.itemChanged.connect(self._handle_input_change)
+        self.sweep_mode_combo.currentIndexChanged.connect(self._handle_input_change)
+        self.sweep_samples_spin.valueChanged.connect(self._handle_input_change)
+        self.sweep_seed_spin.valueChanged.connect(self._handle_input_change)
+        self.sweep_array_check.stateChanged.connect(self._handle_input_change)
+        self.sweep_concurrency_spin.valueChanged.connect(self._handle_input_change)
+        self.sweep_point_spin.valueChanged.connect(lambda _: self._preview_timer.start())
         
         # Update preview when switching to preview tab
         self.tab_widget.currentChanged.connect(self._on_tab_changed)
@@ -529,9 +754,9 @@ class JobCreationDialog(QDialog):
     def _handle_input_change(self, *args):
         """Called when any input value changes to update the job and preview."""
         self._update_job()
-        # If the user is currently looking at the preview, refresh it.
-        if self.tab_widget.currentIndex() == 4: # Preview tab index
-            self._update_preview()
+        # If the user is currently looking at the preview, refresh it once typing pauses.
+        if self.tab_widget.currentWidget() is self.preview_tab:
+            self._preview_timer.start()
 
     def _update_job(self):
         """Update the job object from UI inputs. This method ONLY updates the object."""
@@ -593,6 +818,15 @@ class JobCreationDialog(QDialog):
         else:
             self.job.array = None
 
+        # Parameter sweep (its job array, if any, is derived from the sweep)
+        sweep = self._sweep_from_ui()
+        if sweep is not None:
+            self.job.sweep = sweep.to_dict()
+            self.job.array = None
+        else:
+            self.job.sweep = None
+        self._update_sweep_summary(sweep)
+
         # Job Dependency
         dep_type = self.dep_type_combo.currentText()
         is_singleton = (dep_type == 'singleton')
@@ -613,6 +847,10 @@ class JobCreationDialog(QDialog):
                 job_ids = [str(item.data(Qt.ItemDataRole.UserRole)) for item in selected_items]
                 self.job.dependency = f"{dep_type}:{':'.join(job_ids)}"
 
+        if self.workflow_dep_list.isEnabled():
+            depends_on = [item.data(Qt.ItemDataRole.UserRole) for item in self.workflow_dep_list.selectedItems()]
+            self.job.depends_on = depends_on or None
+
         self.job.nice = self.nice_spin.value() if self.nice_spin.value() != 0 else None
         self.job.oversubscribe = self.oversubscribe_check.isChecked()
         self.job.discord_notifications = self.discord_notify_check.isChecked()
@@ -620,14 +858,32 @@ class JobCreationDialog(QDialog):
 
     def _on_tab_changed(self, index):
         """Handle tab change"""
-        if index == 4:  # Preview tab is now at index 4
+        if self.tab_widget.widget(index) is self.preview_tab:
             self._update_job()
             self._update_preview()
             
     def _update_preview(self):
         """Update the script preview from the self.job object."""
-        script = self.job.create_sbatch_script()
+        self._preview_timer.stop()
+        script = self._preview_job().create_sbatch_script()
         self.preview_text.setPlainText(script)
+
+    def _preview_job(self) -> Job:
+        """Job whose script is previewed: the (first) array job or the selected point of a sweep."""
+        sweep = Sweep.from_dict(self.job.sweep) if self.job.sweep else None
+        if sweep is None or sweep.validate():
+            self.sweep_point_row.setVisible(False)
+            return self.job
+        if array_mapping_blocker(self.job, sweep) is None:
+            self.sweep_point_row.setVisible(False)
+            return to_array_job(self.job, sweep, None if sweep.tasks else array_chunks(sweep)[0])
+        tasks = sweep.task_range()
+        self.sweep_point_row.setVisible(True)
+        self.sweep_point_spin.blockSignals(True)
+        self.sweep_point_spin.setRange(tasks.start, tasks.stop - 1)
+        self.sweep_point_spin.blockSignals(False)
+        index = self.sweep_point_spin.value()
+        return render_job(self.job, sweep.point(index), index)
         
     def _browse_directory(self):
         """Browse for working directory on the remote cluster."""
@@ -646,6 +902,24 @@ class JobCreationDialog(QDialog):
             if directory:
                 self.working_dir_edit.setText(directory)
             
+    def _populate_venv_combo(self, environments: List[PythonEnvironment]):
+        """Fills the environment dropdown, keeping the path currently entered."""
+        current = self.venv_edit.text()
+        self.venv_combo.blockSignals(True)
+        self.venv_combo.clear()
+        for env in environments:
+            self.venv_combo.addItem(env.label, env.path)
+            self.venv_combo.setItemData(self.venv_combo.count() - 1, env.path, Qt.ItemDataRole.ToolTipRole)
+        self.venv_combo.setCurrentIndex(-1)
+        self.venv_combo.blockSignals(False)
+        self.venv_edit.setText(current)
+
+    def _on_venv_selected(self, index: int):
+        """Puts the bare path of the chosen environment into the field (items show its kind too)."""
+        path = self.venv_combo.itemData(index)
+        if path:
+            self.venv_edit.setText(path)
+
     def _browse_venv(self):
         """Browse for virtual environment on the remote cluster."""
         if self.slurm_api.connection_status != ConnectionState.CONNECTED:
@@ -661,13 +935,15 @@ class JobCreationDialog(QDialog):
         if dialog.exec():
             directory = dialog.get_selected_directory()
             if directory:
-                # Check for bin/activate in the selected directory (remote)
-                activate_path = os.path.join(directory, "bin", "activate")
-                exists = False
-                try:
-                    exists = self.slurm_api.remote_file_exists(activate_path)
-                except Exception:
-                    exists = False
+                # Check for bin/activate (or conda-meta) in the selected directory, unless it was discovered
+                known = any(env.path == directory for env in self.env_discovery.environments())
+                exists = known
+                if not known:
+                    try:
+                        exists = self.slurm_api.remote_file_exists(os.path.join(directory, "bin", "activate")) or \
+                            self.slurm_api.remote_path_exists(os.path.join(directory, "conda-meta"))
+                    except Exception:
+                        exists = False
                 if not exists:
                     show_warning_toast(
                         self,
@@ -679,6 +955,8 @@ class JobCreationDialog(QDialog):
                        
     def _copy_preview(self):
         """Copy the preview script to clipboard"""
+        if self._preview_timer.isActive():
+            self._update_preview()
         clipboard = QApplication.clipboard()
         clipboard.setText(self.preview_text.toPlainText())
         
@@ -752,6 +1030,18 @@ class JobCreationDialog(QDialog):
             self.job.constraint = job.constraint
             self._update_constraint_summary()
 
+        # Sweep Tab
+        if job.sweep:
+            sweep = Sweep.from_dict(job.sweep)
+            self.sweep_group.setChecked(True)
+            for axis in sweep.axes:
+                self._add_sweep_parameter(axis.name, ", ".join(axis.values))
+            self.sweep_mode_combo.setCurrentIndex(max(0, self.sweep_mode_combo.findData(sweep.mode)))
+            self.sweep_samples_spin.setValue(sweep.samples or self.sweep_samples_spin.value())
+            self.sweep_seed_spin.setValue(sweep.seed)
+            self.sweep_array_check.setChecked(sweep.as_array)
+            self.sweep_concurrency_spin.setValue(sweep.max_concurrent)
+
     def accept(self):
         """Validate and accept the dialog"""
         # Basic validation
@@ -768,5 +1058,12 @@ class JobCreationDialog(QDialog):
             self.tab_widget.setCurrentIndex(0)
             self.script_edit.setFocus()
             return
+
+        if self.job.sweep:
+            error = Sweep.from_dict(self.job.sweep).validate()
+            if error:
+                show_warning_toast(self, "Invalid Sweep", error)
+                self.tab_widget.setCurrentWidget(self.sweep_tab)
+                return
             
         super().accept()
@@ -7,13 +7,15 @@ import os
 import posixpath
 from typing import List, Optional
 
-from PyQt6.QtCore import (QObject, QThread, pyqtSignal, Qt, QSize,
-                          QSortFilterProxyModel)
+from PyQt6.QtCore import (QObject, QRunnable, QThreadPool, QTimer, pyqtSignal, Qt, QSize,
+                          QSortFilterProxyModel, QStringListModel)
 from PyQt6.QtGui import QIcon, QStandardItemModel, QStandardItem
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QListView,
                              QLineEdit, QToolButton, QProgressBar, QLabel,
-                             QDialogButtonBox, QAbstractItemView)
+                             QDialogButtonBox, QAbstractItemView, QCompleter)
 
+from core.remote_fs import (STATUS_DENIED, DirectoryListing, RemoteDirectoryCache, RemotePathIndex,
+                            get_remote_directory_cache, get_remote_path_index)
 from core.slurm_api import SlurmAPI, ConnectionState
 from core.style import AppStyles
 from utils import script_dir
@@ -25,33 +27,165 @@ HOME_ICON_PATH = os.path.join(script_dir, "src_static", "home.svg")
 UP_ICON_PATH = os.path.join(script_dir, "src_static", "prev_folder.svg")
 REFRESH_ICON_PATH = os.path.join(script_dir, "src_static", "refresh.svg")
 FOLDER_ICON_PATH = os.path.join(script_dir, "src_static", "folder.svg")
+# Typing in the path bar loads a new directory only after this pause
+PATH_INPUT_DEBOUNCE_MS = 250
 
 
 # ============================================================================
-# WORKER THREAD (for non-blocking remote operations)
+# WORKER TASKS (run on the model's thread pool)
 # ============================================================================
 
-class DirectoryLoaderThread(QThread):
-    """Worker thread to fetch remote directories without blocking the UI."""
-    result_ready = pyqtSignal(list)
-    error_occurred = pyqtSignal(str)
+class DirectoryTaskSignals(QObject):
+    """Results of the pool tasks, tagged with the request ID they answer."""
+    loaded = pyqtSignal(int, object)  # request ID, DirectoryListing
+    failed = pyqtSignal(int, str)
+    prefetched = pyqtSignal()
 
-    def __init__(self, slurm_api: SlurmAPI, path: str, parent=None):
-        super().__init__(parent)
-        self.slurm_api = slurm_api
+
+class DirectoryLoadTask(QRunnable):
+    """Lists one remote directory (existence, entries and types in one round-trip)."""
+
+    def __init__(self, signals: DirectoryTaskSignals, cache: RemoteDirectoryCache,
+                 request_id: int, path: str, force_refresh: bool = False):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = signals
+        self.cache = cache
+        self.request_id = request_id
         self.path = path
+        self.force_refresh = force_refresh
+
+    def run(self):
+        try:
+            listing = self.cache.list(self.path, self.force_refresh)
+            if listing is None:
+                self.signals.failed.emit(self.request_id, f"Failed to load directories: {self.path}")
+            elif not listing.exists:
+                self.signals.failed.emit(self.request_id, f"Path does not exist: {self.path}")
+            elif listing.status == STATUS_DENIED:
+                self.signals.failed.emit(self.request_id, f"Permission denied: {self.path}")
+            else:
+                self.signals.loaded.emit(self.request_id, listing)
+        except Exception as e:
+            self.signals.failed.emit(self.request_id, f"Failed to load directories: {str(e)}")
+
+
+class DirectoryPrefetchTask(QRunnable):
+    """Lists the subdirectories of a loaded directory ahead of time, in one round-trip."""
+
+    def __init__(self, signals: DirectoryTaskSignals, cache: RemoteDirectoryCache, listing: DirectoryListing):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = signals
+        self.cache = cache
+        self.listing = listing
 
     def run(self):
-        """Execute the remote command."""
         try:
-            if not self.slurm_api.remote_path_exists(self.path):
-                self.error_occurred.emit(f"Path does not exist: {self.path}")
-                return
+            self.cache.prefetch_children(self.listing)
+        except Exception as e:
+            print(f"Directory prefetch failed: {e}")
+        finally:
+            self.signals.prefetched.emit()
+
+
+class CompletionTaskSignals(QObject):
+    """Results of the completion tasks, tagged with the request ID they answer."""
+    completed = pyqtSignal(int, list)  # request ID, completions
+
+
+class PathCompletionTask(QRunnable):
+    """Completes a typed path against the whole index (a fuzzy scan of up to INDEX_MAX_PATHS paths)."""
 
-            directories = self.slurm_api.list_remote_directories(self.path)
-            self.result_ready.emit(sorted(directories))
+    def __init__(self, signals: CompletionTaskSignals, index: RemotePathIndex, request_id: int, text: str):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = signals
+        self.index = index
+        self.request_id = request_id
+        self.text = text
+
+    def run(self):
+        try:
+            completions = self.index.complete(self.text)
         except Exception as e:
-            self.error_occurred.emit(f"Failed to load directories: {str(e)}")
+            print(f"Path completion failed: {e}")
+            completions = []
+        self.signals.completed.emit(self.request_id, completions)
+
+
+# ============================================================================
+# PATH COMPLETION (served from memory by the shared RemotePathIndex)
+# ============================================================================
+
+class RemotePathCompleter(QCompleter):
+    """
+    Autocompletes remote directory paths in a QLineEdit without SSH calls.
+    The children of the typed directory are listed at once; the fuzzy matches
+    from the whole index are added by a PathCompletionTask on the completer's
+    thread pool.
+    """
+
+    def __init__(self, line_edit: QLineEdit, append_slash: bool = False):
+        super().__init__(line_edit)
+        self.line_edit = line_edit
+        self.append_slash = append_slash
+        self.index = get_remote_path_index()
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._signals = CompletionTaskSignals(self)
+        self._signals.completed.connect(self._on_completed)
+        self._request_id = 0
+        self._task: Optional[PathCompletionTask] = None
+        self._text = ""
+        self._completions = QStringListModel(self)
+        self.setModel(self._completions)
+        # The index ranks (and fuzzy-matches) itself, so the popup shows its list as is
+        self.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.setMaxVisibleItems(12)
+        self.setWidget(line_edit)
+        self.activated.connect(self._insert_completion)
+        line_edit.textEdited.connect(self._update_completions)
+        self.index.index_ready.connect(self._on_index_ready)
+        self.index.ensure_built()
+
+    def _update_completions(self, text: str):
+        self.index.ensure_built()
+        # Results of a scan still queued or running are stale from now on
+        self._request_id += 1
+        if self._task is not None:
+            self._pool.tryTake(self._task)
+            self._task = None
+        self._text = text
+        if not text.strip():
+            self._show([])
+            return
+        self._show(self.index.complete(text.strip(), anywhere=False))
+        self._task = PathCompletionTask(self._signals, self.index, self._request_id, text.strip())
+        self._pool.start(self._task)
+
+    def _on_completed(self, request_id: int, completions: List[str]):
+        if request_id != self._request_id:
+            return
+        self._task = None
+        if self.line_edit.hasFocus():
+            self._show(completions)
+
+    def _show(self, completions: List[str]):
+        if completions == [self._text.rstrip('/')]:
+            completions = []
+        self._completions.setStringList(completions)
+        if completions:
+            self.complete()
+        else:
+            self.popup().hide()
+
+    def _insert_completion(self, path: str):
+        self.line_edit.setText(path + '/' if self.append_slash else path)
+
+    def _on_index_ready(self, count: int):
+        if self.line_edit.hasFocus() and self.line_edit.text().strip():
+            self._update_completions(self.line_edit.text())
 
 
 # ============================================================================
@@ -69,8 +203,18 @@ class RemoteDirectoryModel(QObject):
         super().__init__()
         self.slurm_api = slurm_api
         self._current_path: str = initial_path or self.slurm_api.remote_home or "/"
-        self._directory_cache: dict[str, list[str]] = {}
-        self._worker_thread: Optional[DirectoryLoaderThread] = None
+        self._directory_cache = get_remote_directory_cache()
+        # Threads are reused across navigations: one load and one prefetch at a time
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(2)
+        self._signals = DirectoryTaskSignals(self)
+        self._signals.loaded.connect(self._on_load_success)
+        self._signals.failed.connect(self._on_load_error)
+        self._signals.prefetched.connect(self._on_prefetch_finished)
+        self._request_id = 0
+        self._load_task: Optional[DirectoryLoadTask] = None
+        self._prefetch_task: Optional[DirectoryPrefetchTask] = None
+        self._pending_prefetch: Optional[DirectoryListing] = None
 
     @property
     def current_path(self) -> str:
@@ -90,33 +234,64 @@ class RemoteDirectoryModel(QObject):
         if new_path == self._current_path and not force_refresh:
             return
 
-        if self._worker_thread and self._worker_thread.isRunning():
-            self._worker_thread.terminate()
-
         self._current_path = new_path
         self.path_changed.emit(self._current_path)
 
-        if not force_refresh and self._current_path in self._directory_cache:
-            cached_dirs = self._directory_cache[self._current_path]
-            self.directories_changed.emit(cached_dirs)
-            self.status_changed.emit(f"{len(cached_dirs)} items")
+        # Results of any request still in flight are stale from now on
+        self._request_id += 1
+        if self._load_task is not None:
+            self._pool.tryTake(self._load_task)
+            self._load_task = None
+
+        cached = None if force_refresh else self._directory_cache.get(self._current_path)
+        if cached is not None and cached.exists and cached.status != STATUS_DENIED:
+            self.loading_state_changed.emit(False)
+            self._on_listing_loaded(cached)
             return
 
         self.loading_state_changed.emit(True)
         self.status_changed.emit(f"Loading {self._current_path}...")
 
-        self._worker_thread = DirectoryLoaderThread(self.slurm_api, self._current_path)
-        self._worker_thread.result_ready.connect(self._on_load_success)
-        self._worker_thread.error_occurred.connect(self._on_load_error)
-        self._worker_thread.finished.connect(lambda: self.loading_state_changed.emit(False))
-        self._worker_thread.start()
+        self._load_task = DirectoryLoadTask(
+            self._signals, self._directory_cache, self._request_id, self._current_path, force_refresh
+        )
+        self._pool.start(self._load_task)
 
-    def _on_load_success(self, directories: list[str]):
-        self._directory_cache[self._current_path] = directories
+    def _on_load_success(self, request_id: int, listing: DirectoryListing):
+        if request_id != self._request_id:
+            return
+        self._load_task = None
+        self.loading_state_changed.emit(False)
+        self._on_listing_loaded(listing)
+
+    def _on_listing_loaded(self, listing: DirectoryListing):
+        directories = listing.directories
         self.directories_changed.emit(directories)
         self.status_changed.emit(f"{len(directories)} items")
+        self._prefetch(listing)
+
+    def _prefetch(self, listing: DirectoryListing):
+        """Speculatively lists the subdirectories, so opening one is instant."""
+        if not listing.directories:
+            return
+        if self._prefetch_task is not None:
+            # One prefetch at a time; only the latest directory is queued
+            self._pending_prefetch = listing
+            return
+        self._prefetch_task = DirectoryPrefetchTask(self._signals, self._directory_cache, listing)
+        self._pool.start(self._prefetch_task)
+
+    def _on_prefetch_finished(self):
+        self._prefetch_task = None
+        pending, self._pending_prefetch = self._pending_prefetch, None
+        if pending is not None:
+            self._prefetch(pending)
 
-    def _on_load_error(self, error_message: str):
+    def _on_load_error(self, request_id: int, error_message: str):
+        if request_id != self._request_id:
+            return
+        self._load_task = None
+        self.loading_state_changed.emit(False)
         self.status_changed.emit(f"Error: {error_message}")
         self.directories_changed.emit([])
 
@@ -135,8 +310,18 @@ class RemoteDirectoryModel(QObject):
             self.set_path(self.slurm_api.remote_home)
             
     def path_exists(self, path: str) -> bool:
+        cached = self._directory_cache.get(path)
+        if cached is not None:
+            return cached.exists
         return self.slurm_api.remote_path_exists(path)
 
+    def shutdown(self):
+        """Drops queued requests and lets running ones finish before the dialog is destroyed."""
+        self._request_id += 1
+        self._pending_prefetch = None
+        self._pool.clear()
+        self._pool.waitForDone()
+
 
 # ============================================================================
 # CONTROLLER (Connects View and Model)
@@ -146,11 +331,16 @@ class RemoteDirectoryController(QObject):
         super().__init__()
         self.model = model
         self.view = view
+        self._pending_base_path: Optional[str] = None
+        self._path_input_timer = QTimer(self)
+        self._path_input_timer.setSingleShot(True)
+        self._path_input_timer.setInterval(PATH_INPUT_DEBOUNCE_MS)
+        self._path_input_timer.timeout.connect(self._load_pending_path)
         self._connect_signals()
     
     def _connect_signals(self):
         # Model -> View connections
-        self.model.path_changed.connect(self.view.path_edit.setText)
+        self.model.path_changed.connect(self._on_model_path_changed)
         self.model.directories_changed.connect(self.view.update_list_view)
         self.model.status_changed.connect(self.view.status_label.setText)
         self.model.loading_state_changed.connect(self.view.set_loading_state)
@@ -182,15 +372,32 @@ class RemoteDirectoryController(QObject):
                 base_path += '/'
             filter_term = posixpath.basename(text)
 
-        # Load the base directory if it has changed
+        # Filtering is local and immediate; loading another directory waits for a
+        # pause in typing, so type-ahead navigation sends a single listing request
+        self.view.proxy_model.setFilterFixedString(filter_term)
         if base_path != self.model.current_path:
-            self.model.set_path(base_path)
-
-        # Apply the filter
-        self.view.proxy_model.setFilterRegularExpression(filter_term)
+            self._pending_base_path = base_path
+            self._path_input_timer.start()
+        else:
+            self._pending_base_path = None
+            self._path_input_timer.stop()
+
+    def _load_pending_path(self):
+        if self._pending_base_path is not None:
+            path, self._pending_base_path = self._pending_base_path, None
+            self.model.set_path(path)
+
+    def _on_model_path_changed(self, path: str):
+        """Shows the new directory, keeping a filter the user is typing after it."""
+        text = self.view.path_edit.text().strip()
+        if text != path and posixpath.dirname(text) + '/' == path:
+            return
+        self.view.path_edit.setText(path)
 
     def _on_path_return_pressed(self):
         """Handles the Enter key in the path bar for smart navigation."""
+        self._path_input_timer.stop()
+        self._pending_base_path = None
         path = self.view.path_edit.text()
         
         # If the path is a valid directory, navigate into it
@@ -257,6 +464,7 @@ class RemoteDirectoryDialog(QDialog):
         self.refresh_button = self._create_tool_button(REFRESH_ICON_PATH, "Refresh")
         self.path_edit = QLineEdit()
         self.path_edit.setPlaceholderText("Type a path to navigate or filter...")
+        self.path_completer = RemotePathCompleter(self.path_edit, append_slash=True)
 
         nav_bar.addWidget(self.up_button)
         nav_bar.addWidget(self.home_button)
@@ -314,10 +522,14 @@ class RemoteDirectoryDialog(QDialog):
         """Shows/hides the progress bar and enables/disables controls."""
         self.progress_bar.setVisible(is_loading)
         self.list_view.setEnabled(not is_loading)
-        self.path_edit.setEnabled(not is_loading)
+        # The path bar stays editable so the user can keep typing while a listing loads
         self.up_button.setEnabled(not is_loading)
         self.home_button.setEnabled(not is_loading)
 
+    def done(self, result: int):
+        self.model.shutdown()
+        super().done(result)
+
     def get_selected_directory(self) -> str:
         """Public method to retrieve the result of the dialog."""
         return self.path_edit.text().rstrip('/')
\ No newline at end of file
@@ -0,0 +1,101 @@
+"""
+Sparkline Widget - a small line chart of a time series.
+
+Draws the values as a line filled underneath, leaving gaps where samples are
+missing (None). With ``axis`` it becomes a trend chart with grid lines and the
+scale's maximum. The tooltip shows the min/avg/max of the values.
+"""
+
+from typing import List, Optional
+
+from PyQt6.QtCore import QPointF, QSize, Qt
+from PyQt6.QtGui import QColor, QPainter, QPainterPath, QPen
+from PyQt6.QtWidgets import QSizePolicy, QWidget
+
+from core.defaults import COLOR_BLUE, COLOR_DARK_BORDER, COLOR_DARK_FG
+
+# Opacity of the area under the line
+FILL_ALPHA = 60
+GRID_LINES = 4
+
+
+class SparklineWidget(QWidget):
+    """Line chart of a list of values (None for missing samples), oldest first."""
+
+    def __init__(self, parent=None, color: str = COLOR_BLUE, max_value: Optional[float] = None,
+                 unit: str = "", axis: bool = False, height: int = 24):
+        super().__init__(parent)
+        self.color = QColor(color)
+        self.max_value = max_value  # None: scale to the largest value
+        self.unit = unit
+        self.axis = axis
+        self._values: List[Optional[float]] = []
+        self._height = height
+        self.setMinimumHeight(height)
+        self.setMinimumWidth(60)
+        vertical = QSizePolicy.Policy.Expanding if axis else QSizePolicy.Policy.Fixed
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, vertical)
+
+    def sizeHint(self) -> QSize:
+        return QSize(200, self._height)
+
+    def set_values(self, values: List[Optional[float]]):
+        self._values = values
+        present = [value for value in values if value is not None]
+        if present:
+            self.setToolTip(
+                f"min {min(present):.4g}{self.unit}, avg {sum(present) / len(present):.4g}{self.unit}, "
+                f"max {max(present):.4g}{self.unit}"
+            )
+        else:
+            self.setToolTip("No samples yet")
+        self.update()
+
+    def _scale(self) -> float:
+        if self.max_value is not None:
+            return self.max_value
+        return max([value for value in self._values if value is not None] or [0]) or 1
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        rect = self.rect().adjusted(1, 2, -1, -2)
+        scale = self._scale()
+
+        if self.axis:
+            painter.setPen(QPen(QColor(COLOR_DARK_BORDER), 1, Qt.PenStyle.DotLine))
+            for i in range(GRID_LINES + 1):
+                y = rect.top() + rect.height() * i / GRID_LINES
+                painter.drawLine(QPointF(rect.left(), y), QPointF(rect.right(), y))
+            painter.setPen(QColor(COLOR_DARK_FG))
+            painter.drawText(rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop, f"{scale:g}{self.unit}")
+
+        if len(self._values) < 2:
+            painter.end()
+            return
+
+        step = rect.width() / (len(self._values) - 1)
+        fill = QColor(self.color)
+        fill.setAlpha(FILL_ALPHA)
+        painter.setPen(QPen(self.color, 1.5))
+        # One path per run of consecutive samples
+        run: List[QPointF] = []
+        for i, value in enumerate(self._values + [None]):
+            if value is not None:
+                y = rect.bottom() - rect.height() * min(value / scale, 1.0)
+                run.append(QPointF(rect.left() + i * step, y))
+                continue
+            if len(run) > 1:
+                line = QPainterPath(run[0])
+                for point in run[1:]:
+                    line.lineTo(point)
+                area = QPainterPath(line)
+                area.lineTo(run[-1].x(), rect.bottom())
+                area.lineTo(run[0].x(), rect.bottom())
+                area.closeSubpath()
+                painter.fillPath(area, fill)
+                painter.drawPath(line)
+            elif run:
+                painter.drawPoint(run[0])
+            run = []
+        painter.end()